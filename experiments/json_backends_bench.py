@@ -0,0 +1,39 @@
+from io import StringIO
+from ebbe import Timer
+
+from pelote import read_graphology_json, write_graphology_json_to
+from pelote.shim import JSON_BACKENDS, check_json_backend
+
+PATHS = ["./test/resources/les_miserables.json", "./data/polarisation.json"]
+N = 10
+
+backends = []
+
+for backend in JSON_BACKENDS:
+    try:
+        check_json_backend(backend)
+    except Exception:
+        print("%s is not installed, skipping" % backend)
+        continue
+
+    backends.append(backend)
+
+for path in PATHS:
+    g = read_graphology_json(path)
+
+    print()
+    print(path, g.order(), g.size())
+
+    with Timer("read, incremental (x%i)" % N):
+        for _ in range(N):
+            read_graphology_json(path)
+
+    for backend in backends:
+        with Timer("read, %s (x%i)" % (backend, N)):
+            for _ in range(N):
+                read_graphology_json(path, json_backend=backend)
+
+    for backend in backends:
+        with Timer("write, %s (x%i)" % (backend, N)):
+            for _ in range(N):
+                write_graphology_json_to(StringIO(), g, json_backend=backend)
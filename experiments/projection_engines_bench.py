@@ -0,0 +1,12 @@
+import csv
+from ebbe import Timer
+
+from pelote import table_to_bipartite_graph, monopartite_projection
+
+with open("./data/bipartite2.csv") as f:
+    bipartite = table_to_bipartite_graph(csv.DictReader(f), "account", "post")
+
+for metric in [None, "jaccard", "cosine"]:
+    for engine in ["python", "compact", "sparse"]:
+        with Timer("%s engine, metric=%s" % (engine, metric)):
+            monopartite_projection(bipartite, "account", metric=metric, engine=engine)
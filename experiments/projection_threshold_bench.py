@@ -0,0 +1,51 @@
+import csv
+import math
+from ebbe import Timer
+from unittest.mock import patch
+
+from pelote import table_to_bipartite_graph, monopartite_projection
+from pelote.classes.online_metrics import instantiate_online_metric
+
+with open("./data/bipartite2.csv") as f:
+    bipartite = table_to_bipartite_graph(csv.DictReader(f), "account", "post")
+
+
+def no_max_bound(self, norm, threshold):
+    return math.inf
+
+
+def no_min_bound(self, norm, threshold):
+    return -math.inf
+
+
+for engine in ["python", "compact"]:
+    for metric in ["jaccard", "dice", "binary_cosine"]:
+        metric_class = instantiate_online_metric(metric).__class__
+
+        for threshold in [0.3, 0.5, 0.8]:
+            name = "engine=%s, metric=%s, threshold=%s" % (engine, metric, threshold)
+
+            with Timer(name + ", without norm bound"):
+                # NOTE: disabling length filtering, everything else being equal
+                with patch.object(
+                    metric_class, "max_partner_norm", no_max_bound
+                ), patch.object(metric_class, "min_partner_norm", no_min_bound):
+                    expected = monopartite_projection(
+                        bipartite,
+                        "account",
+                        metric=metric,
+                        engine=engine,
+                        weight_threshold=threshold,
+                    )
+
+            with Timer(name + ", with norm bound"):
+                g = monopartite_projection(
+                    bipartite,
+                    "account",
+                    metric=metric,
+                    engine=engine,
+                    weight_threshold=threshold,
+                )
+
+            assert g.size() == expected.size()
+            print("  edges:", g.size())
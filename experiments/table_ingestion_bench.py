@@ -0,0 +1,57 @@
+import time
+import pandas as pd
+from random import Random
+from ebbe import Timer
+
+from pelote import table_to_bipartite_graph, edges_table_to_graph
+
+N = 1_000_000
+
+rng = Random(0)
+
+# NOTE: separators force the row by row path, even for dataframes
+df = pd.DataFrame(
+    {
+        "user": ["user%i" % rng.randrange(5_000) for _ in range(N)],
+        "hashtags": [
+            "tag%i|tag%i" % (rng.randrange(300), rng.randrange(300)) for _ in range(N)
+        ],
+    }
+)
+
+rows = [
+    {
+        "source": "user%i" % rng.randrange(1_000),
+        "target": "user%i" % rng.randrange(1_000),
+    }
+    for _ in range(N)
+]
+
+
+def run(name, fn):
+    cpu = time.process_time()
+
+    with Timer(name):
+        g = fn()
+
+    print(
+        "  parent cpu: %.2fs, nodes: %i, edges: %i"
+        % (time.process_time() - cpu, g.order(), g.size())
+    )
+
+
+for n_jobs in (1, 2, 4):
+    run(
+        "bipartite, dataframe, n_jobs=%i" % n_jobs,
+        lambda: table_to_bipartite_graph(
+            df, "user", "hashtags", second_part_separator="|", n_jobs=n_jobs
+        ),
+    )
+
+for n_jobs in (1, 2, 4):
+    run(
+        "edges, rows, n_jobs=%i" % n_jobs,
+        lambda: edges_table_to_graph(
+            rows, "source", "target", count_rows_as_weight=True, n_jobs=n_jobs
+        ),
+    )
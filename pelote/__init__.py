@@ -18,12 +18,21 @@ from pelote.graph_to_tabular import (
     graph_to_nodes_dataframe,
     graph_to_edges_dataframe,
     graph_to_dataframes,
+    iter_graph_to_nodes_dataframes,
+    iter_graph_to_edges_dataframes,
+    write_graph_to_tables,
 )
 from pelote.learn import floatsam_threshold_learner
 from pelote.metrics import edge_disparity, triangular_strength
-from pelote.projection import monopartite_projection
+from pelote.projection import (
+    monopartite_projection,
+    iter_monopartite_projection,
+    minhash_projection,
+    IncrementalMonopartiteProjector,
+    self_similarity_projection,
+)
 from pelote.read import read_graphology_json
-from pelote.write import write_graphology_json
+from pelote.write import write_graphology_json, write_graphology_json_to
 from pelote.sparsification import (
     global_threshold_sparsification,
     GlobalThresholdSparsifier,
@@ -32,6 +41,9 @@ from pelote.sparsification import (
 )
 from pelote.tabular_to_graph import (
     table_to_bipartite_graph,
+    csv_to_bipartite_graph,
+    table_to_cooccurrence_graph,
+    table_to_citation_graph,
     tables_to_graph,
     edges_table_to_graph,
 )
@@ -50,16 +62,27 @@ __all__ = [
     "graph_to_nodes_dataframe",
     "graph_to_edges_dataframe",
     "graph_to_dataframes",
+    "iter_graph_to_nodes_dataframes",
+    "iter_graph_to_edges_dataframes",
+    "write_graph_to_tables",
     "floatsam_threshold_learner",
     "edge_disparity",
     "triangular_strength",
     "monopartite_projection",
+    "iter_monopartite_projection",
+    "minhash_projection",
+    "IncrementalMonopartiteProjector",
+    "self_similarity_projection",
     "read_graphology_json",
+    "write_graphology_json_to",
     "global_threshold_sparsification",
     "GlobalThresholdSparsifier",
     "multiscale_backbone",
     "MultiscaleBackboneSparsifier",
     "table_to_bipartite_graph",
+    "csv_to_bipartite_graph",
+    "table_to_cooccurrence_graph",
+    "table_to_citation_graph",
     "tables_to_graph",
     "edges_table_to_graph",
 ]
@@ -69,6 +92,9 @@ __toc__ = [
         "title": "Tabular data to graphs",
         "fns": [
             table_to_bipartite_graph,
+            csv_to_bipartite_graph,
+            table_to_cooccurrence_graph,
+            table_to_citation_graph,
             tables_to_graph,
             edges_table_to_graph,
         ],
@@ -79,9 +105,21 @@ __toc__ = [
             graph_to_nodes_dataframe,
             graph_to_edges_dataframe,
             graph_to_dataframes,
+            iter_graph_to_nodes_dataframes,
+            iter_graph_to_edges_dataframes,
+            write_graph_to_tables,
+        ],
+    },
+    {
+        "title": "Graph projection",
+        "fns": [
+            monopartite_projection,
+            iter_monopartite_projection,
+            minhash_projection,
+            IncrementalMonopartiteProjector,
+            self_similarity_projection,
         ],
     },
-    {"title": "Graph projection", "fns": [monopartite_projection]},
     {
         "title": "Graph sparsification",
         "fns": [global_threshold_sparsification, multiscale_backbone],
@@ -108,6 +146,6 @@ __toc__ = [
     {"title": "Learning", "fns": [floatsam_threshold_learner]},
     {
         "title": "Reading & Writing",
-        "fns": [read_graphology_json, write_graphology_json],
+        "fns": [read_graphology_json, write_graphology_json, write_graphology_json_to],
     },
 ]
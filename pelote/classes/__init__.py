@@ -1,5 +1,17 @@
-from pelote.classes.incremental_id_register import IncrementalIdRegister
+from pelote.classes.incremental_id_register import (
+    IncrementalIdRegister,
+    PartitionedIncrementalIdRegister,
+)
+from pelote.classes.spilling_counter import SpillingCounter
 from pelote.classes.traversal import DFSStack, BFSQueue
 from pelote.classes.union_find import UnionFind, DisjointSet
 
-__all__ = ["IncrementalIdRegister", "DFSStack", "BFSQueue", "UnionFind", "DisjointSet"]
+__all__ = [
+    "IncrementalIdRegister",
+    "PartitionedIncrementalIdRegister",
+    "SpillingCounter",
+    "DFSStack",
+    "BFSQueue",
+    "UnionFind",
+    "DisjointSet",
+]
@@ -15,6 +15,9 @@ class IncrementalIdRegister:
         self.__counter = 0
         self.__index = {}
 
+    def __len__(self) -> int:
+        return self.__counter
+
     def __getitem__(self, item) -> int:
         item_id = self.__index.get(item)
 
@@ -28,3 +31,53 @@ class IncrementalIdRegister:
     def clear(self) -> None:
         self.__counter = 0
         self.__index.clear()
+
+
+class PartitionedIncrementalIdRegister:
+    """
+    Helper class mapping incremental ids to arbitrary hashable keys living in
+    distinct partitions, e.g. the parts of a bipartite graph, and given as
+    (partition, key) tuples. Contrary to an IncrementalIdRegister indexing
+    such tuples, only the keys themselves are retained in memory.
+
+    If `record_keys` is True, the key of each id is also recorded in the
+    `keys` list, so that keys[i] is the key of id i.
+    """
+
+    __slots__ = ("__counter", "__indices", "keys")
+
+    def __init__(self, record_keys: bool = False):
+        self.__counter = 0
+        self.__indices = {}
+        self.keys = [] if record_keys else None
+
+    def __len__(self) -> int:
+        return self.__counter
+
+    def __getitem__(self, item) -> int:
+        partition, key = item
+
+        index = self.__indices.get(partition)
+
+        if index is None:
+            index = {}
+            self.__indices[partition] = index
+
+        item_id = index.get(key)
+
+        if item_id is None:
+            item_id = self.__counter
+            self.__counter += 1
+            index[key] = item_id
+
+            if self.keys is not None:
+                self.keys.append(key)
+
+        return item_id
+
+    def clear(self) -> None:
+        self.__counter = 0
+        self.__indices.clear()
+
+        if self.keys is not None:
+            self.keys.clear()
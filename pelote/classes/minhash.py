@@ -0,0 +1,107 @@
+# =============================================================================
+# Pelote MinHash Class
+# =============================================================================
+#
+from array import array
+from hashlib import blake2b
+from random import Random
+
+from pelote.shim import np
+
+# NOTE: Mersenne prime used as modulus for the universal hash functions. It
+# is small enough for the products to fit in 64 bits, so numpy can be used.
+MERSENNE_PRIME = (1 << 31) - 1
+
+# NOTE: number of item hashes processed at once by the numpy implementation
+NUMPY_CHUNK_SIZE = 2**12
+
+
+def stable_hash(item) -> int:
+    """
+    Function returning a hash of the given item that, contrary to python's
+    `hash`, does not change from one process to another.
+    """
+    if isinstance(item, int):
+        return item % MERSENNE_PRIME
+
+    if isinstance(item, str):
+        item = item.encode()
+    elif not isinstance(item, bytes):
+        item = repr(item).encode()
+
+    return int.from_bytes(blake2b(item, digest_size=8).digest(), "little") % (
+        MERSENNE_PRIME
+    )
+
+
+class MinHash(object):
+    """
+    Helper class computing MinHash signatures of sets of hashable items, used
+    to estimate the Jaccard similarity of two sets as the proportion of
+    identical values in their signatures. Signatures only depend on the seed,
+    and are computed using numpy when it is installed.
+    """
+
+    __slots__ = ("size", "coefficients", "a", "b")
+
+    def __init__(self, size: int = 128, seed=None):
+        self.size = size
+
+        rng = Random(seed)
+
+        self.coefficients = [
+            (rng.randint(1, MERSENNE_PRIME - 1), rng.randint(0, MERSENNE_PRIME - 1))
+            for _ in range(size)
+        ]
+
+        if np is not None:
+            self.a = np.array([a for a, _ in self.coefficients], dtype=np.uint64)
+            self.b = np.array([b for _, b in self.coefficients], dtype=np.uint64)
+
+    def signature(self, items) -> array:
+        return self.signature_from_hashes([stable_hash(item) for item in items])
+
+    def signature_from_hashes(self, hashes) -> array:
+        """
+        Compute the signature of a set whose items' stable hashes are given.
+        """
+        if not hashes:
+            raise TypeError("cannot compute the signature of an empty set")
+
+        if np is None:
+            return array(
+                "Q",
+                (
+                    min((a * h + b) % MERSENNE_PRIME for h in hashes)
+                    for a, b in self.coefficients
+                ),
+            )
+
+        hashes = np.array(hashes, dtype=np.uint64)
+        a = self.a[:, None]
+        b = self.b[:, None]
+
+        minimums = None
+
+        for i in range(0, len(hashes), NUMPY_CHUNK_SIZE):
+            chunk = hashes[None, i : i + NUMPY_CHUNK_SIZE]
+            values = ((a * chunk + b) % MERSENNE_PRIME).min(axis=1)
+
+            if minimums is None:
+                minimums = values
+            else:
+                np.minimum(minimums, values, out=minimums)
+
+        signature = array("Q")
+        signature.frombytes(minimums.tobytes())
+
+        return signature
+
+    def similarity(self, signature1: array, signature2: array) -> float:
+        same = 0
+
+        for v1, v2 in zip(signature1, signature2):
+            if v1 == v2:
+                same += 1
+
+        return same / self.size
@@ -3,8 +3,11 @@
 # =============================================================================
 #
 import math
+from array import array
 from collections import Counter
 
+from pelote.shim import np
+
 
 class OnlineMetric(object):
     """
@@ -12,6 +15,10 @@ class OnlineMetric(object):
     various graph projections etc.
     """
 
+    # NOTE: whether intersections only count co-occurrences or need to
+    # multiply both weights, which is used by vectorized engines
+    binary_intersection: bool = True
+
     def __init__(self):
         self._norms = {}
         self._norm_acc: float = 0
@@ -24,9 +31,12 @@ class OnlineMetric(object):
     def _finalize_norm(self, norm: float) -> float:
         return norm
 
-    def _accumulate(self, weight: float) -> None:
+    def _compute_norm_weight(self, weight: float) -> float:
         raise NotImplementedError
 
+    def _accumulate(self, weight: float) -> None:
+        self._norm_acc += self._compute_norm_weight(weight)
+
     def accumulate_norm(self, weight: float) -> None:
         self._accumulate(weight)
 
@@ -46,6 +56,13 @@ class OnlineMetric(object):
     def nodes(self):
         yield from self._norms.keys()
 
+    @property
+    def norms(self) -> dict:
+        return self._norms
+
+    def __contains__(self, item) -> bool:
+        return item in self._norms
+
     def __getitem__(self, item) -> float:
         return self._norms[item]
 
@@ -72,10 +89,35 @@ class OnlineMetric(object):
 
             yield neighbor, similarity
 
+    def compute_metric_array(self, intersections, norms1, norms2):
+        """
+        Method computing the metric for whole numpy arrays of intersections
+        and norms at once.
+        """
+        return self._compute_metric(intersections, norms1, norms2)
+
+    def max_partner_norm(self, norm: float, threshold: float) -> float:
+        """
+        Method returning the maximum norm a node whose norm is greater or
+        equal to the given one can have so that their similarity may still
+        reach the given threshold, which can be used to prune candidates
+        using their norm only.
+        """
+        return math.inf
+
+    def min_partner_norm(self, norm: float, threshold: float) -> float:
+        """
+        Method returning the minimum norm a node whose norm is lesser or
+        equal to the given one must have so that their similarity may still
+        reach the given threshold. This is the counterpart of
+        `max_partner_norm` when nodes are not visited by increasing norm.
+        """
+        return -math.inf
+
 
 class BinaryMetric(OnlineMetric):
-    def _accumulate(self, weight: float):
-        self._norm_acc += 1
+    def _compute_norm_weight(self, weight: float) -> float:
+        return 1
 
     def _compute_intersection_weight(self, w1: float, w2: float) -> float:
         return 1
@@ -85,21 +127,49 @@ class IntersectionMetric(BinaryMetric):
     def _compute_metric(self, intersection: float, norm1: float, norm2: float) -> float:
         return intersection
 
+    def max_partner_norm(self, norm: float, threshold: float) -> float:
+        # NOTE: intersection cannot exceed the smallest norm
+        return math.inf if norm >= threshold else -math.inf
+
+    def min_partner_norm(self, norm: float, threshold: float) -> float:
+        return threshold if norm >= threshold else math.inf
+
 
 class JaccardMetric(BinaryMetric):
     def _compute_metric(self, intersection: float, norm1: float, norm2: float) -> float:
         return intersection / (norm1 + norm2 - intersection)
 
+    def max_partner_norm(self, norm: float, threshold: float) -> float:
+        # NOTE: jaccard cannot exceed min(norm1, norm2) / max(norm1, norm2)
+        return norm / threshold
+
+    def min_partner_norm(self, norm: float, threshold: float) -> float:
+        return norm * threshold
+
 
 class OverlapMetric(BinaryMetric):
     def _compute_metric(self, intersection: float, norm1: float, norm2: float) -> float:
         return intersection / min(norm1, norm2)
 
+    def compute_metric_array(self, intersections, norms1, norms2):
+        return intersections / np.minimum(norms1, norms2)
+
 
 class DiceMetric(BinaryMetric):
     def _compute_metric(self, intersection: float, norm1: float, norm2: float) -> float:
         return (intersection * 2) / (norm1 + norm2)
 
+    def max_partner_norm(self, norm: float, threshold: float) -> float:
+        # NOTE: dice cannot exceed 2 * min(norm1, norm2) / (norm1 + norm2)
+        return norm * (2 - threshold) / threshold
+
+    def min_partner_norm(self, norm: float, threshold: float) -> float:
+        # NOTE: dice cannot exceed 1
+        if threshold >= 2:
+            return math.inf
+
+        return norm * threshold / (2 - threshold)
+
 
 class BinaryCosineMetric(BinaryMetric):
     def _finalize_norm(self, norm: float) -> float:
@@ -108,8 +178,17 @@ class BinaryCosineMetric(BinaryMetric):
     def _compute_metric(self, intersection: float, norm1: float, norm2: float) -> float:
         return intersection / (norm1 * norm2)
 
+    def max_partner_norm(self, norm: float, threshold: float) -> float:
+        # NOTE: binary cosine cannot exceed min(norm1, norm2) / max(norm1, norm2)
+        return norm / threshold
+
+    def min_partner_norm(self, norm: float, threshold: float) -> float:
+        return norm * threshold
+
 
 class DotProductMetric(BinaryMetric):
+    binary_intersection = False
+
     def _compute_intersection_weight(self, w1: float, w2: float) -> float:
         return w1 * w2
 
@@ -118,8 +197,16 @@ class DotProductMetric(BinaryMetric):
 
 
 class CosineMetric(BinaryCosineMetric):
-    def _accumulate(self, weight: float):
-        self._norm_acc += weight * weight
+    binary_intersection = False
+
+    def max_partner_norm(self, norm: float, threshold: float) -> float:
+        return math.inf
+
+    def min_partner_norm(self, norm: float, threshold: float) -> float:
+        return -math.inf
+
+    def _compute_norm_weight(self, weight: float) -> float:
+        return weight * weight
 
     def _compute_intersection_weight(self, w1: float, w2: float) -> float:
         return w1 * w2
@@ -133,6 +220,88 @@ class PMIMetric(BinaryMetric):
         # TODO: what should we do when the result is 0?
         return math.log(intersection / (norm1 * norm2))
 
+    def compute_metric_array(self, intersections, norms1, norms2):
+        return np.log(intersections / (norms1 * norms2))
+
+
+class DenseOnlineMetric(object):
+    """
+    A compact counterpart of OnlineMetric working on nodes keyed by dense
+    integer ids and whose norms are already known.
+
+    Intersections are accumulated into a preallocated array reused for every
+    source node, while keeping track of the touched indices, and the
+    similarities of all touched neighbors are finalized in a single
+    vectorized step when numpy is installed.
+    """
+
+    __slots__ = (
+        "metric",
+        "norms",
+        "intersections",
+        "stamps",
+        "touched",
+        "current_source",
+    )
+
+    def __init__(self, metric: OnlineMetric, norms: array):
+        n = len(norms)
+
+        self.metric = metric
+        self.norms = norms
+        self.intersections = array("d", bytes(8 * n))
+        self.stamps = array("q", [-1]) * n
+        self.touched = []
+        self.current_source = -1
+
+    def start_intersection(self, source: int) -> None:
+        self.current_source = source
+
+    def intersect(self, target: int, w1: float, w2: float) -> None:
+        # NOTE: stamps are used to know whether the target was already
+        # touched by the current source without having to reset anything
+        if self.stamps[target] != self.current_source:
+            self.stamps[target] = self.current_source
+            self.touched.append(target)
+
+        if self.metric.binary_intersection:
+            self.intersections[target] += 1
+        else:
+            self.intersections[target] += w1 * w2
+
+    def neighbors(self):
+        touched = self.touched
+        self.touched = []
+
+        if not touched:
+            return
+
+        norm1 = self.norms[self.current_source]
+        intersections = self.intersections
+
+        if np is None:
+            for neighbor in touched:
+                similarity = self.metric._compute_metric(
+                    intersections[neighbor], norm1, self.norms[neighbor]
+                )
+                intersections[neighbor] = 0
+
+                yield neighbor, similarity
+
+            return
+
+        # NOTE: those views share memory with the underlying arrays
+        intersections_view = np.frombuffer(intersections, dtype=np.float64)
+        norms_view = np.frombuffer(self.norms, dtype=np.float64)
+
+        indices = np.array(touched, dtype=np.intp)
+        similarities = self.metric.compute_metric_array(
+            intersections_view[indices], norm1, norms_view[indices]
+        )
+        intersections_view[indices] = 0
+
+        yield from zip(touched, similarities.tolist())
+
 
 SUPPORTED_METRICS = {
     None: IntersectionMetric,
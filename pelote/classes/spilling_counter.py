@@ -0,0 +1,113 @@
+# =============================================================================
+# Pelote Spilling Counter Class
+# =============================================================================
+#
+from array import array
+from heapq import merge
+from tempfile import TemporaryFile
+from typing import Optional
+
+# NOTE: number of (key, count) couples read at once from a spilled run
+READ_CHUNK_SIZE = 2**16
+
+
+def iter_run(f):
+    f.seek(0)
+
+    while True:
+        chunk = array("Q")
+
+        try:
+            chunk.fromfile(f, READ_CHUNK_SIZE * 2)
+        except EOFError:
+            pass
+
+        if not chunk:
+            return
+
+        for i in range(0, len(chunk), 2):
+            yield chunk[i], chunk[i + 1]
+
+
+class SpillingCounter(object):
+    """
+    Helper class counting unsigned 64 bits integer keys, while keeping at most
+    `max_keys` of them in memory (no limit if None). Each time this budget is
+    exceeded, counts are sorted and spilled to a temporary file on disk. Those
+    sorted runs are merged back when iterating over the counter's items.
+    """
+
+    __slots__ = ("max_keys", "dir", "counts", "runs")
+
+    def __init__(self, max_keys: Optional[int] = None, dir=None):
+        if max_keys is not None and (not isinstance(max_keys, int) or max_keys < 1):
+            raise TypeError("max_keys should be an int >= 1")
+
+        self.max_keys = max_keys
+        self.dir = dir
+        self.counts = {}
+        self.runs = []
+
+    def add(self, key: int, count: int = 1) -> None:
+        counts = self.counts
+        counts[key] = counts.get(key, 0) + count
+
+        if self.max_keys is not None and len(counts) > self.max_keys:
+            self.spill()
+
+    def spill(self) -> None:
+        if not self.counts:
+            return
+
+        run = array("Q")
+
+        for key in sorted(self.counts):
+            run.append(key)
+            run.append(self.counts[key])
+
+        f = TemporaryFile(dir=self.dir)
+        run.tofile(f)
+        f.flush()
+
+        self.runs.append(f)
+        self.counts.clear()
+
+    def items(self):
+        """
+        Yield (key, count) couples, in ascending key order.
+        """
+        in_memory = sorted(self.counts.items())
+
+        if not self.runs:
+            yield from in_memory
+            return
+
+        current_key = None
+        current_count = 0
+
+        for key, count in merge(in_memory, *(iter_run(f) for f in self.runs)):
+            if key == current_key:
+                current_count += count
+                continue
+
+            if current_key is not None:
+                yield current_key, current_count
+
+            current_key = key
+            current_count = count
+
+        if current_key is not None:
+            yield current_key, current_count
+
+    def close(self) -> None:
+        for f in self.runs:
+            f.close()
+
+        self.runs.clear()
+        self.counts.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -8,3 +8,15 @@ class PeloteException(Exception):
 
 class MissingPandasException(PeloteException):
     pass
+
+
+class MissingScipyException(PeloteException):
+    pass
+
+
+class MissingPyarrowException(PeloteException):
+    pass
+
+
+class MissingJSONBackendException(PeloteException):
+    pass
@@ -5,10 +5,282 @@
 # Functions able to convert networkx graphs to various tabular data formats.
 #
 from collections.abc import Mapping, Iterable
+from itertools import islice
 
-from pelote.shim import pd, check_pandas
+from pelote.shim import pd, pa, pq, check_pandas, check_pyarrow, is_parquet_path
 from pelote.graph import check_graph
 
+MISSING_VALUE = float("nan")
+DEFAULT_CHUNK_SIZE = 2**16
+
+
+def node_data_values(graph, node_data):
+    """
+    Function returning a list of (column name, mapping from nodes to values)
+    couples for the given node data, each mapping being computed once.
+    """
+    if node_data is None:
+        return []
+
+    return [
+        (col_name, {n: a.get(attr_name) for n, a in graph.nodes(data=True)})
+        for attr_name, col_name in node_data.items()
+    ]
+
+
+def edges_columns(
+    edges, n, edge_source_col, edge_target_col, source_values, target_values
+):
+    """
+    Function returning a dict of columns, as lists, describing the given `n`
+    edges. Attribute columns are discovered along the way and preallocated,
+    edges lacking the attribute having a missing value.
+    """
+    sources = [None] * n
+    targets = [None] * n
+
+    attr_columns = {}
+
+    for i, (source, target, a) in enumerate(edges):
+        sources[i] = source
+        targets[i] = target
+
+        for k, v in a.items():
+            column = attr_columns.get(k)
+
+            if column is None:
+                column = [MISSING_VALUE] * n
+                attr_columns[k] = column
+
+            column[i] = v
+
+        # NOTE: node data columns are placed as if the first edge had them
+        if i == 0:
+            for col_name, _ in source_values + target_values:
+                attr_columns.setdefault(col_name, None)
+
+    columns = {edge_source_col: sources, edge_target_col: targets}
+
+    for k, column in attr_columns.items():
+        # NOTE: edge attributes named as the source or target column take
+        # precedence over the edge's endpoints when present
+        if k in columns and column is not None:
+            column = [
+                e if v is MISSING_VALUE else v for v, e in zip(column, columns[k])
+            ]
+
+        columns[k] = column
+
+    for nodes, values in ((sources, source_values), (targets, target_values)):
+        for col_name, mapping in values:
+            columns[col_name] = list(map(mapping.__getitem__, nodes))
+
+    return columns
+
+
+def normalize_node_data(node_data, name):
+    if node_data is None:
+        return None
+
+    if not isinstance(node_data, (Mapping, Iterable)):
+        raise TypeError(
+            "%s should be an iterable of keys or a mapping of keys to extract from nodes"
+            % name
+        )
+
+    if not isinstance(node_data, Mapping):
+        node_data = {k: k for k in node_data}
+
+    return node_data
+
+
+def check_chunksize(chunksize):
+    if not isinstance(chunksize, int) or chunksize < 1:
+        raise TypeError("chunksize should be an int >= 1")
+
+
+def iter_chunks(iterator, chunksize):
+    iterator = iter(iterator)
+
+    while True:
+        chunk = list(islice(iterator, chunksize))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def add_sample(schema, col, value):
+    """
+    Function recording the given value as a sample of its type for the given
+    column of a schema, missing values being ignored.
+    """
+    samples = schema.get(col)
+
+    if samples is None:
+        samples = {}
+        schema[col] = samples
+
+    if value is not None and type(value) not in samples:
+        samples[type(value)] = value
+
+
+def nodes_schema(graph, node_key_col):
+    """
+    Function returning a dict mapping the node columns, in order of first
+    appearance, to a dict mapping each type of their non-missing values to a
+    sample value of this type.
+    """
+    schema = {}
+
+    for n, a in graph.nodes(data=True):
+        if node_key_col is not None:
+            add_sample(schema, node_key_col, n)
+
+        for k, v in a.items():
+            add_sample(schema, k, v)
+
+    if node_key_col is not None:
+        schema.setdefault(node_key_col, {})
+
+    return schema
+
+
+def edges_schema(graph, edge_source_col, edge_target_col, source_values, target_values):
+    """
+    Function returning a dict mapping the edge columns, in the same order as
+    `edges_columns`, to a dict mapping each type of their non-missing values
+    to a sample value of this type.
+    """
+    schema = {edge_source_col: {}, edge_target_col: {}}
+
+    for i, (source, target, a) in enumerate(graph.edges(data=True)):
+        add_sample(schema, edge_source_col, source)
+        add_sample(schema, edge_target_col, target)
+
+        for k, v in a.items():
+            add_sample(schema, k, v)
+
+        if i == 0:
+            for col_name, mapping in source_values + target_values:
+                schema.setdefault(col_name, {})
+
+    for col_name, mapping in source_values + target_values:
+        for v in mapping.values():
+            add_sample(schema, col_name, v)
+
+    return schema
+
+
+def arrow_type(samples):
+    """
+    Function returning the arrow type able to store all the values whose
+    samples are given, i.e. their common type, float64 for a mix of integers
+    and floats, and string otherwise.
+    """
+    types = {pa.array([sample]).type for sample in samples.values()}
+
+    if not types:
+        return pa.null()
+
+    if len(types) == 1:
+        return types.pop()
+
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+
+    return pa.string()
+
+
+def stringify(value):
+    # NOTE: pandas fills missing values of object columns with NaN
+    if value is None or value != value:
+        return None
+
+    return str(value)
+
+
+def iter_nodes_chunks(graph, chunksize, node_key_col, columns):
+    for chunk in iter_chunks(graph.nodes(data=True), chunksize):
+        if node_key_col is None:
+            yield pd.DataFrame(
+                data=[a for _, a in chunk],
+                index=[n for n, _ in chunk],
+                columns=columns,
+            )
+            continue
+
+        records = []
+
+        for n, a in chunk:
+            r = {node_key_col: n}
+            r.update(a)
+            records.append(r)
+
+        yield pd.DataFrame(data=records, columns=columns)
+
+
+def iter_edges_chunks(
+    graph,
+    chunksize,
+    edge_source_col,
+    edge_target_col,
+    source_values,
+    target_values,
+    columns,
+):
+    for chunk in iter_chunks(graph.edges(data=True), chunksize):
+        yield pd.DataFrame(
+            data=edges_columns(
+                chunk,
+                len(chunk),
+                edge_source_col,
+                edge_target_col,
+                source_values,
+                target_values,
+            ),
+            columns=columns,
+        )
+
+
+def write_dataframe_chunks(path, chunks, schema):
+    """
+    Function streaming the given DataFrame chunks, sharing the given schema,
+    to a CSV or parquet file, depending on the path's extension.
+    """
+    if is_parquet_path(path):
+        check_pyarrow()
+
+        arrow_schema = pa.schema(
+            [(col, arrow_type(samples)) for col, samples in schema.items()]
+        )
+
+        # NOTE: columns mixing incompatible types are written as strings
+        stringified = [
+            field.name
+            for field, samples in zip(arrow_schema, schema.values())
+            if pa.types.is_string(field.type) and set(samples) != {str}
+        ]
+
+        with pq.ParquetWriter(path, arrow_schema) as writer:
+            for chunk in chunks:
+                for col in stringified:
+                    chunk[col] = [stringify(v) for v in chunk[col]]
+
+                writer.write_table(
+                    pa.Table.from_pandas(
+                        chunk, schema=arrow_schema, preserve_index=False
+                    )
+                )
+
+        return
+
+    pd.DataFrame(columns=list(schema)).to_csv(path, index=False)
+
+    for chunk in chunks:
+        chunk.to_csv(path, mode="a", header=False, index=False)
+
 
 def graph_to_nodes_dataframe(graph, node_key_col: str = "key") -> "pd.DataFrame":
     """
@@ -86,44 +358,23 @@ def graph_to_edges_dataframe(
     check_pandas()
     check_graph(graph)
 
-    if source_node_data is not None:
-        if not isinstance(source_node_data, (Mapping, Iterable)):
-            raise TypeError(
-                "source_node_data should be an iterable of keys or a mapping of keys to extract from nodes"
-            )
-
-        if not isinstance(source_node_data, Mapping):
-            source_node_data = {k: k for k in source_node_data}
-
-    if target_node_data is not None:
-        if not isinstance(target_node_data, (Mapping, Iterable)):
-            raise TypeError(
-                "target_node_data should be an iterable of keys or a mapping of keys to extract from nodes"
-            )
-
-        if not isinstance(target_node_data, Mapping):
-            target_node_data = {k: k for k in target_node_data}
-
-    def data():
-        for source, target, a in graph.edges(data=True):
-            r = {edge_source_col: source, edge_target_col: target}
-            r.update(a)
-
-            if source_node_data is not None:
-                node_data = graph.nodes[source]
-
-                for attr_name, col_name in source_node_data.items():
-                    r[col_name] = node_data.get(attr_name)
-
-            if target_node_data is not None:
-                node_data = graph.nodes[target]
-
-                for attr_name, col_name in target_node_data.items():
-                    r[col_name] = node_data.get(attr_name)
-
-            yield r
-
-    return pd.DataFrame(data=data())
+    source_node_data = normalize_node_data(source_node_data, "source_node_data")
+    target_node_data = normalize_node_data(target_node_data, "target_node_data")
+
+    # NOTE: an empty graph yields a dataframe without any column
+    if graph.size() == 0:
+        return pd.DataFrame()
+
+    return pd.DataFrame(
+        data=edges_columns(
+            graph.edges(data=True),
+            graph.size(),
+            edge_source_col,
+            edge_target_col,
+            node_data_values(graph, source_node_data),
+            node_data_values(graph, target_node_data),
+        )
+    )
 
 
 def graph_to_dataframes(
@@ -170,3 +421,209 @@ def graph_to_dataframes(
     )
 
     return nodes, edges
+
+
+def iter_graph_to_nodes_dataframes(
+    graph, chunksize: int = DEFAULT_CHUNK_SIZE, *, node_key_col: str = "key"
+):
+    """
+    Function iterating over pandas DataFrames of at most `chunksize` rows
+    describing the nodes of the given networkx graph, so that they never
+    need to fit in memory all at once.
+
+    Every yielded DataFrame has the same columns, in the same order as
+    `graph_to_nodes_dataframe`, nodes lacking an attribute having a missing
+    value.
+
+    Args:
+        nx.AnyGraph: a networkx graph instance
+        chunksize (int, optional): maximum number of rows of each DataFrame.
+            Defaults to 65536.
+        node_key_col (str, optional): name of the DataFrame column containing
+            the node keys. If None, the node keys will be used as the DataFrame
+            index. Defaults to "key".
+
+    Yields:
+        pd.DataFrame: A pandas DataFrame
+
+    Example:
+        from pelote import iter_graph_to_nodes_dataframes
+
+        for df in iter_graph_to_nodes_dataframes(graph, 10_000):
+            print(len(df))
+    """
+
+    check_pandas()
+    check_graph(graph)
+    check_chunksize(chunksize)
+
+    columns = list(nodes_schema(graph, node_key_col))
+
+    return iter_nodes_chunks(graph, chunksize, node_key_col, columns)
+
+
+def iter_graph_to_edges_dataframes(
+    graph,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    *,
+    edge_source_col: str = "source",
+    edge_target_col: str = "target",
+    source_node_data=None,
+    target_node_data=None
+):
+    """
+    Function iterating over pandas DataFrames of at most `chunksize` rows
+    describing the edges of the given networkx graph, so that they never
+    need to fit in memory all at once.
+
+    Every yielded DataFrame has the same columns, in the same order as
+    `graph_to_edges_dataframe`, edges lacking an attribute having a missing
+    value.
+
+    Args:
+        nx.AnyGraph: a networkx graph instance
+        chunksize (int, optional): maximum number of rows of each DataFrame.
+            Defaults to 65536.
+        edge_source_col (str, optional): name of the DataFrame column containing
+            the edge source. Defaults to "source".
+        edge_target_col (str, optional): name of the DataFrame column containing
+            the edge target. Defaults to "target".
+        source_node_data (Iterable or Mapping, optional): iterable of attribute names
+            or mapping from attribute names to column name to be used to add
+            columns to the resulting dataframes based on source node data.
+            Defaults to None.
+        target_node_data (Iterable or Mapping, optional): iterable of attribute names
+            or mapping from attribute names to column name to be used to add
+            columns to the resulting dataframes based on target node data.
+            Defaults to None.
+
+    Yields:
+        pd.DataFrame: A pandas DataFrame
+
+    Example:
+        from pelote import iter_graph_to_edges_dataframes
+
+        for df in iter_graph_to_edges_dataframes(graph, 10_000):
+            print(df["weight"].sum())
+    """
+
+    check_pandas()
+    check_graph(graph)
+    check_chunksize(chunksize)
+
+    source_node_data = normalize_node_data(source_node_data, "source_node_data")
+    target_node_data = normalize_node_data(target_node_data, "target_node_data")
+
+    source_values = node_data_values(graph, source_node_data)
+    target_values = node_data_values(graph, target_node_data)
+
+    columns = list(
+        edges_schema(
+            graph, edge_source_col, edge_target_col, source_values, target_values
+        )
+    )
+
+    return iter_edges_chunks(
+        graph,
+        chunksize,
+        edge_source_col,
+        edge_target_col,
+        source_values,
+        target_values,
+        columns,
+    )
+
+
+def write_graph_to_tables(
+    graph,
+    nodes_path=None,
+    edges_path=None,
+    *,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    node_key_col: str = "key",
+    edge_source_col: str = "source",
+    edge_target_col: str = "target",
+    source_node_data=None,
+    target_node_data=None
+) -> None:
+    """
+    Function writing the nodes and/or edges of the given networkx graph to
+    CSV or parquet files, by streaming DataFrames of at most `chunksize` rows
+    so that the whole tables never need to fit in memory.
+
+    The format of each file is deduced from its extension: paths ending with
+    ".parquet" or ".pq" will be written as parquet (which requires `pyarrow`),
+    others as CSV (compressed if the extension calls for it, e.g. ".csv.gz").
+    Parquet column types are inferred from all the non-missing values found
+    in each column: columns mixing integers and floats are written as floats,
+    and columns mixing other types are written as strings.
+
+    Args:
+        nx.AnyGraph: a networkx graph instance
+        nodes_path (str or PathLike, optional): path of the file where nodes
+            will be written. If None, nodes will not be written. Defaults to None.
+        edges_path (str or PathLike, optional): path of the file where edges
+            will be written. If None, edges will not be written. Defaults to None.
+        chunksize (int, optional): maximum number of rows written at once.
+            Defaults to 65536.
+        node_key_col (str, optional): name of the node column containing
+            the node keys. Defaults to "key".
+        edge_source_col (str, optional): name of the edge column containing
+            the edge source. Defaults to "source".
+        edge_target_col (str, optional): name of the edge column containing
+            the edge target. Defaults to "target".
+        source_node_data (Iterable or Mapping, optional): iterable of attribute names
+            or mapping from attribute names to column name to be used to add
+            columns to the edge file based on source node data.
+            Defaults to None.
+        target_node_data (Iterable or Mapping, optional): iterable of attribute names
+            or mapping from attribute names to column name to be used to add
+            columns to the edge file based on target node data.
+            Defaults to None.
+
+    Example:
+        from pelote import write_graph_to_tables
+
+        write_graph_to_tables(graph, "nodes.csv", "edges.parquet")
+    """
+
+    check_pandas()
+    check_graph(graph)
+    check_chunksize(chunksize)
+
+    if not isinstance(node_key_col, str):
+        raise TypeError("node_key_col should be a str")
+
+    if nodes_path is not None:
+        schema = nodes_schema(graph, node_key_col)
+
+        write_dataframe_chunks(
+            nodes_path,
+            iter_nodes_chunks(graph, chunksize, node_key_col, list(schema)),
+            schema,
+        )
+
+    if edges_path is not None:
+        source_node_data = normalize_node_data(source_node_data, "source_node_data")
+        target_node_data = normalize_node_data(target_node_data, "target_node_data")
+
+        source_values = node_data_values(graph, source_node_data)
+        target_values = node_data_values(graph, target_node_data)
+
+        schema = edges_schema(
+            graph, edge_source_col, edge_target_col, source_values, target_values
+        )
+
+        write_dataframe_chunks(
+            edges_path,
+            iter_edges_chunks(
+                graph,
+                chunksize,
+                edge_source_col,
+                edge_target_col,
+                source_values,
+                target_values,
+                list(schema),
+            ),
+            schema,
+        )
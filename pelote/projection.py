@@ -5,15 +5,737 @@
 # Functions used to compute various networkx projections such as bipartite
 # to monopartite, for instance.
 #
+import math
 import networkx as nx
+from array import array
+from bisect import bisect_right
+from heapq import heappush, heappushpop
+from itertools import repeat
+from multiprocessing import Pool
 from collections import defaultdict
 from collections.abc import Hashable
 from ebbe import omit
 
-from pelote.classes import BFSQueue
-from pelote.classes.online_metrics import instantiate_online_metric
+from pelote.classes import BFSQueue, IncrementalIdRegister
+from pelote.classes.minhash import MinHash, stable_hash
+from pelote.classes.online_metrics import (
+    DenseOnlineMetric,
+    instantiate_online_metric,
+)
 from pelote.graph import check_graph
-from pelote.utils import has_constant_time_lookup
+from pelote.shim import np, sp, check_scipy
+from pelote.utils import has_constant_time_lookup, uint_representation_for_capacity
+
+PROJECTION_ENGINES = ("python", "compact", "sparse")
+TOKEN_WEIGHTINGS = (None, "idf")
+
+
+def part_predicate(part_to_keep, node_part_attr: str):
+    """
+    Function returning a predicate taking a node and its attributes and
+    returning whether it belongs to the part to keep, which can be given
+    either as a part name or as a collection of nodes.
+    """
+    if isinstance(part_to_keep, Hashable):
+        return lambda _, a: a.get(node_part_attr) == part_to_keep
+
+    if not has_constant_time_lookup(part_to_keep):
+        part_to_keep = set(part_to_keep)
+
+    return lambda n, _: n in part_to_keep
+
+
+def raise_empty_part(part_to_keep, node_part_attr: str):
+    raise TypeError(
+        '"%s" part does not exist in given graph. Are you sure your nodes have a "%s" attribute?'
+        % (part_to_keep, node_part_attr)
+    )
+
+
+class TokenPolicy(object):
+    """
+    Class deciding which tokens (i.e. nodes of the part that is not kept)
+    should be considered when projecting a bipartite graph, and how their
+    edges' weights should be scaled.
+    """
+
+    __slots__ = ("graph", "min_degree", "max_degree", "idf_total")
+
+    def __init__(
+        self, graph, min_degree=None, max_degree=None, weighting=None, part_size=None
+    ):
+        self.graph = graph
+        self.min_degree = min_degree
+        self.max_degree = max_degree
+        self.idf_total = part_size if weighting == "idf" else None
+
+    def keeps(self, token) -> bool:
+        degree = len(self.graph[token])
+
+        if self.min_degree is not None and degree < self.min_degree:
+            return False
+
+        if self.max_degree is not None and degree > self.max_degree:
+            return False
+
+        return True
+
+    def factor(self, token) -> float:
+        if self.idf_total is None:
+            return 1
+
+        return math.log(self.idf_total / len(self.graph[token]))
+
+
+def sparse_cooccurrences(shape, rows, cols, weights=None):
+    """
+    Function computing the strict upper triangle of the co-occurrence matrix
+    B·Bᵀ, B being the CSR incidence matrix built from the given triples.
+    If weights are not given, B will be binary.
+
+    Returns:
+        tuple: row indices, col indices and intersections as numpy arrays.
+    """
+    if weights is None:
+        data = np.ones(len(rows), dtype=np.int64)
+    else:
+        data = np.asarray(weights)
+
+    incidence = sp.csr_matrix((data, (rows, cols)), shape=shape)
+
+    cooccurrences = sp.triu(incidence @ incidence.T, k=1).tocoo()
+
+    return (
+        cooccurrences.row,
+        cooccurrences.col,
+        cooccurrences.data,
+    )
+
+
+def compact_adjacency(bipartite_graph, nodes, edge_weight_attr: str, token_policy=None):
+    """
+    Function building a compact integer-based representation of the adjacency
+    of the given nodes in a bipartite graph, that can be cheaply shipped to
+    other processes.
+
+    Returns:
+        tuple: the tokens of each node and the nodes of each token, both as
+            lists of (ids, weights) arrays, ids being the node's index in
+            the given list. The nodes of each token are sorted by id.
+    """
+    node_id = {n: i for i, n in enumerate(nodes)}
+    token_id = IncrementalIdRegister()
+
+    node_code = uint_representation_for_capacity(max(len(nodes), 1)).code
+    token_code = uint_representation_for_capacity(bipartite_graph.order()).code
+
+    node_tokens = []
+    token_nodes = []
+
+    for n1 in nodes:
+        ids = array(token_code)
+        weights = array("d")
+
+        for token, ta in bipartite_graph[n1].items():
+            factor = 1
+
+            if token_policy is not None:
+                if not token_policy.keeps(token):
+                    continue
+
+                factor = token_policy.factor(token)
+
+                # NOTE: zero-factor tokens cannot contribute to any similarity
+                if factor == 0:
+                    continue
+
+            t = token_id[token]
+
+            if t == len(token_nodes):
+                postings = sorted(
+                    (node_id[n2], a2.get(edge_weight_attr, 1) * factor)
+                    for n2, a2 in bipartite_graph[token].items()
+                    if n2 in node_id
+                )
+
+                token_nodes.append(
+                    (
+                        array(node_code, (j for j, _ in postings)),
+                        array("d", (w for _, w in postings)),
+                    )
+                )
+
+            ids.append(t)
+            weights.append(ta.get(edge_weight_attr, 1) * factor)
+
+        node_tokens.append((ids, weights))
+
+    return node_tokens, token_nodes
+
+
+# NOTE: this state is set once per worker process by the pool initializer
+# so that the compact adjacency is only shipped once
+PROJECTION_WORKER_STATE = None
+
+
+def init_projection_worker(metric, norms, node_tokens, token_nodes, weight_threshold):
+    global PROJECTION_WORKER_STATE
+
+    PROJECTION_WORKER_STATE = (
+        metric,
+        norms,
+        node_tokens,
+        token_nodes,
+        weight_threshold,
+    )
+
+
+def project_nodes(state, ids):
+    metric, norms, node_tokens, token_nodes, weight_threshold = state
+
+    online_metric = instantiate_online_metric(metric)
+    dense_metric = DenseOnlineMetric(online_metric, norms)
+
+    # NOTE: since node ids are sorted by norm, the norm of the partners of a
+    # node, found after it in the postings, can only increase. This means we
+    # can stop scanning a posting list as soon as a partner's norm is too
+    # large for the similarity to ever reach the threshold (length filtering).
+    max_norm = math.inf
+
+    for i in ids:
+        dense_metric.start_intersection(i)
+
+        if weight_threshold is not None:
+            # NOTE: tolerance is here to avoid float rounding issues
+            max_norm = online_metric.max_partner_norm(norms[i], weight_threshold)
+            max_norm *= 1 + 1e-9
+
+        for t, w1 in zip(*node_tokens[i]):
+            partners, weights = token_nodes[t]
+
+            # NOTE: same as the serial version, we only compute each
+            # pair once, using the integer ids' ordering
+            for k in range(bisect_right(partners, i), len(partners)):
+                j = partners[k]
+
+                if norms[j] > max_norm:
+                    break
+
+                dense_metric.intersect(j, w1, weights[k])
+
+        for j, similarity in dense_metric.neighbors():
+            if weight_threshold is not None and similarity < weight_threshold:
+                continue
+
+            yield i, j, similarity
+
+
+def project_shard(shard):
+    assert PROJECTION_WORKER_STATE is not None
+
+    return list(project_nodes(PROJECTION_WORKER_STATE, shard))
+
+
+def iter_compact_projection(state, n_jobs: int = 1):
+    """
+    Function yielding the (i, j, similarity) triples of the projection
+    described by the given compact state, i.e. a (metric, norms, node_tokens,
+    token_nodes, weight_threshold) tuple whose node ids are sorted by norm.
+    """
+    n = len(state[1])
+
+    if n_jobs == 1:
+        yield from project_nodes(state, range(n))
+        return
+
+    # NOTE: shards are built by striding over the nodes because the
+    # first ones must compare themselves with more nodes than the last
+    # ones, which would unbalance contiguous shards
+    n_shards = n_jobs * 4
+    shards = [range(k, n, n_shards) for k in range(n_shards)]
+
+    with Pool(n_jobs, initializer=init_projection_worker, initargs=state) as pool:
+        for edges in pool.imap(project_shard, shards):
+            yield from edges
+
+
+def sparse_projection_edges(
+    online_metric, row_nodes, incidence_shape, incidence, weight_threshold
+):
+    rows, cols, weights = incidence
+
+    if not rows:
+        return
+
+    norms = np.array([online_metric[n] for n in row_nodes])
+
+    sources, targets, intersections = sparse_cooccurrences(
+        incidence_shape,
+        np.frombuffer(rows, dtype=np.int64),
+        np.frombuffer(cols, dtype=np.int64),
+        None if online_metric.binary_intersection else np.frombuffer(weights),
+    )
+
+    similarities = online_metric.compute_metric_array(
+        intersections, norms[sources], norms[targets]
+    )
+
+    if weight_threshold is not None:
+        mask = similarities >= weight_threshold
+        sources = sources[mask]
+        targets = targets[mask]
+        similarities = similarities[mask]
+
+    for i, j, similarity in zip(
+        sources.tolist(), targets.tolist(), similarities.tolist()
+    ):
+        yield row_nodes[i], row_nodes[j], similarity
+
+
+def compact_projection_edges(
+    bipartite_graph,
+    online_metric,
+    metric,
+    edge_weight_attr,
+    weight_threshold,
+    n_jobs,
+    token_policy=None,
+):
+    # NOTE: nodes are sorted by norm to enable length filtering
+    nodes = sorted(online_metric.nodes(), key=online_metric.__getitem__)
+    norms = array("d", (online_metric[n] for n in nodes))
+    node_tokens, token_nodes = compact_adjacency(
+        bipartite_graph, nodes, edge_weight_attr, token_policy
+    )
+
+    state = (metric, norms, node_tokens, token_nodes, weight_threshold)
+
+    for i, j, similarity in iter_compact_projection(state, n_jobs):
+        yield nodes[i], nodes[j], similarity
+
+
+def serial_projection_edges(
+    bipartite_graph, online_metric, edge_weight_attr, weight_threshold, token_policy
+):
+    norms = online_metric.norms
+
+    # NOTE: nodes with a null norm were dropped by the metric, which can only
+    # happen when tokens are weighted or pruned
+    check_norms = token_policy is not None or not online_metric.binary_intersection
+
+    max_norm = math.inf
+    min_norm = -math.inf
+
+    for n1 in online_metric.nodes():
+        online_metric.start_intersection(n1)
+
+        # NOTE: contrary to the compact engine, nodes are not visited by
+        # increasing norm, so candidates are pruned on both sides. Pruning
+        # happens before intersecting, since postings cannot be cut short.
+        bounded = False
+
+        if weight_threshold is not None:
+            # NOTE: tolerance is here to avoid float rounding issues
+            max_norm = online_metric.max_partner_norm(norms[n1], weight_threshold)
+            max_norm *= 1 + 1e-9
+            min_norm = online_metric.min_partner_norm(norms[n1], weight_threshold)
+            min_norm *= 1 - 1e-9
+            bounded = max_norm != math.inf or min_norm != -math.inf
+
+        # Computing intersections
+        for token, ta in bipartite_graph[n1].items():
+            factor = 1
+
+            if token_policy is not None:
+                if not token_policy.keeps(token):
+                    continue
+
+                factor = token_policy.factor(token)
+
+                # NOTE: zero-factor tokens cannot contribute to any similarity
+                if factor == 0:
+                    continue
+
+            w1 = ta.get(edge_weight_attr, 1) * factor
+
+            for n2, a2 in bipartite_graph[token].items():
+                # Don't compare to self
+                if n2 == n1:
+                    continue
+
+                # NOTE: since we are producing an undirected graphs we can
+                # avoid doing the same computations twice.
+                # NOTE: we could also drop n1 from the graph after we processed
+                # it as this would have the same effect. But this is often less
+                # performant because the graph must be copied to avoid
+                # mutation and dropping a node is at least O(E), E being the
+                # number of its incident edges.
+                elif n1 > n2:
+                    continue
+
+                if bounded:
+                    norm2 = norms.get(n2)
+
+                    if norm2 is None or norm2 > max_norm or norm2 < min_norm:
+                        continue
+
+                elif check_norms and n2 not in norms:
+                    continue
+
+                w2 = a2.get(edge_weight_attr, 1) * factor
+                online_metric.intersect(n2, w1, w2)
+
+        # Finalizing metrics
+        for n2, similarity in online_metric.neighbors():
+            if weight_threshold is not None and similarity < weight_threshold:
+                continue
+
+            yield n1, n2, similarity
+
+
+def top_k_projection_edges(edges, k: int, ranks):
+    """
+    Function consuming the given projection edges to only keep, for each node,
+    its k most similar neighbors, using one bounded heap per node. An edge is
+    kept if any of its endpoints has the other one in its top k. Ties are
+    broken using the given node ranks, favoring lower ones, so that results
+    do not depend on the order in which edges are produced.
+    """
+    heaps = defaultdict(list)
+
+    def push(heap, item):
+        if len(heap) < k:
+            heappush(heap, item)
+        elif item > heap[0]:
+            heappushpop(heap, item)
+
+    for n1, n2, similarity in edges:
+        r1 = ranks[n1]
+        r2 = ranks[n2]
+        push(heaps[n1], (similarity, -r2, n2))
+        push(heaps[n2], (similarity, -r1, n1))
+
+    # NOTE: an edge kept by both its endpoints must only be yielded once
+    yielded = set()
+
+    for n1, heap in heaps.items():
+        r1 = ranks[n1]
+
+        for similarity, r2, n2 in sorted(heap, reverse=True):
+            edge = (r1, -r2) if r1 < -r2 else (-r2, r1)
+
+            if edge in yielded:
+                yielded.discard(edge)
+                continue
+
+            yielded.add(edge)
+
+            yield n1, n2, similarity
+
+
+def _iter_monopartite_projection(
+    bipartite_graph,
+    part_to_keep,
+    *,
+    node_part_attr: str = "part",
+    edge_weight_attr: str = "weight",
+    metric=None,
+    bipartition_check: bool = True,
+    weight_threshold=None,
+    engine: str = "python",
+    n_jobs: int = 1,
+    top_k=None,
+    min_token_degree=None,
+    max_token_degree=None,
+    token_weighting=None,
+    on_kept_node=None,
+    on_pruning_report=None
+):
+    # NOTE: this function is not a generator itself so that validation and
+    # norms computation happen eagerly, while edges are produced lazily.
+
+    # TODO: raise if multigraph
+    check_graph(bipartite_graph)
+
+    if engine not in PROJECTION_ENGINES:
+        raise TypeError(
+            'unknown engine "%s", expecting one of %s'
+            % (engine, ", ".join('"%s"' % e for e in PROJECTION_ENGINES))
+        )
+
+    if engine == "sparse":
+        check_scipy()
+
+    if not isinstance(n_jobs, int) or n_jobs < 1:
+        raise TypeError("n_jobs should be an int >= 1")
+
+    if n_jobs > 1 and engine == "sparse":
+        raise TypeError('n_jobs cannot be used with the "sparse" engine')
+
+    if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+        raise TypeError("top_k should be an int >= 1")
+
+    for name, degree in (
+        ("min_token_degree", min_token_degree),
+        ("max_token_degree", max_token_degree),
+    ):
+        if degree is not None and (not isinstance(degree, int) or degree < 1):
+            raise TypeError("%s should be an int >= 1" % name)
+
+    if token_weighting not in TOKEN_WEIGHTINGS:
+        raise TypeError(
+            'unknown token_weighting "%s", expecting None or "idf"' % token_weighting
+        )
+
+    online_metric = instantiate_online_metric(metric)
+
+    if weight_threshold is not None and (
+        not isinstance(weight_threshold, (int, float)) or weight_threshold <= 0
+    ):
+        raise TypeError("weight_threshold should be a number >= 0")
+
+    # Null graph early exit
+    if bipartite_graph.order() == 0:
+        return iter(())
+
+    part_to_keep_as_set = not isinstance(part_to_keep, Hashable)
+    is_kept = part_predicate(part_to_keep, node_part_attr)
+
+    if part_to_keep_as_set:
+        if not has_constant_time_lookup(part_to_keep):
+            part_to_keep = set(part_to_keep)
+
+    token_policy = None
+
+    if (
+        min_token_degree is not None
+        or max_token_degree is not None
+        or token_weighting is not None
+    ):
+        part_size = None
+
+        if token_weighting == "idf":
+            part_size = sum(
+                1 for n, a in bipartite_graph.nodes(data=True) if is_kept(n, a)
+            )
+
+        token_policy = TokenPolicy(
+            bipartite_graph,
+            min_degree=min_token_degree,
+            max_degree=max_token_degree,
+            weighting=token_weighting,
+            part_size=part_size,
+        )
+
+    pruned_tokens = set()
+    skipped_cooccurrences = 0
+
+    # Computing norms
+    part_is_empty = True
+
+    # NOTE: the sparse engine collects incidence triples along the way
+    use_sparse_engine = engine == "sparse"
+    col_id = IncrementalIdRegister()
+    row_nodes = []
+
+    # NOTE: typed arrays avoid storing a python object per incidence triple
+    incidence_rows = array("q")
+    incidence_cols = array("q")
+    incidence_weights = array("d")
+
+    for n1, a1 in bipartite_graph.nodes(data=True):
+        if not is_kept(n1, a1):
+            continue
+
+        part_is_empty = False
+        online_metric.reset_norm()
+
+        if use_sparse_engine:
+            node_cols = []
+            node_weights = []
+
+        for token, ta in bipartite_graph[n1].items():
+            if bipartition_check:
+                if (part_to_keep_as_set and token in part_to_keep) or ta.get(  # type: ignore
+                    node_part_attr
+                ) == part_to_keep:
+                    raise TypeError(
+                        'given graph is not truly bipartite because of an edge between two nodes of the same part: "%s" and "%s"'
+                        % (n1, token)
+                    )
+
+            weight = ta.get(edge_weight_attr, 1)
+
+            if token_policy is not None:
+                if not token_policy.keeps(token):
+                    pruned_tokens.add(token)
+
+                    # NOTE: each skipped co-occurrence is counted twice,
+                    # once per node
+                    skipped_cooccurrences += len(bipartite_graph[token]) - 1
+                    continue
+
+                factor = token_policy.factor(token)
+
+                # NOTE: zero-factor tokens cannot contribute to any similarity
+                if factor == 0:
+                    continue
+
+                weight *= factor
+
+            online_metric.accumulate_norm(weight)
+
+            if use_sparse_engine:
+                node_cols.append(col_id[token])
+                node_weights.append(weight)
+
+        online_metric.add_norm(n1)
+
+        if use_sparse_engine and n1 in online_metric:
+            incidence_rows.extend(repeat(len(row_nodes), len(node_cols)))
+            incidence_cols.extend(node_cols)
+            incidence_weights.extend(node_weights)
+            row_nodes.append(n1)
+
+        if on_kept_node is not None:
+            on_kept_node(n1, a1)
+
+    if part_is_empty:
+        raise_empty_part(part_to_keep, node_part_attr)
+
+    online_metric.finalize()
+
+    if on_pruning_report is not None and (
+        min_token_degree is not None or max_token_degree is not None
+    ):
+        on_pruning_report(len(pruned_tokens), skipped_cooccurrences // 2)
+
+    if use_sparse_engine:
+        edges = sparse_projection_edges(
+            online_metric,
+            row_nodes,
+            (len(row_nodes), len(col_id)),
+            (incidence_rows, incidence_cols, incidence_weights),
+            weight_threshold,
+        )
+
+    elif n_jobs > 1 or engine == "compact":
+        edges = compact_projection_edges(
+            bipartite_graph,
+            online_metric,
+            metric,
+            edge_weight_attr,
+            weight_threshold,
+            n_jobs,
+            token_policy,
+        )
+
+    else:
+        edges = serial_projection_edges(
+            bipartite_graph,
+            online_metric,
+            edge_weight_attr,
+            weight_threshold,
+            token_policy,
+        )
+
+    if top_k is not None:
+        ranks = {n: i for i, n in enumerate(online_metric.nodes())}
+        edges = top_k_projection_edges(edges, top_k, ranks)
+
+    return edges
+
+
+def iter_monopartite_projection(
+    bipartite_graph,
+    part_to_keep,
+    *,
+    node_part_attr: str = "part",
+    edge_weight_attr: str = "weight",
+    metric=None,
+    bipartition_check: bool = True,
+    weight_threshold=None,
+    engine: str = "python",
+    n_jobs: int = 1,
+    top_k=None,
+    min_token_degree=None,
+    max_token_degree=None,
+    token_weighting=None
+):
+    """
+    Function returning an iterator over the edges of the monopartite projection
+    of a given bipartite graph wrt one of both partitions of the graph, without
+    ever building the projected graph in memory.
+
+    Edges are yielded lazily as soon as their source node has been processed,
+    so they can be directly written to a file, a database etc.
+
+    Note that the graph is validated and node norms are computed when calling
+    the function, not when starting to iterate.
+
+    Example:
+        import csv
+        from pelote import iter_monopartite_projection
+
+        with open("edges.csv", "w") as f:
+            writer = csv.writer(f)
+            writer.writerow(["source", "target", "weight"])
+
+            for edge in iter_monopartite_projection(bipartite, "account", metric="jaccard"):
+                writer.writerow(edge)
+
+    Args:
+        bipartite_graph (nx.AnyGraph): target graph. The function will raise
+            if given graph is not truly bipartite.
+        part_to_keep (Hashable or Collection): partition to keep in the projected
+            graph. It can either be the value of the part node attribute in the
+            given graph (a string, most commonly), or a collection (a set, list etc.)
+            holding the nodes composing the part to keep.
+        node_part_attr (str, optional): name of the node attribute containing
+            the part the node belongs to. Defaults to "part".
+        edge_weight_attr (str, optional): name of the edge attribute containing
+            the edge's weight. Defaults to "weight".
+        metric (str, optional): one of "jaccard", "overlap", "cosine", "dice",
+            "binary_cosine", "pmi" or "dot_product". If not given, resulting weight
+            will be set to the size of neighbor intersection. Defaults to None.
+        bipartition_check (bool, optional): whether to check if given graph
+            is truly bipartite. You can disable this as an optimization
+            strategy if you know what you are doing. Defaults to True.
+        weight_threshold (float, optional): if an edge weight should be less
+            than this threshold it will not be yielded. Defaults to None.
+        engine (str, optional): either "python", "compact" or "sparse". See
+            `monopartite_projection` for more details. Defaults to "python".
+        n_jobs (int, optional): number of processes to use to compute the
+            similarities. Defaults to 1.
+        top_k (int, optional): if given, only keep edges linking each node
+            to its k most similar neighbors. Note that in this case, edges
+            can only be yielded once every similarity has been computed.
+            Defaults to None.
+        min_token_degree (int, optional): tokens, i.e. nodes of the other
+            part, with fewer neighbors will be ignored. Defaults to None.
+        max_token_degree (int, optional): tokens, i.e. nodes of the other
+            part, with more neighbors will be ignored. Defaults to None.
+        token_weighting (str, optional): set to "idf" to scale edge weights
+            by the inverse document frequency of their token. Defaults to None.
+
+    Yields:
+        tuple: source node, target node and similarity.
+    """
+    return _iter_monopartite_projection(
+        bipartite_graph,
+        part_to_keep,
+        node_part_attr=node_part_attr,
+        edge_weight_attr=edge_weight_attr,
+        metric=metric,
+        bipartition_check=bipartition_check,
+        weight_threshold=weight_threshold,
+        engine=engine,
+        n_jobs=n_jobs,
+        top_k=top_k,
+        min_token_degree=min_token_degree,
+        max_token_degree=max_token_degree,
+        token_weighting=token_weighting,
+    )
 
 
 def monopartite_projection(
@@ -24,7 +746,13 @@ def monopartite_projection(
     edge_weight_attr: str = "weight",
     metric=None,
     bipartition_check: bool = True,
-    weight_threshold=None
+    weight_threshold=None,
+    engine: str = "python",
+    n_jobs: int = 1,
+    top_k=None,
+    min_token_degree=None,
+    max_token_degree=None,
+    token_weighting=None
 ):
     """
     Function returning the monopartite projection of a given bipartite graph
@@ -71,112 +799,498 @@ def monopartite_projection(
             strategy if you know what you are doing. Defaults to True.
         weight_threshold (float, optional): if an edge weight should be less
             than this threshold we would not add it to the projected
+            monopartite graph. Note that with the "python" and "compact"
+            engines, the threshold is also used to skip candidate pairs whose
+            norms alone make it impossible to reach it, for metrics having
+            such an upper bound ("jaccard", "dice", "binary_cosine" and
+            intersection). Defaults to None.
+        engine (str, optional): either "python", to compute intersections
+            by walking the graph, "compact", to walk a compact integer-based
+            copy of the graph's adjacency while accumulating intersections
+            in arrays (and finalizing them using `numpy`, if installed), or
+            "sparse", to compute them all at once as a sparse matrix product,
+            which is usually a lot faster but requires `numpy` and `scipy` to
+            be installed. All engines yield the same results, up to float
+            rounding.
+            Defaults to "python".
+        n_jobs (int, optional): number of processes to use to compute the
+            similarities. If greater than 1, the kept nodes will be split into
+            shards processed by a pool of workers using the "compact" engine.
+            Cannot be used with the "sparse" engine. Defaults to 1.
+        top_k (int, optional): if given, only keep edges linking each node
+            to its k most similar neighbors, which is useful to build kNN
+            graphs. An edge is kept if any of its endpoints has the other one
+            in its top k, so nodes can end up with more than k neighbors.
+            Memory usage is then bounded by the number of nodes times k.
+            Defaults to None.
+        min_token_degree (int, optional): tokens, i.e. nodes of the other
+            part, with fewer neighbors will be ignored, as if they were absent
+            from the graph (this also affects norms). Defaults to None.
+        max_token_degree (int, optional): tokens, i.e. nodes of the other
+            part, with more neighbors will be ignored, as if they were absent
+            from the graph (this also affects norms). This can drastically
+            speed up the projection since "hub" tokens generate a number of
+            pairs quadratic in their degree, at the cost of some accuracy.
+            When token degree bounds are given, the number of pruned tokens
+            and of skipped co-occurrences are reported in the resulting
+            graph's "pruned_tokens" and "skipped_cooccurrences" attributes.
+            Note that a pair of nodes sharing k pruned tokens accounts for k
+            skipped co-occurrences.
+            Defaults to None.
+        token_weighting (str, optional): set to "idf" to scale edge weights
+            by the inverse document frequency of their token, i.e.
+            log(N / degree), N being the number of nodes in the kept part.
+            This down-weights hub tokens and is only meaningful for weighted
+            metrics such as "cosine" or "dot_product". Tokens shared by every
+            node of the kept part get a null weight and are therefore ignored.
+            Defaults to None.
+
+    Returns:
+        nx.Graph: the projected monopartite graph.
+    """
+    monopartite_graph = nx.Graph()
+
+    def add_kept_node(n, a):
+        monopartite_graph.add_node(n, **omit(a, [node_part_attr]))
+
+    def add_pruning_report(pruned_tokens, skipped_cooccurrences):
+        monopartite_graph.graph["pruned_tokens"] = pruned_tokens
+        monopartite_graph.graph["skipped_cooccurrences"] = skipped_cooccurrences
+
+    edges = _iter_monopartite_projection(
+        bipartite_graph,
+        part_to_keep,
+        node_part_attr=node_part_attr,
+        edge_weight_attr=edge_weight_attr,
+        metric=metric,
+        bipartition_check=bipartition_check,
+        weight_threshold=weight_threshold,
+        engine=engine,
+        n_jobs=n_jobs,
+        top_k=top_k,
+        min_token_degree=min_token_degree,
+        max_token_degree=max_token_degree,
+        token_weighting=token_weighting,
+        on_kept_node=add_kept_node,
+        on_pruning_report=add_pruning_report,
+    )
+
+    for n1, n2, similarity in edges:
+        monopartite_graph.add_edge(n1, n2, weight=similarity)
+
+    return monopartite_graph
+
+
+def minhash_projection(
+    bipartite_graph,
+    part_to_keep,
+    *,
+    node_part_attr: str = "part",
+    bipartition_check: bool = True,
+    weight_threshold=None,
+    signature_size: int = 128,
+    bands: int = 32,
+    seed=None
+):
+    """
+    Function returning an approximate monopartite projection of a given
+    bipartite graph wrt one of both partitions of the graph, where edges are
+    weighted by an estimation of the Jaccard similarity of the neighbors
+    shared by their endpoints.
+
+    Instead of computing all the intersections, this function computes a
+    MinHash signature of each node's neighbors and only considers the pairs
+    of nodes whose signatures collide in at least one LSH band. This means
+    some edges might be missed and weights are only estimations.
+
+    Increasing the number of bands will find more edges at the cost of more
+    comparisons. Roughly speaking, pairs with a similarity above
+    (1 / bands) ^ (bands / signature_size) are likely to be found.
+
+    Article:
+        Broder, Andrei Z. "On the resemblance and containment of documents."
+        Proceedings. Compression and Complexity of SEQUENCES 1997.
+
+    References:
+        wikipedia: https://en.wikipedia.org/wiki/MinHash
+        book: http://infolab.stanford.edu/~ullman/mmds/ch3.pdf
+
+    Args:
+        bipartite_graph (nx.AnyGraph): target graph. The function will raise
+            if given graph is not truly bipartite.
+        part_to_keep (Hashable or Collection): partition to keep in the projected
+            graph. It can either be the value of the part node attribute in the
+            given graph (a string, most commonly), or a collection (a set, list etc.)
+            holding the nodes composing the part to keep.
+        node_part_attr (str, optional): name of the node attribute containing
+            the part the node belongs to. Defaults to "part".
+        bipartition_check (bool, optional): whether to check if given graph
+            is truly bipartite. You can disable this as an optimization
+            strategy if you know what you are doing. Defaults to True.
+        weight_threshold (float, optional): if an estimated edge weight should
+            be less than this threshold we would not add it to the projected
             monopartite graph. Defaults to None.
+        signature_size (int, optional): number of hash functions used to
+            compute the signatures. Larger signatures give more precise
+            estimations. Defaults to 128.
+        bands (int, optional): number of LSH bands, which must divide
+            `signature_size`. Defaults to 32.
+        seed (int, optional): seed of the random generator used to create
+            the hash functions. Defaults to None.
 
     Returns:
         nx.Graph: the projected monopartite graph.
     """
-    # TODO: raise if multigraph
     check_graph(bipartite_graph)
 
-    online_metric = instantiate_online_metric(metric)
-
     if weight_threshold is not None and (
         not isinstance(weight_threshold, (int, float)) or weight_threshold <= 0
     ):
         raise TypeError("weight_threshold should be a number >= 0")
 
+    if not isinstance(signature_size, int) or signature_size < 1:
+        raise TypeError("signature_size should be an int >= 1")
+
+    if not isinstance(bands, int) or bands < 1 or signature_size % bands != 0:
+        raise TypeError("bands should be an int >= 1 dividing signature_size")
+
+    monopartite_graph = nx.Graph()
+
     # Null graph early exit
     if bipartite_graph.order() == 0:
-        return nx.Graph()
+        return monopartite_graph
 
-    monopartite_graph = nx.Graph()
+    is_kept = part_predicate(part_to_keep, node_part_attr)
 
-    part_to_keep_as_set = not isinstance(part_to_keep, Hashable)
+    minhash = MinHash(signature_size, seed=seed)
+    rows = signature_size // bands
 
-    if part_to_keep_as_set:
-        if not has_constant_time_lookup(part_to_keep):
-            part_to_keep = set(part_to_keep)
+    signatures = {}
+    buckets = defaultdict(list)
 
-    # Computing norms
-    part_is_empty = True
+    # NOTE: tokens are shared by many nodes, so their hash is cached
+    token_hashes = {}
 
+    # Computing signatures & LSH buckets
     for n1, a1 in bipartite_graph.nodes(data=True):
-        if part_to_keep_as_set:
-            if n1 not in part_to_keep:  # type: ignore
-                continue
-        else:
-            p1 = a1.get(node_part_attr)
+        if not is_kept(n1, a1):
+            continue
 
-            if p1 != part_to_keep:
-                continue
+        monopartite_graph.add_node(n1, **omit(a1, [node_part_attr]))
 
-        part_is_empty = False
-        online_metric.reset_norm()
+        tokens = bipartite_graph[n1]
 
-        for token, ta in bipartite_graph[n1].items():
-            if bipartition_check:
-                if (part_to_keep_as_set and token in part_to_keep) or ta.get(  # type: ignore
-                    node_part_attr
-                ) == part_to_keep:
+        if bipartition_check:
+            for token in tokens:
+                if is_kept(token, bipartite_graph.nodes[token]):
                     raise TypeError(
                         'given graph is not truly bipartite because of an edge between two nodes of the same part: "%s" and "%s"'
                         % (n1, token)
                     )
 
-            weight = ta.get(edge_weight_attr, 1)
-            online_metric.accumulate_norm(weight)
+        if not tokens:
+            continue
 
-        online_metric.add_norm(n1)
-        monopartite_graph.add_node(n1, **omit(a1, [node_part_attr]))
+        hashes = []
 
-    if part_is_empty:
-        raise TypeError(
-            '"%s" part does not exist in given graph. Are you sure your nodes have a "%s" attribute?'
-            % (part_to_keep, node_part_attr)
-        )
+        for token in tokens:
+            h = token_hashes.get(token)
 
-    online_metric.finalize()
+            if h is None:
+                h = stable_hash(token)
+                token_hashes[token] = h
 
-    for n1 in online_metric.nodes():
-        online_metric.start_intersection(n1)
+            hashes.append(h)
 
-        # Computing intersections
-        for token, ta in bipartite_graph[n1].items():
-            w1 = ta.get(edge_weight_attr, 1)
+        signature = minhash.signature_from_hashes(hashes)
+        signatures[n1] = signature
 
-            for n2, a2 in bipartite_graph[token].items():
-                # Don't compare to self
-                if n2 == n1:
+        for band in range(bands):
+            k = (band, signature[band * rows : (band + 1) * rows].tobytes())
+            buckets[k].append(n1)
+
+    if monopartite_graph.order() == 0:
+        raise_empty_part(part_to_keep, node_part_attr)
+
+    # Estimating similarity of candidate pairs
+    for bucket in buckets.values():
+        for i in range(len(bucket)):
+            n1 = bucket[i]
+            s1 = signatures[n1]
+
+            for j in range(i + 1, len(bucket)):
+                n2 = bucket[j]
+
+                # NOTE: pairs can collide in multiple bands
+                if monopartite_graph.has_edge(n1, n2):
                     continue
 
-                # NOTE: since we are producing an undirected graphs we can
-                # avoid doing the same computations twice.
-                # NOTE: we could also drop n1 from the graph after we processed
-                # it as this would have the same effect. But this is often less
-                # performant because the graph must be copied to avoid
-                # mutation and dropping a node is at least O(E), E being the
-                # number of its incident edges.
-                elif n1 > n2:
+                similarity = minhash.similarity(s1, signatures[n2])
+
+                if weight_threshold is not None and similarity < weight_threshold:
                     continue
 
-                w2 = a2.get(edge_weight_attr, 1)
-                online_metric.intersect(n2, w1, w2)
+                monopartite_graph.add_edge(n1, n2, weight=similarity)
 
-        # Finalizing metrics
-        for n2, similarity in online_metric.neighbors():
-            if weight_threshold is not None and similarity < weight_threshold:
+    return monopartite_graph
+
+
+class IncrementalMonopartiteProjector(object):
+    """
+    Class maintaining the monopartite projection of a bipartite graph and
+    able to update it when edges are added to or removed from the bipartite
+    graph, by only recomputing the similarities of the affected pairs.
+
+    To do so, the projector keeps in memory the norms of the nodes and the
+    intersections of every co-occurring pair, which means memory usage is
+    proportional to the number of edges of the projected graph without
+    any weight threshold.
+
+    Note that the given bipartite graph is not mutated nor referenced after
+    the projector has been instantiated.
+
+    Example:
+        from pelote import IncrementalMonopartiteProjector
+
+        projector = IncrementalMonopartiteProjector(bipartite, "account", metric="jaccard")
+
+        projector.update(added=[(1, 6)], removed=[(3, 4)])
+
+        monopartite = projector.graph
+
+    Args:
+        bipartite_graph (nx.AnyGraph): target graph. The function will raise
+            if given graph is not truly bipartite.
+        part_to_keep (Hashable or Collection): partition to keep in the projected
+            graph. It can either be the value of the part node attribute in the
+            given graph (a string, most commonly), or a collection (a set, list etc.)
+            holding the nodes composing the part to keep.
+        node_part_attr (str, optional): name of the node attribute containing
+            the part the node belongs to. Defaults to "part".
+        edge_weight_attr (str, optional): name of the edge attribute containing
+            the edge's weight. Defaults to "weight".
+        metric (str, optional): one of "jaccard", "overlap", "cosine", "dice",
+            "binary_cosine", "pmi" or "dot_product". If not given, resulting weight
+            will be set to the size of neighbor intersection. Defaults to None.
+        bipartition_check (bool, optional): whether to check if given graph
+            is truly bipartite. Defaults to True.
+        weight_threshold (float, optional): if an edge weight should be less
+            than this threshold we would not keep it in the projected
+            monopartite graph. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        bipartite_graph,
+        part_to_keep,
+        *,
+        node_part_attr: str = "part",
+        edge_weight_attr: str = "weight",
+        metric=None,
+        bipartition_check: bool = True,
+        weight_threshold=None
+    ):
+        check_graph(bipartite_graph)
+
+        if weight_threshold is not None and (
+            not isinstance(weight_threshold, (int, float)) or weight_threshold <= 0
+        ):
+            raise TypeError("weight_threshold should be a number >= 0")
+
+        self.graph = nx.Graph()
+        self.weight_threshold = weight_threshold
+
+        self.__metric = instantiate_online_metric(metric)
+        self.__tokens = {}
+        self.__postings = {}
+        self.__norms = {}
+        self.__intersections = {}
+
+        if bipartite_graph.order() == 0:
+            return
+
+        is_kept = part_predicate(part_to_keep, node_part_attr)
+
+        for n, a in bipartite_graph.nodes(data=True):
+            if not is_kept(n, a):
                 continue
 
-            monopartite_graph.add_edge(n1, n2, weight=similarity)
+            self.__add_node(n, **omit(a, [node_part_attr]))
 
-    return monopartite_graph
+        if not self.__tokens:
+            raise_empty_part(part_to_keep, node_part_attr)
+
+        for n in self.__tokens:
+            for token, ta in bipartite_graph[n].items():
+                if bipartition_check and token in self.__tokens:
+                    raise TypeError(
+                        'given graph is not truly bipartite because of an edge between two nodes of the same part: "%s" and "%s"'
+                        % (n, token)
+                    )
+
+                self.__add_edge(n, token, ta.get(edge_weight_attr, 1))
+
+        self.__refresh(self.__tokens)
+
+    def __add_node(self, n, **attr) -> None:
+        self.graph.add_node(n, **attr)
+        self.__tokens[n] = {}
+        self.__norms[n] = 0
+        self.__intersections[n] = {}
+
+    def __add_edge(self, n, token, weight) -> None:
+        metric = self.__metric
+        tokens = self.__tokens[n]
+
+        if token in tokens:
+            self.__remove_edge(n, token)
+
+        postings = self.__postings.get(token)
+
+        if postings is None:
+            postings = {}
+            self.__postings[token] = postings
+
+        intersections = self.__intersections[n]
+
+        for m, w in postings.items():
+            # NOTE: the same record is shared by both nodes of the pair and
+            # holds the number of shared tokens and the intersection
+            record = intersections.get(m)
+
+            if record is None:
+                record = [0, 0]
+                intersections[m] = record
+                self.__intersections[m][n] = record
+
+            record[0] += 1
+            record[1] += metric._compute_intersection_weight(weight, w)
+
+        postings[n] = weight
+        tokens[token] = weight
+        self.__norms[n] += metric._compute_norm_weight(weight)
+
+    def __remove_edge(self, n, token) -> None:
+        metric = self.__metric
+        weight = self.__tokens[n].pop(token)
+        postings = self.__postings[token]
+
+        del postings[n]
+
+        intersections = self.__intersections[n]
+
+        for m, w in postings.items():
+            record = intersections[m]
+            record[0] -= 1
+            record[1] -= metric._compute_intersection_weight(weight, w)
+
+            if record[0] == 0:
+                del intersections[m]
+                del self.__intersections[m][n]
+
+                if self.graph.has_edge(n, m):
+                    self.graph.remove_edge(n, m)
+
+        if not postings:
+            del self.__postings[token]
+
+        self.__norms[n] -= metric._compute_norm_weight(weight)
+
+    def __refresh(self, nodes) -> None:
+        metric = self.__metric
+        norms = self.__norms
+        graph = self.graph
+        weight_threshold = self.weight_threshold
+
+        for n in nodes:
+            norm1 = metric._finalize_norm(norms[n])
+
+            for m, (_, intersection) in self.__intersections[n].items():
+                norm2 = metric._finalize_norm(norms[m])
+                similarity = metric._compute_metric(intersection, norm1, norm2)
+
+                if weight_threshold is not None and similarity < weight_threshold:
+                    if graph.has_edge(n, m):
+                        graph.remove_edge(n, m)
+
+                    continue
+
+                graph.add_edge(n, m, weight=similarity)
+
+    def update(self, added=None, removed=None) -> None:
+        """
+        Method updating the projection wrt a batch of added and removed edges
+        of the bipartite graph. Removals are applied first.
+
+        Args:
+            added (Iterable, optional): iterable of (node, token) or
+                (node, token, weight) tuples, where node belongs to the kept
+                part. Unknown nodes will be added to the projection. Adding
+                an existing edge updates its weight. Defaults to None.
+            removed (Iterable, optional): iterable of (node, token) tuples,
+                where node belongs to the kept part. Defaults to None.
+        """
+        affected = set()
+
+        if removed is not None:
+            for n, token in removed:
+                if n not in self.__tokens or token not in self.__tokens[n]:
+                    raise KeyError('edge "%s" -> "%s" does not exist' % (n, token))
+
+                self.__remove_edge(n, token)
+                affected.add(n)
+
+        if added is not None:
+            for edge in added:
+                n, token = edge[0], edge[1]
+                weight = edge[2] if len(edge) > 2 else 1
+
+                if token in self.__tokens:
+                    raise TypeError(
+                        'cannot add an edge between two nodes of the same part: "%s" and "%s"'
+                        % (n, token)
+                    )
+
+                if n not in self.__tokens:
+                    self.__add_node(n)
+
+                self.__add_edge(n, token, weight)
+                affected.add(n)
+
+        self.__refresh(affected)
+
+    def add_edges(self, edges) -> None:
+        """
+        Method updating the projection wrt a batch of edges added to the
+        bipartite graph.
+
+        Args:
+            edges (Iterable): iterable of (node, token) or (node, token, weight)
+                tuples, where node belongs to the kept part.
+        """
+        self.update(added=edges)
+
+    def remove_edges(self, edges) -> None:
+        """
+        Method updating the projection wrt a batch of edges removed from the
+        bipartite graph.
+
+        Args:
+            edges (Iterable): iterable of (node, token) tuples, where node
+                belongs to the kept part.
+        """
+        self.update(removed=edges)
 
 
 def bfs_from_node(graph, source, reverse=False, limit=1):
     queue = BFSQueue(graph)
     queue.append(source, (source, 0))
 
+    if not graph.is_directed():
+        get_neighbors = graph.neighbors
+    else:
+        get_neighbors = graph.predecessors if reverse else graph.successors
+
     while len(queue) != 0:
         node, depth = queue.popleft()
 
@@ -186,76 +1300,187 @@ def bfs_from_node(graph, source, reverse=False, limit=1):
         if depth >= limit:
             continue
 
-        for neighbor in (graph.predecessors if reverse else graph.successors)(node):
+        for neighbor in get_neighbors(node):
             queue.append(neighbor, (neighbor, depth + 1))
 
 
-def self_similarity_projection(graph, depth=1):
-    # TODO: raise if multigraph
-    check_graph(graph)
+# NOTE: structural features, i.e. (direction, depth, neighbor) triplets, are
+# encoded as ints so they are cheaper to hash and to store
+def encode_structural_feature(neighbor: int, out: bool, depth: int, limit: int) -> int:
+    return (neighbor * 2 + int(out)) * limit + depth - 1
 
-    # NOTE: only Jaccard & only directed version currently implemented
 
-    if not graph.is_directed():
-        raise NotImplementedError
+SELF_SIMILARITY_WORKER_STATE = None
 
-    # Null graph early exit
-    if graph.order() == 0:
-        return nx.Graph()
 
-    projected_graph = nx.Graph()
+def init_self_similarity_worker(state):
+    global SELF_SIMILARITY_WORKER_STATE
 
-    norms = {}
-    inverted_index = defaultdict(list)
+    SELF_SIMILARITY_WORKER_STATE = state
 
-    for node, attr in graph.nodes.data():
-        projected_graph.add_node(node, **attr)
 
-        norm = 0
-        candidates = defaultdict(int)
+def self_similarity_chunk(chunk):
+    assert SELF_SIMILARITY_WORKER_STATE is not None
 
-        # TODO: plug BFS strategy here
-        # TODO: directed BFS can only follow one kind of links, supposedly?
-        for out_neighbor, depth in bfs_from_node(graph, node, limit=depth):
-            norm += 1
-            k = (True, depth, out_neighbor)
-            container = inverted_index[k]
+    return list(self_similarity_edges(SELF_SIMILARITY_WORKER_STATE, chunk))
 
-            for candidate in container:
-                candidates[candidate] += 1
 
-            container.append(node)
+def self_similarity_edges(state, ids):
+    metric, depth, directed, norms, features, postings, weight_threshold = state
 
-        for in_neighbor, depth in bfs_from_node(graph, node, reverse=True, limit=depth):
-            norm += 1
-            k = (False, depth, in_neighbor)
-            container = inverted_index[k]
+    online_metric = instantiate_online_metric(metric)
 
-            for candidate in container:
-                candidates[candidate] += 1
+    for i in ids:
+        node_features = features[i]
+        feature_set = set(node_features)
+        candidates = defaultdict(int)
 
-            container.append(node)
+        for f in node_features:
+            for j in postings[f]:
+                # NOTE: we only compute each pair once
+                if j >= i:
+                    break
 
-        norms[node] = norm
+                candidates[j] += 1
 
-        for candidate, intersection in candidates.items():
-            candidate_norm = norms[candidate]
+        for j, intersection in candidates.items():
+            norm1 = norms[i]
+            norm2 = norms[j]
 
             # NOTE: We don't consider the edges between node & candidate in
-            # the similarity score.
+            # the similarity score since the related features cannot be
+            # shared by construction. So we drop them from both norms.
             # TODO: Verify that the bipartite projection conceptual parallelism
             # still holds.
-            # NOTE: Decrementing the candidate's norm twice is equivalent
-            # to decrementing both the candidate norm and node's one (only
-            # for Jaccard, will not work for Dice and overlap).
-            if graph.has_edge(node, candidate):
-                candidate_norm -= 2
+            for out in (True, False) if directed else (False,):
+                if encode_structural_feature(j, out, 1, depth) in feature_set:
+                    norm1 -= 1
+                    norm2 -= 1
+
+            similarity = online_metric._compute_metric(
+                intersection,
+                online_metric._finalize_norm(norm1),
+                online_metric._finalize_norm(norm2),
+            )
+
+            if weight_threshold is not None and similarity < weight_threshold:
+                continue
+
+            yield i, j, similarity
+
+
+def self_similarity_projection(
+    graph, depth: int = 1, *, metric="jaccard", weight_threshold=None, n_jobs: int = 1
+):
+    """
+    Function returning the self similarity projection of the given graph,
+    i.e. a graph where nodes are linked if they share structural features,
+    such as neighbors at a given depth, weighted by the similarity of those
+    features (structural equivalence).
+
+    In the directed case, out-neighbors and in-neighbors are considered as
+    different features.
+
+    Note that the features related to the edges between two nodes are not
+    considered when computing their similarity.
+
+    Example:
+        import networkx as nx
+        from pelote import self_similarity_projection
+
+        graph = nx.DiGraph()
+        graph.add_edge("John", "Mary")
+        graph.add_edge("Lucy", "Mary")
+
+        # Resulting graph will contain an edge between John & Lucy
+        projected = self_similarity_projection(graph)
+
+    Args:
+        graph (nx.AnyGraph): target graph.
+        depth (int, optional): maximum depth at which neighbors are
+            considered as features. Defaults to 1.
+        metric (str, optional): one of "jaccard", "overlap", "cosine", "dice",
+            "binary_cosine", "pmi" or "dot_product". If None, resulting weight
+            will be set to the number of shared features. Defaults to "jaccard".
+        weight_threshold (float, optional): if an edge weight should be less
+            than this threshold we would not add it to the projected
+            graph. Defaults to None.
+        n_jobs (int, optional): number of processes to use to compute the
+            similarities, nodes being processed in chunks by a pool of workers.
+            Defaults to 1.
+
+    Returns:
+        nx.Graph: the projected graph.
+    """
+    # TODO: raise if multigraph
+    check_graph(graph)
+
+    # NOTE: validating the metric
+    instantiate_online_metric(metric)
+
+    if not isinstance(depth, int) or depth < 1:
+        raise TypeError("depth should be an int >= 1")
+
+    if weight_threshold is not None and (
+        not isinstance(weight_threshold, (int, float)) or weight_threshold <= 0
+    ):
+        raise TypeError("weight_threshold should be a number >= 0")
+
+    if not isinstance(n_jobs, int) or n_jobs < 1:
+        raise TypeError("n_jobs should be an int >= 1")
+
+    projected_graph = nx.Graph()
+
+    # Null graph early exit
+    if graph.order() == 0:
+        return projected_graph
+
+    nodes = list(graph.nodes)
+    node_id = {n: i for i, n in enumerate(nodes)}
+    node_code = uint_representation_for_capacity(len(nodes)).code
+
+    directed = graph.is_directed()
+
+    norms = array("Q")
+    features = []
+    postings = defaultdict(lambda: array(node_code))
+
+    # Collecting structural features & building the inverted index
+    for i, (node, attr) in enumerate(graph.nodes.data()):
+        projected_graph.add_node(node, **attr)
+
+        node_features = array("Q")
+
+        for out in (True, False) if directed else (False,):
+            # TODO: plug BFS strategy here
+            for neighbor, d in bfs_from_node(graph, node, reverse=not out, limit=depth):
+                f = encode_structural_feature(node_id[neighbor], out, d, depth)
+                node_features.append(f)
+
+                # NOTE: postings are sorted by node id
+                postings[f].append(i)
+
+        norms.append(len(node_features))
+        features.append(node_features)
+
+    postings = dict(postings)
+    state = (metric, depth, directed, norms, features, postings, weight_threshold)
+
+    if n_jobs == 1:
+        for i, j, similarity in self_similarity_edges(state, range(len(nodes))):
+            projected_graph.add_edge(nodes[i], nodes[j], weight=similarity)
 
-            if graph.has_edge(candidate, node):
-                candidate_norm -= 2
+        return projected_graph
 
-            similarity = intersection / (norm + candidate_norm - intersection)
+    # NOTE: chunks are strided since nodes with higher ids have more candidates
+    n_chunks = n_jobs * 4
+    chunks = [range(k, len(nodes), n_chunks) for k in range(n_chunks)]
 
-            projected_graph.add_edge(node, candidate, weight=similarity)
+    with Pool(
+        n_jobs, initializer=init_self_similarity_worker, initargs=(state,)
+    ) as pool:
+        for edges in pool.imap(self_similarity_chunk, chunks):
+            for i, j, similarity in edges:
+                projected_graph.add_edge(nodes[i], nodes[j], weight=similarity)
 
     return projected_graph
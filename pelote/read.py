@@ -5,9 +5,136 @@
 # Functions used to read from various data formats.
 #
 import json
+import gzip
+import codecs
 import networkx as nx
 from pathlib import Path
 from io import IOBase
+from typing import Optional
+
+from pelote.shim import get_json_loads
+
+# NOTE: number of characters read at once by the incremental parser
+READ_CHUNK_SIZE = 2**16
+
+
+class GraphologyGraphBuilder(object):
+    """
+    Helper class building a networkx graph from serialized graphology options,
+    attributes, nodes and edges, fed in any order. Nodes and edges are added
+    to the graph as soon as its type is known, and buffered until then.
+    """
+
+    __slots__ = (
+        "graph",
+        "graph_type",
+        "is_multi",
+        "must_check_mixed",
+        "attributes",
+        "pending_nodes",
+        "pending_edges",
+    )
+
+    def __init__(self):
+        self.graph = None
+        self.graph_type = None
+        self.is_multi = False
+        self.must_check_mixed = False
+        self.attributes = {}
+        self.pending_nodes = []
+        self.pending_edges = []
+
+    def set_options(self, options) -> None:
+        self.graph_type = options["type"]
+        self.is_multi = options["multi"]
+        self.must_check_mixed = self.graph_type == "mixed"
+
+        pending_edges = self.pending_edges
+        self.pending_edges = []
+
+        # NOTE: mixed graphs get their actual type from their first edge
+        if not self.must_check_mixed:
+            self.create_graph()
+
+        for serialized_edge in pending_edges:
+            self.add_edge(serialized_edge)
+
+    def set_attributes(self, attributes) -> None:
+        if self.graph is not None:
+            self.graph.graph.update(attributes)
+        else:
+            self.attributes = attributes
+
+    def create_graph(self) -> None:
+        if self.graph_type == "directed":
+            if self.is_multi:
+                graph = nx.MultiDiGraph(**self.attributes)
+            else:
+                graph = nx.DiGraph(**self.attributes)
+        else:
+            if self.is_multi:
+                graph = nx.MultiGraph(**self.attributes)
+            else:
+                graph = nx.Graph(**self.attributes)
+
+        self.graph = graph
+
+        for serialized_node in self.pending_nodes:
+            self.add_node(serialized_node)
+
+        self.pending_nodes = []
+
+    def add_node(self, serialized_node) -> None:
+        if self.graph is None:
+            self.pending_nodes.append(serialized_node)
+            return
+
+        attr = serialized_node.get("attributes", {})
+        self.graph.add_node(serialized_node["key"], **attr)
+
+    def add_edge(self, serialized_edge) -> None:
+        if self.graph is None:
+            if self.graph_type is None:
+                self.pending_edges.append(serialized_edge)
+                return
+
+            if serialized_edge.get("undirected", False):
+                self.graph_type = "undirected"
+            else:
+                self.graph_type = "directed"
+
+            self.create_graph()
+
+        key = serialized_edge.get("key")
+        attr = serialized_edge.get("attributes", {})
+        source = serialized_edge["source"]
+        target = serialized_edge["target"]
+
+        if self.must_check_mixed:
+            is_valid = serialized_edge.get("undirected", False) == (
+                self.graph_type == "undirected"
+            )
+
+            if not is_valid:
+                raise TypeError("cannot parse true mixed graphs")
+
+        if key is not None and self.is_multi:
+            self.graph.add_edge(source, target, key=key, **attr)
+        else:
+            self.graph.add_edge(source, target, **attr)
+
+    def finalize(self):
+        if self.graph_type is None:
+            raise TypeError(
+                "cannot parse a graphology json that does not record the graph options"
+            )
+
+        # NOTE: a mixed graph without edges is considered directed
+        if self.graph is None:
+            self.graph_type = "directed"
+            self.create_graph()
+
+        return self.graph
 
 
 def parse_graphology_json(data):
@@ -16,62 +143,193 @@ def parse_graphology_json(data):
             "cannot parse a graphology json that does not record the graph options"
         )
 
-    options = data["options"]
-    graph_type = options["type"]
+    builder = GraphologyGraphBuilder()
+    builder.set_attributes(data.get("attributes", {}))
+    builder.set_options(data["options"])
 
-    graph_attributes = data.get("attributes", {})
     nodes = data.get("nodes")
     edges = data.get("edges")
-    must_check_mixed = graph_type == "mixed"
-
-    if must_check_mixed:
-        if edges and edges[0].get("undirected", False):
-            graph_type = "undirected"
-        else:
-            graph_type = "directed"
-
-    is_multi = options["multi"]
-
-    if graph_type == "directed":
-        if is_multi:
-            graph = nx.MultiDiGraph(**graph_attributes)
-        else:
-            graph = nx.DiGraph(**graph_attributes)
-    else:
-        if is_multi:
-            graph = nx.MultiGraph(**graph_attributes)
-        else:
-            graph = nx.Graph(**graph_attributes)
 
     if nodes is not None:
         for serialized_node in nodes:
-            attr = serialized_node.get("attributes", {})
-            graph.add_node(serialized_node["key"], **attr)
+            builder.add_node(serialized_node)
 
     if edges is not None:
         for serialized_edge in edges:
-            key = serialized_edge.get("key")
-            attr = serialized_edge.get("attributes", {})
-            source = serialized_edge["source"]
-            target = serialized_edge["target"]
+            builder.add_edge(serialized_edge)
 
-            if must_check_mixed:
-                is_valid = serialized_edge.get("undirected", False) == (
-                    graph_type == "undirected"
-                )
+    return builder.finalize()
 
-                if not is_valid:
-                    raise TypeError("cannot parse true mixed graphs")
 
-            if key is not None and is_multi:
-                graph.add_edge(source, target, key=key, **attr)
-            else:
-                graph.add_edge(source, target, **attr)
+class IncrementalJSONReader(object):
+    """
+    Helper class reading JSON values from a file one at a time, so that the
+    elements of a very large array can be decoded without loading the whole
+    file in memory.
+    """
+
+    __slots__ = ("file", "decoder", "text_decoder", "buffer", "pos", "eof")
+
+    def __init__(self, file):
+        self.file = file
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int = READ_CHUNK_SIZE) -> bool:
+        if self.eof:
+            return False
+
+        chunk = self.file.read(size)
+
+        if isinstance(chunk, bytes):
+            chunk = self.text_decoder.decode(chunk, final=not chunk)
+
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
 
-    return graph
+        return True
 
+    def error(self, msg):
+        return json.JSONDecodeError(msg, self.buffer, self.pos)
 
-def read_graphology_json(target):
+    def peek(self):
+        """
+        Return the next non-whitespace character, without consuming it, or
+        None if the end of the file was reached.
+        """
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            n = len(buffer)
+
+            while pos < n and buffer[pos] in " \t\n\r":
+                pos += 1
+
+            self.pos = pos
+
+            if pos < n:
+                return buffer[pos]
+
+            if not self.fill():
+                return None
+
+    def next_char(self):
+        c = self.peek()
+
+        if c is None:
+            raise self.error("Unexpected end of file")
+
+        self.pos += 1
+
+        return c
+
+    def expect(self, char) -> None:
+        if self.next_char() != char:
+            self.pos -= 1
+            raise self.error("Expecting '%s'" % char)
+
+    def value(self):
+        self.peek()
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # NOTE: reading more than what is buffered to avoid quadratic
+                # retries on very large values
+                if not self.fill(max(READ_CHUNK_SIZE, len(self.buffer) - self.pos)):
+                    raise
+
+                continue
+
+            # NOTE: a value reaching the end of the buffer might be truncated
+            if end == len(self.buffer) and self.fill():
+                continue
+
+            self.pos = end
+
+            return value
+
+    def iter_array(self):
+        self.expect("[")
+
+        if self.peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield self.value()
+
+            c = self.next_char()
+
+            if c == "]":
+                return
+
+            if c != ",":
+                self.pos -= 1
+                raise self.error("Expecting ',' delimiter")
+
+
+def parse_graphology_json_file(f):
+    """
+    Function parsing the given file representing a serialized graphology
+    graph incrementally, adding nodes and edges to the graph as they are read.
+    """
+    reader = IncrementalJSONReader(f)
+    builder = GraphologyGraphBuilder()
+
+    reader.expect("{")
+
+    if reader.peek() == "}":
+        reader.pos += 1
+        return builder.finalize()
+
+    while True:
+        key = reader.value()
+
+        if not isinstance(key, str):
+            raise reader.error("Expecting property name enclosed in double quotes")
+
+        reader.expect(":")
+
+        if key in ("nodes", "edges") and reader.peek() == "[":
+            add = builder.add_node if key == "nodes" else builder.add_edge
+
+            for item in reader.iter_array():
+                add(item)
+
+        elif key == "options":
+            builder.set_options(reader.value())
+
+        elif key == "attributes":
+            builder.set_attributes(reader.value())
+
+        else:
+            reader.value()
+
+        c = reader.next_char()
+
+        if c == "}":
+            break
+
+        if c != ",":
+            reader.pos -= 1
+            raise reader.error("Expecting ',' delimiter")
+
+    if reader.peek() is not None:
+        raise reader.error("Extra data")
+
+    return builder.finalize()
+
+
+def read_graphology_json(target, json_backend: Optional[str] = None):
     """
     Function reading and parsing the given json file representing a serialized
     [graphology](https://graphology.github.io/) graph as a networkx graph.
@@ -79,25 +337,45 @@ def read_graphology_json(target):
     Note that this function cannot parse a true mixed graph since this is not
     supported by networkx.
 
+    By default, files are parsed incrementally: nodes and edges are added to
+    the graph as they are read, so that the whole JSON tree never needs to be
+    held in memory. Note that nodes and edges read before the graph options
+    (or before the first edge, for mixed graphs) must be buffered until then.
+    Paths ending with ".gz" are read as gzipped files.
+
     Args:
         target (str or Path or file or dict): target to read and parse. Can
-            be a string path, a Path instance, a file buffer or already
-            parsed JSON data as a dict.
+            be a string path, a Path instance, a text or binary file buffer or
+            already parsed JSON data as a dict.
+        json_backend (str, optional): library used to parse the whole file
+            at once, among "json", "orjson" and "ujson", trading memory for
+            speed. If None, the file will be parsed incrementally.
+            Defaults to None.
 
     Returns:
         nx.AnyGraph: a networkx graph instance.
     """
+    if isinstance(target, dict):
+        return parse_graphology_json(target)
+
+    if json_backend is None:
+        parse = parse_graphology_json_file
+    else:
+        loads = get_json_loads(json_backend)
+
+        def parse(f):
+            return parse_graphology_json(loads(f.read()))
+
     if isinstance(target, (str, Path)):
-        with open(target) as f:
-            data = json.load(f)
+        if str(target).endswith(".gz"):
+            with gzip.open(target, "rb") as f:
+                return parse(f)
 
-    elif isinstance(target, IOBase):
-        data = json.load(target)
+        with open(target, "rb") as f:
+            return parse(f)
 
-    elif isinstance(target, dict):
-        data = target
+    elif isinstance(target, IOBase):
+        return parse(target)
 
     else:
         raise TypeError("expected a path or a file")
-
-    return parse_graphology_json(data)
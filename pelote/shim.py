@@ -1,4 +1,9 @@
+import os
+import sys
+import json
 from contextlib import contextmanager
+from importlib import import_module
+from importlib.util import find_spec
 
 try:
     import pandas
@@ -10,7 +15,54 @@ except ImportError:
     original_pandas = None
 
 
-from pelote.exceptions import MissingPandasException
+class LazyModule(object):
+    """
+    Proxy importing the given module on first attribute access, so that heavy
+    optional dependencies do not slow down `import pelote` for users who
+    never need them.
+    """
+
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = import_module(self._name)
+
+        return getattr(self._module, attr)
+
+
+def lazy_module(name: str):
+    """
+    Function returning a lazy proxy of the given module, or None if its top
+    level package is not installed.
+    """
+    if find_spec(name.split(".", 1)[0]) is None:
+        return None
+
+    return LazyModule(name)
+
+
+np = lazy_module("numpy")
+sp = lazy_module("scipy.sparse")
+pa = lazy_module("pyarrow")
+pq = lazy_module("pyarrow.parquet")
+orjson = lazy_module("orjson")
+ujson = lazy_module("ujson")
+
+
+from pelote.exceptions import (
+    MissingPandasException,
+    MissingScipyException,
+    MissingPyarrowException,
+    MissingJSONBackendException,
+)
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+JSON_BACKENDS = ("json", "orjson", "ujson")
 
 
 def obliterate_pandas():
@@ -72,3 +124,117 @@ def is_dataframe(value) -> bool:
         return False
 
     return isinstance(value, pd.DataFrame)
+
+
+def is_scipy_available() -> bool:
+    """
+    Function returning whether `numpy` and `scipy` are installed.
+    """
+    return sp is not None
+
+
+def check_scipy() -> None:
+    """
+    Function raising if `numpy` or `scipy` is not installed.
+    """
+    if sp is None:
+        raise MissingScipyException(
+            "numpy and scipy must be installed for this function to work"
+        )
+
+
+def check_pyarrow() -> None:
+    """
+    Function raising if `pyarrow` is not installed.
+    """
+    if pa is None:
+        raise MissingPyarrowException(
+            "pyarrow must be installed for this function to work"
+        )
+
+
+def is_arrow_table(value) -> bool:
+    """
+    Function returning whether the given value is an arrow Table, RecordBatch
+    or RecordBatchReader.
+    """
+    # NOTE: no need to import pyarrow if nobody did before
+    if pa is None or "pyarrow" not in sys.modules:
+        return False
+
+    return isinstance(value, (pa.Table, pa.RecordBatch, pa.ipc.RecordBatchReader))
+
+
+def is_parquet_path(value) -> bool:
+    """
+    Function returning whether the given value is the path of a parquet file.
+    """
+    if not isinstance(value, (str, os.PathLike)):
+        return False
+
+    return os.fspath(value).endswith(PARQUET_EXTENSIONS)
+
+
+def check_json_backend(backend: str) -> None:
+    """
+    Function raising if the given JSON backend is unknown or not installed.
+    """
+    if backend not in JSON_BACKENDS:
+        raise TypeError(
+            'unknown json backend "%s", expecting one of %s'
+            % (backend, ", ".join(JSON_BACKENDS))
+        )
+
+    if (backend == "orjson" and orjson is None) or (
+        backend == "ujson" and ujson is None
+    ):
+        raise MissingJSONBackendException(
+            "%s must be installed to be used as json backend" % backend
+        )
+
+
+def get_json_dumps(backend: str = "json"):
+    """
+    Function returning a function serializing a value as a JSON string, using
+    the given backend. Values the backend cannot serialize (numpy scalars,
+    non-string keys etc.) fall back to the standard library encoder.
+    """
+    check_json_backend(backend)
+
+    if backend == "orjson":
+
+        def dumps(value):
+            try:
+                return orjson.dumps(value).decode()
+            except TypeError:
+                return json.dumps(value)
+
+        return dumps
+
+    if backend == "ujson":
+
+        def dumps(value):
+            try:
+                return ujson.dumps(value)
+            except (TypeError, OverflowError):
+                return json.dumps(value)
+
+        return dumps
+
+    return json.dumps
+
+
+def get_json_loads(backend: str = "json"):
+    """
+    Function returning a function parsing a JSON string or bytes, using the
+    given backend.
+    """
+    check_json_backend(backend)
+
+    if backend == "orjson":
+        return orjson.loads
+
+    if backend == "ujson":
+        return ujson.loads
+
+    return json.loads
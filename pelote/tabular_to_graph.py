@@ -4,52 +4,683 @@
 #
 # Functions able to convert tabular data to networkx graphs.
 #
+import os
+import csv
+import pickle
+import warnings
+from array import array
 import networkx as nx
+from typing import Optional
 from collections.abc import Sequence, Mapping
+from operator import itemgetter
+from numbers import Integral
+from multiprocessing import Pool, get_start_method
 
-from pelote.utils import iterator_from_dataframe
-from pelote.classes import IncrementalIdRegister
+from pelote.shim import (
+    np,
+    pd,
+    pa,
+    pq,
+    is_dataframe,
+    is_arrow_table,
+    is_parquet_path,
+    check_pyarrow,
+)
+from pelote.utils import (
+    check_key_columns,
+    iterator_from_arrow,
+    iterator_from_dataframe,
+    tabular_columns,
+    uint_representation_for_capacity,
+)
+from pelote.classes import (
+    IncrementalIdRegister,
+    PartitionedIncrementalIdRegister,
+    SpillingCounter,
+)
+from pelote.classes.online_metrics import instantiate_online_metric
 from pelote.graph import check_node_exists
+from pelote.projection import iter_compact_projection
 
+NODE_LABELS = ("attribute", "table")
+
+MISSING = object()
+
+# NOTE: read buffer size used when opening CSV files
+CSV_BUFFER_SIZE = 2**20
+
+# NOTE: edges are packed in 64 bits integers, with 32 bits per node id
+MAX_PACKED_NODES = 2**32
+PACKED_NODE_MASK = MAX_PACKED_NODES - 1
+
+
+def compact_labels(labels):
+    """
+    Return a compact version of the given list of labels, i.e. an array of
+    64 bits integers if all of them are integers, or the list itself.
+    """
+    if labels and all(isinstance(label, Integral) for label in labels):
+        try:
+            return array("q", labels)
+        except OverflowError:
+            pass
+
+    return labels
+
+
+def compile_row_data_collector(spec):
+    """
+    Compile the given part data spec, once and for all, into a function
+    taking a row and returning the dict of attributes to collect.
+
+    Returns:
+        Callable or None: the collector, or None if there is nothing to collect.
+    """
+    if not spec:
+        return None
 
-def collect_row_data(spec, row):
     if callable(spec):
-        attr = spec(row)
 
-        if not isinstance(attr, dict):
-            raise TypeError(
-                "row data collection should return a dict but returned %s instead"
-                % type(attr).__name__
-            )
+        def collect(row):
+            attr = spec(row)
 
-        return attr
+            if not isinstance(attr, dict):
+                raise TypeError(
+                    "row data collection should return a dict but returned %s instead"
+                    % type(attr).__name__
+                )
+
+            return attr
+
+        return collect
 
     if isinstance(spec, Mapping):
+        pairs = tuple(spec.items())
+    elif isinstance(spec, Sequence):
+        pairs = tuple((col_name, col_name) for col_name in spec)
+    else:
+        raise TypeError(
+            "could not collect part data. expecting a callable, a mapping or a sequence"
+        )
+
+    def collect(row):
+        get = row.get
         attr = {}
 
-        for col_name, attr_name in spec.items():
-            v = row.get(col_name)
+        for col_name, attr_name in pairs:
+            v = get(col_name)
 
             if v is not None:
                 attr[attr_name] = v
 
         return attr
 
-    if isinstance(spec, Sequence):
-        attr = {}
+    return collect
 
-        for col_name in spec:
-            v = row.get(col_name)
 
-            if v is not None:
-                attr[col_name] = v
+def needed_columns(table, key_columns, *specs):
+    """
+    Return the list of columns to read from the given table, i.e. the key
+    columns and the ones used by the given part data specs, or None if all of
+    them may be needed, e.g. because a spec is a callable. Columns used by the
+    specs that cannot be found in the table are ignored.
+    """
+    check_key_columns(table, key_columns)
 
-        return attr
+    columns = list(key_columns)
+
+    for spec in specs:
+        if not spec:
+            continue
+
+        if callable(spec):
+            return None
+
+        columns.extend(spec.keys() if isinstance(spec, Mapping) else spec)
+
+    available = tabular_columns(table)
+
+    if available is not None:
+        columns = columns[: len(key_columns)] + [
+            col for col in columns[len(key_columns) :] if col in available
+        ]
+
+    return columns
+
+
+def compile_attributes_collector(columns):
+    """
+    Compile the given sequence of columns into a function taking a row and
+    returning a dict mapping stringified column names to their values.
+    """
+    names = tuple(str(col) for col in columns)
+
+    if not names:
+        return lambda row: {}
+
+    if len(names) == 1:
+        name = names[0]
+        col = columns[0]
+
+        return lambda row: {name: row[col]}
+
+    getter = itemgetter(*columns)
+
+    return lambda row: dict(zip(names, getter(row)))
+
+
+# NOTE: each aggregation is a (init, update) couple of functions respectively
+# creating the state of an edge from its first value and updating it
+EDGE_AGGREGATIONS = {
+    "sum": (lambda v: v, lambda state, v: state + v),
+    "min": (lambda v: v, lambda state, v: v if v < state else state),
+    "max": (lambda v: v, lambda state, v: v if v > state else state),
+    "mean": (lambda v: [v, 1], lambda state, v: [state[0] + v, state[1] + 1]),
+    "first": (lambda v: v, lambda state, v: state),
+    "last": (lambda v: v, lambda state, v: v),
+}
+
+
+def compile_edge_aggregations(spec):
+    """
+    Compile the given edge aggregations spec, i.e. a mapping from edge
+    attribute name to either an aggregation name, in which case the column
+    to aggregate has the same name, or to a (column, aggregation) couple.
+
+    Returns:
+        list: a list of (attr_name, column, aggregation, init, update) tuples.
+    """
+    if not spec:
+        return []
+
+    if not isinstance(spec, Mapping):
+        raise TypeError("edge_aggregations should be a mapping")
+
+    aggregations = []
+
+    for attr_name, aggregation in spec.items():
+        col = attr_name
+
+        if not isinstance(aggregation, str):
+            col, aggregation = aggregation
+
+        if aggregation not in EDGE_AGGREGATIONS:
+            raise TypeError(
+                'unknown aggregation "%s", expecting one of %s'
+                % (aggregation, ", ".join('"%s"' % a for a in EDGE_AGGREGATIONS))
+            )
+
+        init, update = EDGE_AGGREGATIONS[aggregation]
+        aggregations.append((str(attr_name), col, aggregation, init, update))
+
+    return aggregations
+
+
+def compile_splitter(separator):
+    """
+    Compile the given separator, i.e. a string or a function, into a function
+    taking a cell and returning the list of values it contains.
+
+    Returns:
+        Callable or None: the splitter, or None if cells should not be split.
+    """
+    if separator is None:
+        return None
+
+    if callable(separator):
+        return lambda cell: list(separator(cell))
+
+    if not isinstance(separator, str) or not separator:
+        raise TypeError("separator should be a non-empty string or a callable")
+
+    def split(cell):
+        if cell is None:
+            return []
+
+        if not isinstance(cell, str):
+            return [cell]
+
+        return [value for value in cell.split(separator) if value]
+
+    return split
+
+
+def iter_bipartite_pairs(
+    table, first_part_col, second_part_col, splitters=None, offset: int = 0
+):
+    """
+    Iterate over the (row_index, row, label1, label2) tuples found in the
+    given table, splitting multi-valued cells if necessary.
+    """
+    split_first, split_second = splitters or (None, None)
+
+    for i, row in enumerate(table, offset):
+        try:
+            label1 = row[first_part_col]
+            label2 = row[second_part_col]
+        except (IndexError, KeyError):
+            raise TypeError(
+                'row %i lacks the "%s" or the "%s" value'
+                % (i, first_part_col, second_part_col)
+            )
+
+        if split_first is None and split_second is None:
+            yield i, row, label1, label2
+            continue
+
+        labels1 = [label1] if split_first is None else split_first(label1)
+        labels2 = [label2] if split_second is None else split_second(label2)
+
+        for label1 in labels1:
+            for label2 in labels2:
+                yield i, row, label1, label2
+
+
+# NOTE: number of slices per worker when n_jobs > 1, so that workers
+# finishing early can pick up remaining slices
+SLICES_PER_WORKER = 4
+
+TABLE_WORKER_STATE = None
+
+
+def init_table_worker(*state):
+    global TABLE_WORKER_STATE
+
+    TABLE_WORKER_STATE = state
+
+
+def can_send_worker_state(state) -> bool:
+    """
+    Function returning whether the given worker state, whose first item is
+    the table, can be sent to workers, warning if it cannot. Workers inherit
+    it with the "fork" start method, but it must be pickled otherwise (e.g.
+    with "spawn" on Windows and macOS), which is not possible for lambdas or
+    locally defined functions. The table itself is not checked.
+    """
+    start_method = get_start_method()
+
+    if start_method == "fork":
+        return True
+
+    try:
+        pickle.dumps(state[1:])
+    except (pickle.PicklingError, AttributeError, TypeError):
+        warnings.warn(
+            'n_jobs is ignored and the table is read serially because separators or data specs cannot be pickled with the "%s" start method'
+            % start_method,
+            RuntimeWarning,
+        )
+        return False
+
+    return True
+
+
+def table_slices(table, n_jobs):
+    """
+    Function returning a list of (offset, slice) couples describing how
+    workers can read their own part of the given table, or None if the table
+    cannot be sliced (e.g. a row iterator). Slices are either (start, stop)
+    ranges of rows or, for parquet files, row group indices.
+    """
+    if is_parquet_path(table):
+        check_pyarrow()
+
+        metadata = pq.ParquetFile(table).metadata
+        slices = []
+        offset = 0
+
+        for i in range(metadata.num_row_groups):
+            slices.append((offset, i))
+            offset += metadata.row_group(i).num_rows
+
+        return slices
+
+    if is_dataframe(table) or (is_arrow_table(table) and isinstance(table, pa.Table)):
+        n = len(table)
+    elif isinstance(table, Sequence) and not isinstance(table, str):
+        n = len(table)
+    else:
+        return None
+
+    step = max(1, -(-n // (n_jobs * SLICES_PER_WORKER)))
+
+    return [(start, (start, min(start + step, n))) for start in range(0, n, step)]
+
+
+def read_table_slice(table, table_slice, columns):
+    """
+    Function iterating over the rows of the given slice of the given table,
+    as returned by `table_slices`.
+    """
+    if is_parquet_path(table):
+        row_group = pq.ParquetFile(table).read_row_group(table_slice, columns=columns)
+
+        return iterator_from_arrow(row_group, columns)
+
+    start, stop = table_slice
+
+    if is_dataframe(table):
+        return iterator_from_dataframe(table.iloc[start:stop], columns)
+
+    if is_arrow_table(table):
+        return iterator_from_arrow(table.slice(start, stop - start), columns)
 
-    raise TypeError(
-        "could not collect part data. expecting a callable, a mapping or a sequence"
+    return table[start:stop]
+
+
+def remap_packed_pairs(pairs, ids) -> array:
+    """
+    Function translating packed pairs of local node indices into packed pairs
+    of the given global ids.
+    """
+    if np is not None and pairs:
+        ids = np.array(ids, dtype=np.uint64)
+        pairs = np.frombuffer(pairs, dtype=np.uint64)
+        remapped = array("Q")
+        remapped.frombytes(
+            ((ids[pairs >> 32] << 32) | ids[pairs & PACKED_NODE_MASK]).tobytes()
+        )
+
+        return remapped
+
+    return array(
+        "Q", ((ids[pair >> 32] << 32) | ids[pair & PACKED_NODE_MASK] for pair in pairs)
+    )
+
+
+def merge_packed_counts(pairs, counts, directed: bool = False):
+    """
+    Function merging the counts of the given packed pairs, returning the
+    distinct pairs in order of first appearance, their summed counts and the
+    index of their first appearance. When not directed, reversed pairs are
+    merged into the first one seen.
+    """
+    if np is not None and pairs:
+        pairs = np.frombuffer(pairs, dtype=np.uint64)
+        keys = pairs
+
+        if not directed:
+            sources = pairs >> 32
+            targets = pairs & PACKED_NODE_MASK
+            keys = (np.minimum(sources, targets) << 32) | np.maximum(sources, targets)
+
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        totals = np.bincount(
+            inverse.ravel(), weights=np.frombuffer(counts, dtype=np.int64)
+        ).astype(np.int64)
+
+        order = np.argsort(first, kind="stable")
+        first = first[order]
+
+        return pairs[first].tolist(), totals[order].tolist(), first.tolist()
+
+    index = {}
+    distinct_pairs = []
+    totals = []
+    first = []
+
+    for i, (pair, count) in enumerate(zip(pairs, counts)):
+        key = pair
+
+        if not directed:
+            source = pair >> 32
+            target = pair & PACKED_NODE_MASK
+
+            if source > target:
+                key = (target << 32) | source
+
+        j = index.get(key)
+
+        if j is None:
+            index[key] = len(distinct_pairs)
+            distinct_pairs.append(pair)
+            totals.append(count)
+            first.append(i)
+        else:
+            totals[j] += count
+
+    return distinct_pairs, totals, first
+
+
+def count_bipartite_slice(task):
+    """
+    Function counting the edges of a slice of the table in a worker. Nodes
+    are returned as a list in order of first appearance, and edges as packed
+    pairs of indices into this list, along with their counts, so that they
+    can be merged without comparing labels again.
+    """
+    assert TABLE_WORKER_STATE is not None
+
+    (
+        table,
+        columns,
+        first_part_col,
+        second_part_col,
+        first_part_data,
+        second_part_data,
+        first_part_separator,
+        second_part_separator,
+        disjoint_keys,
+    ) = TABLE_WORKER_STATE
+
+    offset, table_slice = task
+
+    splitters = (
+        compile_splitter(first_part_separator),
+        compile_splitter(second_part_separator),
     )
 
+    collect_first_part_data = compile_row_data_collector(first_part_data)
+    collect_second_part_data = compile_row_data_collector(second_part_data)
+
+    nodes = []
+    node_index = {}
+    edges = {}
+
+    pairs = iter_bipartite_pairs(
+        read_table_slice(table, table_slice, columns),
+        first_part_col,
+        second_part_col,
+        splitters,
+        offset,
+    )
+
+    for _, row, label1, label2 in pairs:
+        k1 = label1 if disjoint_keys else (0, label1)
+        j1 = node_index.get(k1)
+
+        if j1 is None:
+            j1 = len(nodes)
+            node_index[k1] = j1
+            nodes.append(
+                (
+                    0,
+                    label1,
+                    collect_first_part_data(row) if collect_first_part_data else None,
+                )
+            )
+
+        k2 = label2 if disjoint_keys else (1, label2)
+        j2 = node_index.get(k2)
+
+        if j2 is None:
+            j2 = len(nodes)
+            node_index[k2] = j2
+            nodes.append(
+                (
+                    1,
+                    label2,
+                    collect_second_part_data(row) if collect_second_part_data else None,
+                )
+            )
+
+        pair = (j1 << 32) | j2
+        edges[pair] = edges.get(pair, 0) + 1
+
+    return nodes, array("Q", edges.keys()), array("q", edges.values())
+
+
+def count_edges_slice(task):
+    """
+    Function counting the directed edges of a slice of an edge table in a
+    worker, returned as in `count_bipartite_slice`, along with the data of the
+    first row of each edge.
+    """
+    assert TABLE_WORKER_STATE is not None
+
+    table, columns, edge_source_col, edge_target_col, edge_data = TABLE_WORKER_STATE
+
+    _, table_slice = task
+
+    collect_edge_data = compile_attributes_collector(edge_data)
+
+    nodes = []
+    node_index = {}
+    edges = {}
+    data = []
+
+    for row in read_table_slice(table, table_slice, columns):
+        j1 = node_index.get(row[edge_source_col])
+
+        if j1 is None:
+            j1 = len(nodes)
+            node_index[row[edge_source_col]] = j1
+            nodes.append(row[edge_source_col])
+
+        j2 = node_index.get(row[edge_target_col])
+
+        if j2 is None:
+            j2 = len(nodes)
+            node_index[row[edge_target_col]] = j2
+            nodes.append(row[edge_target_col])
+
+        pair = (j1 << 32) | j2
+        count = edges.get(pair)
+
+        if count is None:
+            edges[pair] = 1
+            data.append(collect_edge_data(row))
+        else:
+            edges[pair] = count + 1
+
+    return nodes, array("Q", edges.keys()), array("q", edges.values()), data
+
+
+def dataframe_to_bipartite_graph(
+    df,
+    first_part_col,
+    second_part_col,
+    *,
+    node_part_attr: str,
+    edge_weight_attr: str,
+    collect_first_part_data,
+    collect_second_part_data,
+    first_part_name,
+    second_part_name,
+    disjoint_keys: bool,
+    labels: Optional[list] = None,
+):
+    """
+    Columnar counterpart of the row loop of `table_to_bipartite_graph`
+    factorizing both key columns and counting edges in a vectorized fashion.
+
+    If a `labels` list is given, it will be filled with the label of each
+    node id, instead of storing them as node attributes.
+
+    Returns:
+        nx.Graph or None: the bipartite graph, or None if the dataframe
+            cannot be processed this way (e.g. because of missing values).
+    """
+    try:
+        codes1, uniques1 = pd.factorize(df[first_part_col])
+        codes2, uniques2 = pd.factorize(df[second_part_col])
+    except KeyError:
+        raise TypeError(
+            'dataframe lacks the "%s" or the "%s" column'
+            % (first_part_col, second_part_col)
+        )
+
+    # NOTE: missing values are not factorized
+    if (codes1 < 0).any() or (codes2 < 0).any():
+        return None
+
+    # NOTE: node ids & insertion order must match the row loop's, i.e. the
+    # order of first appearance when reading the table row by row, first
+    # column before second one.
+    first_rows1 = np.unique(codes1, return_index=True)[1]
+    first_rows2 = np.unique(codes2, return_index=True)[1]
+
+    positions = np.concatenate((first_rows1 * 2, first_rows2 * 2 + 1))
+    order = np.argsort(positions, kind="stable")
+    ids = np.empty(len(order), dtype=np.int64)
+    ids[order] = np.arange(len(order))
+
+    n_uniques1 = len(uniques1)
+    uniques1 = list(uniques1)
+    uniques2 = list(uniques2)
+
+    labels_as_table = labels is not None
+
+    if labels_as_table:
+        all_uniques = uniques1 + uniques2
+        labels.extend(all_uniques[i] for i in order.tolist())
+        del all_uniques
+
+    if disjoint_keys:
+        keys1 = uniques1
+        keys2 = uniques2
+    else:
+        keys1 = ids[:n_uniques1].tolist()
+        keys2 = ids[n_uniques1:].tolist()
+
+    def node_attributes(part_name, labels, first_rows, collect):
+        if labels_as_table:
+            attrs = [{node_part_attr: part_name} for _ in labels]
+        else:
+            attrs = [
+                {node_part_attr: part_name, "label": str(label)} for label in labels
+            ]
+
+        if collect is not None:
+            rows = iterator_from_dataframe(df.iloc[first_rows])
+
+            for attr, row in zip(attrs, rows):
+                attr.update(collect(row))
+
+        return attrs
+
+    attrs = node_attributes(
+        first_part_name, uniques1, first_rows1, collect_first_part_data
+    )
+    attrs.extend(
+        node_attributes(
+            second_part_name, uniques2, first_rows2, collect_second_part_data
+        )
+    )
+    keys = keys1 + keys2
+
+    graph = nx.Graph()
+
+    for i in order.tolist():
+        # NOTE: with disjoint keys, the first occurrence of a node wins
+        if keys[i] not in graph:
+            graph.add_node(keys[i], **attrs[i])
+
+    # Counting edges
+    pairs = codes1.astype(np.int64) * len(uniques2) + codes2
+    pairs, first_rows, counts = np.unique(pairs, return_index=True, return_counts=True)
+
+    edge_order = np.argsort(first_rows, kind="stable")
+    sources = (pairs[edge_order] // len(uniques2)).tolist()
+    targets = (pairs[edge_order] % len(uniques2)).tolist()
+
+    graph.add_edges_from(
+        (keys1[c1], keys2[c2], {edge_weight_attr: count})
+        for c1, c2, count in zip(sources, targets, counts[edge_order].tolist())
+    )
+
+    return graph
+
 
 def table_to_bipartite_graph(
     table,
@@ -62,7 +693,12 @@ def table_to_bipartite_graph(
     second_part_data=None,
     first_part_name=None,
     second_part_name=None,
+    first_part_separator=None,
+    second_part_separator=None,
     disjoint_keys: bool = False,
+    sorted_by_first_part: bool = False,
+    node_labels: str = "attribute",
+    n_jobs: int = 1,
 ):
     """
     Function creating a bipartite graph from the given tabular data.
@@ -72,7 +708,9 @@ def table_to_bipartite_graph(
             be a large variety of things as long as it is 1. iterable and 2.
             yields indexable values such as dicts or lists. This can for instance
             be a list of dicts, a csv.DictReader stream etc. It also supports
-            pandas DataFrame if the library is installed.
+            pandas DataFrame if the library is installed, as well as pyarrow
+            tables, record batch readers and parquet file paths if pyarrow is
+            installed, in which case only the needed columns are read.
         first_part_col (Hashable): the name of the column containing the
             value representing a node in the resulting graph's first part.
             It could be the index if your rows are lists or a key if your rows
@@ -107,61 +745,275 @@ def table_to_bipartite_graph(
         second_part_name (Hashable, optional): can be given to rename the second part.
             to display as graph's second part's name.
             Defaults to None.
+        first_part_separator (str or Callable, optional): can be given if
+            cells of `first_part_col` may contain several values, e.g. "a|b|c".
+            Either a string on which to split the cells, or a function taking a
+            cell and returning an iterable of values. Each value will then be
+            linked to every value found in the same row's `second_part_col`.
+            Empty values are ignored when splitting on a string.
+            Defaults to None.
+        second_part_separator (str or Callable, optional): same as
+            `first_part_separator`, but for `second_part_col`.
+            Defaults to None.
         disjoint_keys (bool, optional): set this to True as an optimization
             mechanism if you know your part keys are disjoint, i.e. if no
             value for `first_part_col` can also be found in `second_part_col`.
             If you enable this option wrongly, the result can be incorrect.
             Defaults to False.
+        sorted_by_first_part (bool, optional): set this to True as an
+            optimization mechanism if you know rows are sorted by
+            `first_part_col`, i.e. if all the rows containing a same first part
+            node are contiguous. Edges will then be counted locally for each
+            run of rows and added to the graph in bulk. An error will be
+            raised if the table turns out not to be sorted. Has no effect
+            when the table is processed in a vectorized fashion or when
+            n_jobs > 1. Defaults to False.
+        node_labels (str, optional): either "attribute", to store the label of
+            each node in its "label" attribute, or "table" to keep them in a
+            separate compact table instead, which is cheaper memory-wise. In
+            this case, the function will return a (graph, labels) tuple, nodes
+            being keyed by contiguous integers such that labels[i] is the
+            label of node i. If all labels are integers, the table will be an
+            array of 64 bits integers. Cannot be used with `disjoint_keys`.
+            Defaults to "attribute".
+        n_jobs (int, optional): number of processes to use to read the table.
+            If greater than 1, each worker of the pool reads its own slice of
+            the table (ranges of rows of lists and dataframes, row groups of
+            parquet files), counting edges and collecting part data, and only
+            compact counts are merged in order, so that the resulting graph
+            is the same as when reading the table serially. Other iterables
+            are read serially. Note that unless processes are started by
+            forking (e.g. on Windows, or on macOS since python 3.8), the
+            table, separators and part data specs must be picklable, which excludes
+            lambdas and locally defined functions, or the table will be read
+            serially with a warning. Defaults to 1.
 
     Returns:
-        nx.AnyGraph: the bipartite graph.
+        nx.AnyGraph or tuple: the bipartite graph, or a (graph, labels) tuple
+            if `node_labels` is "table".
     """
 
     if first_part_col == second_part_col:
         raise TypeError("first_part_col and second_part_col must be different")
 
+    if not isinstance(n_jobs, int) or n_jobs < 1:
+        raise TypeError("n_jobs should be an int >= 1")
+
+    if node_labels not in NODE_LABELS:
+        raise TypeError(
+            'unknown node_labels "%s", expecting one of %s'
+            % (node_labels, ", ".join('"%s"' % m for m in NODE_LABELS))
+        )
+
+    labels_as_table = node_labels == "table"
+
+    if labels_as_table and disjoint_keys:
+        raise TypeError('node_labels="table" cannot be used with disjoint_keys')
+
+    if sorted_by_first_part and first_part_separator is not None:
+        raise TypeError("sorted_by_first_part cannot be used with first_part_separator")
+
     if first_part_name is None:
         first_part_name = first_part_col
 
     if second_part_name is None:
         second_part_name = second_part_col
 
-    table = iterator_from_dataframe(table)
+    collect_first_part_data = compile_row_data_collector(first_part_data)
+    collect_second_part_data = compile_row_data_collector(second_part_data)
+
+    splitters = (
+        compile_splitter(first_part_separator),
+        compile_splitter(second_part_separator),
+    )
+
+    node_id = PartitionedIncrementalIdRegister(record_keys=labels_as_table)
+
+    def node_attributes(part_name, label):
+        if labels_as_table:
+            return {node_part_attr: part_name}
+
+        return {node_part_attr: part_name, "label": str(label)}
+
+    def finalize(graph):
+        if labels_as_table:
+            return graph, compact_labels(node_id.keys)
+
+        return graph
+
+    # NOTE: multi-valued cells are never exploded in a vectorized fashion
+    if is_dataframe(table) and splitters == (None, None):
+        graph = dataframe_to_bipartite_graph(
+            table,
+            first_part_col,
+            second_part_col,
+            node_part_attr=node_part_attr,
+            edge_weight_attr=edge_weight_attr,
+            collect_first_part_data=collect_first_part_data,
+            collect_second_part_data=collect_second_part_data,
+            first_part_name=first_part_name,
+            second_part_name=second_part_name,
+            disjoint_keys=disjoint_keys,
+            labels=node_id.keys,
+        )
+
+        if graph is not None:
+            return finalize(graph)
+
+    columns = needed_columns(
+        table, (first_part_col, second_part_col), first_part_data, second_part_data
+    )
+
+    state = (
+        table,
+        columns,
+        first_part_col,
+        second_part_col,
+        first_part_data,
+        second_part_data,
+        first_part_separator,
+        second_part_separator,
+        disjoint_keys,
+    )
+
+    slices = table_slices(table, n_jobs) if n_jobs > 1 else None
+
+    if slices is not None and not can_send_worker_state(state):
+        slices = None
+
+    if slices is not None:
+        part_cols = (first_part_col, second_part_col)
+        part_names = (first_part_name, second_part_name)
+
+        # NOTE: with disjoint keys, global ids are only used to pack edges
+        global_id = node_id if not disjoint_keys else PartitionedIncrementalIdRegister()
+        graph_keys = []
+        all_pairs = array("Q")
+        all_counts = array("q")
+        nan_label = MISSING
+
+        graph = nx.Graph()
+
+        with Pool(n_jobs, initializer=init_table_worker, initargs=state) as pool:
+            for nodes, pairs, counts in pool.imap(count_bipartite_slice, slices):
+                ids = []
+
+                for part, label, data in nodes:
+                    # NOTE: unpickled NaN labels are not the same object anymore
+                    if label != label:
+                        if nan_label is MISSING:
+                            nan_label = label
+                        label = nan_label
+
+                    g = global_id[None if disjoint_keys else part_cols[part], label]
+                    ids.append(g)
+
+                    # NOTE: the first slice containing a node wins
+                    if g == len(graph_keys):
+                        check_packed_node_count(g)
+
+                        n = label if disjoint_keys else g
+                        graph_keys.append(n)
+
+                        node_attr = node_attributes(part_names[part], label)
+
+                        if data:
+                            node_attr.update(data)
+
+                        graph.add_node(n, **node_attr)
+
+                all_pairs.extend(remap_packed_pairs(pairs, ids))
+                all_counts.extend(counts)
+
+        pairs, counts, _ = merge_packed_counts(all_pairs, all_counts)
+
+        graph.add_edges_from(
+            (
+                graph_keys[pair >> 32],
+                graph_keys[pair & PACKED_NODE_MASK],
+                {edge_weight_attr: count},
+            )
+            for pair, count in zip(pairs, counts)
+        )
+
+        return finalize(graph)
+
+    table = iterator_from_dataframe(table, columns)
 
     graph = nx.Graph()
-    node_id = IncrementalIdRegister()
 
-    for i, row in enumerate(table):
-        try:
-            label1 = row[first_part_col]
-            label2 = row[second_part_col]
-        except (IndexError, KeyError):
-            raise TypeError(
-                'row %i lacks the "%s" or the "%s" value'
-                % (i, first_part_col, second_part_col)
+    if sorted_by_first_part:
+        current_label1 = None
+        n1 = None
+        neighbors = {}
+
+        def flush():
+            graph.add_edges_from(
+                (n1, n2, {edge_weight_attr: count}) for n2, count in neighbors.items()
             )
+            neighbors.clear()
+
+        pairs = iter_bipartite_pairs(table, first_part_col, second_part_col, splitters)
+
+        for i, row, label1, label2 in pairs:
+            # NOTE: a new run of rows starts with a node never seen before
+            if n1 is None or label1 != current_label1:
+                flush()
+
+                current_label1 = label1
+                n1 = label1 if disjoint_keys else node_id[first_part_col, label1]
 
+                if n1 in graph:
+                    raise TypeError(
+                        'row %i: table is not sorted by "%s"' % (i, first_part_col)
+                    )
+
+                node_attr = node_attributes(first_part_name, label1)
+
+                if collect_first_part_data is not None:
+                    node_attr.update(collect_first_part_data(row))
+
+                graph.add_node(n1, **node_attr)
+
+            n2 = label2 if disjoint_keys else node_id[second_part_col, label2]
+
+            if n2 not in graph:
+                node_attr = node_attributes(second_part_name, label2)
+
+                if collect_second_part_data is not None:
+                    node_attr.update(collect_second_part_data(row))
+
+                graph.add_node(n2, **node_attr)
+
+            neighbors[n2] = neighbors.get(n2, 0) + 1
+
+        flush()
+
+        return finalize(graph)
+
+    pairs = iter_bipartite_pairs(table, first_part_col, second_part_col, splitters)
+
+    for _, row, label1, label2 in pairs:
         if disjoint_keys:
             n1 = label1
             n2 = label2
         else:
-            # TODO: possibility to save lookups for sorted data
             n1 = node_id[first_part_col, label1]
             n2 = node_id[second_part_col, label2]
 
         if n1 not in graph:
-            node_attr = {node_part_attr: first_part_name, "label": str(label1)}
+            node_attr = node_attributes(first_part_name, label1)
 
-            if first_part_data:
-                node_attr.update(collect_row_data(first_part_data, row))
+            if collect_first_part_data is not None:
+                node_attr.update(collect_first_part_data(row))
 
             graph.add_node(n1, **node_attr)
 
         if n2 not in graph:
-            node_attr = {node_part_attr: second_part_name, "label": str(label2)}
+            node_attr = node_attributes(second_part_name, label2)
 
-            if second_part_data:
-                node_attr.update(collect_row_data(second_part_data, row))
+            if collect_second_part_data is not None:
+                node_attr.update(collect_second_part_data(row))
 
             graph.add_node(n2, **node_attr)
 
@@ -171,6 +1023,437 @@ def table_to_bipartite_graph(
             edge_attr = {edge_weight_attr: 1}
             graph.add_edge(n1, n2, **edge_attr)
 
+    return finalize(graph)
+
+
+def check_packed_node_count(n):
+    if n >= MAX_PACKED_NODES:
+        raise OverflowError("cannot handle more than %i nodes" % MAX_PACKED_NODES)
+
+
+def csv_to_bipartite_graph(
+    file,
+    first_part_col,
+    second_part_col,
+    *,
+    node_part_attr: str = "part",
+    edge_weight_attr: str = "weight",
+    first_part_data=None,
+    second_part_data=None,
+    first_part_name=None,
+    second_part_name=None,
+    first_part_separator=None,
+    second_part_separator=None,
+    disjoint_keys: bool = False,
+    max_edges_in_memory: Optional[int] = None,
+    tmp_dir=None,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+):
+    """
+    Function creating a bipartite graph from a CSV file, while keeping memory
+    usage bounded when aggregating edges.
+
+    Rows are read using a plain csv.reader and edge weights are counted in
+    a table that is spilled to temporary files on disk each time it exceeds
+    `max_edges_in_memory` distinct edges. Those spilled counts are then merged
+    back when building the final graph, meaning only the nodes and the
+    resulting graph need to fit in memory.
+
+    Args:
+        file (str or PathLike or TextIO): path to the CSV file or already
+            opened text file.
+            The file must have a header row.
+        first_part_col (str or int): the name or index of the column
+            containing the value representing a node in the resulting graph's
+            first part.
+        second_part_col (str or int): the name or index of the column
+            containing the value representing a node in the resulting graph's
+            second part.
+        node_part_attr (str, optional): name of the node attribute containing
+            the part it belongs to. Defaults to "part".
+        edge_weight_attr (str, optional): name of the edge attribute containing
+            its weight, i.e. the number of times it was found in the table.
+            Defaults to "weight".
+        first_part_data (Sequence or Callable or Mapping, optional): same as
+            for `table_to_bipartite_graph`. Rows are given as dicts mapping
+            header names to their string values. Defaults to None.
+        second_part_data (Sequence or Callable or Mapping, optional): same as
+            for `table_to_bipartite_graph`. Rows are given as dicts mapping
+            header names to their string values. Defaults to None.
+        first_part_name (Hashable, optional): can be given to rename the first part.
+            Defaults to None.
+        second_part_name (Hashable, optional): can be given to rename the second part.
+            Defaults to None.
+        first_part_separator (str or Callable, optional): same as for
+            `table_to_bipartite_graph`. Defaults to None.
+        second_part_separator (str or Callable, optional): same as for
+            `table_to_bipartite_graph`. Defaults to None.
+        disjoint_keys (bool, optional): set this to True if you know your part
+            keys are disjoint, so that they can be used as node keys.
+            Defaults to False.
+        max_edges_in_memory (int, optional): maximum number of distinct edges
+            to count in memory before spilling them to disk. Defaults to None,
+            meaning edges are never spilled.
+        tmp_dir (str, optional): directory where to write spilled edge counts.
+            Defaults to None, meaning the system's default temporary directory.
+        delimiter (str, optional): CSV delimiter. Defaults to ",".
+        encoding (str, optional): file encoding, if a path is given.
+            Defaults to "utf-8".
+
+    Returns:
+        nx.Graph: the bipartite graph.
+    """
+
+    if first_part_col == second_part_col:
+        raise TypeError("first_part_col and second_part_col must be different")
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, encoding=encoding, newline="", buffering=CSV_BUFFER_SIZE) as f:
+            return csv_to_bipartite_graph(
+                f,
+                first_part_col,
+                second_part_col,
+                node_part_attr=node_part_attr,
+                edge_weight_attr=edge_weight_attr,
+                first_part_data=first_part_data,
+                second_part_data=second_part_data,
+                first_part_name=first_part_name,
+                second_part_name=second_part_name,
+                first_part_separator=first_part_separator,
+                second_part_separator=second_part_separator,
+                disjoint_keys=disjoint_keys,
+                max_edges_in_memory=max_edges_in_memory,
+                tmp_dir=tmp_dir,
+                delimiter=delimiter,
+            )
+
+    if first_part_name is None:
+        first_part_name = first_part_col
+
+    if second_part_name is None:
+        second_part_name = second_part_col
+
+    collect_first_part_data = compile_row_data_collector(first_part_data)
+    collect_second_part_data = compile_row_data_collector(second_part_data)
+
+    splitters = (
+        compile_splitter(first_part_separator),
+        compile_splitter(second_part_separator),
+    )
+
+    reader = csv.reader(file, delimiter=delimiter)
+    headers = next(reader, None)
+
+    if headers is None:
+        return nx.Graph()
+
+    def column_index(col):
+        if isinstance(col, int):
+            return col
+
+        try:
+            return headers.index(col)
+        except ValueError:
+            raise TypeError('unknown column "%s"' % col)
+
+    pos1 = column_index(first_part_col)
+    pos2 = column_index(second_part_col)
+
+    node_id = PartitionedIncrementalIdRegister()
+    nodes = []
+
+    with SpillingCounter(max_edges_in_memory, dir=tmp_dir) as counts:
+        for _, row, label1, label2 in iter_bipartite_pairs(
+            reader, pos1, pos2, splitters
+        ):
+            n1 = node_id[0 if not disjoint_keys else None, label1]
+
+            if n1 == len(nodes):
+                check_packed_node_count(n1)
+
+                node_attr = {node_part_attr: first_part_name, "label": label1}
+
+                if collect_first_part_data is not None:
+                    node_attr.update(collect_first_part_data(dict(zip(headers, row))))
+
+                nodes.append((label1, node_attr))
+
+            n2 = node_id[1 if not disjoint_keys else None, label2]
+
+            if n2 == len(nodes):
+                check_packed_node_count(n2)
+
+                node_attr = {node_part_attr: second_part_name, "label": label2}
+
+                if collect_second_part_data is not None:
+                    node_attr.update(collect_second_part_data(dict(zip(headers, row))))
+
+                nodes.append((label2, node_attr))
+
+            counts.add((n1 << 32) | n2)
+
+        graph = nx.Graph()
+
+        if disjoint_keys:
+            keys = [label for label, _ in nodes]
+        else:
+            keys = range(len(nodes))
+
+        for key, (_, node_attr) in zip(keys, nodes):
+            graph.add_node(key, **node_attr)
+
+        del nodes
+
+        graph.add_edges_from(
+            (keys[pair >> 32], keys[pair & PACKED_NODE_MASK], {edge_weight_attr: count})
+            for pair, count in counts.items()
+        )
+
+    return graph
+
+
+def table_to_cooccurrence_graph(
+    table,
+    node_col,
+    group_col,
+    *,
+    edge_weight_attr: str = "weight",
+    metric=None,
+    weight_threshold=None,
+    node_data=None,
+    node_separator=None,
+    group_separator=None,
+    n_jobs: int = 1,
+):
+    """
+    Function creating a monopartite graph of the values of a column that
+    co-occur in the same groups, i.e. rows sharing a same value in another
+    column.
+
+    This is equivalent to projecting the bipartite graph that
+    `table_to_bipartite_graph` would return, without ever building it: groups
+    are collected in a single pass over the table into a compact integer-based
+    representation, from which similarities are then computed.
+
+    Args:
+        table (Iterable[Indexable] or pd.DataFrame): input tabular data, as
+            for `table_to_bipartite_graph`.
+        node_col (Hashable): the name of the column containing the values
+            representing the nodes of the resulting graph.
+        group_col (Hashable): the name of the column containing the values
+            representing the groups in which nodes may co-occur.
+        edge_weight_attr (str, optional): name of the edge attribute containing
+            its weight, i.e. the similarity of its nodes. Defaults to "weight".
+        metric (str, optional): one of "jaccard", "overlap", "cosine", "dice",
+            "binary_cosine", "pmi" or "dot_product". Defaults to None, meaning
+            the weight of an edge is the number of groups shared by its nodes.
+        weight_threshold (float, optional): if given, edges whose weight is
+            lower than this threshold will not be kept. Defaults to None.
+        node_data (Sequence or Callable or Mapping, optional): node attributes
+            to collect, using the same spec as the `first_part_data` argument
+            of `table_to_bipartite_graph`. The first row containing a node takes
+            precedence. Defaults to None.
+        node_separator (str or Callable, optional): can be given if cells of
+            `node_col` may contain several values. Defaults to None.
+        group_separator (str or Callable, optional): can be given if cells of
+            `group_col` may contain several values. Defaults to None.
+        n_jobs (int, optional): number of processes to use to compute the
+            similarities. Defaults to 1.
+
+    Returns:
+        nx.Graph: the co-occurrence graph.
+
+    Example:
+        from pelote import table_to_cooccurrence_graph
+
+        table = [
+            {"user": "john", "hashtags": "python|rust"},
+            {"user": "lisa", "hashtags": "python"},
+        ]
+
+        g = table_to_cooccurrence_graph(
+            table, "hashtags", "user", group_separator="|", metric="jaccard"
+        )
+    """
+
+    if node_col == group_col:
+        raise TypeError("node_col and group_col must be different")
+
+    if not isinstance(n_jobs, int) or n_jobs < 1:
+        raise TypeError("n_jobs should be an int >= 1")
+
+    if weight_threshold is not None and (
+        not isinstance(weight_threshold, (int, float)) or weight_threshold <= 0
+    ):
+        raise TypeError("weight_threshold should be a number >= 0")
+
+    online_metric = instantiate_online_metric(metric)
+
+    collect_node_data = compile_row_data_collector(node_data)
+    splitters = (compile_splitter(node_separator), compile_splitter(group_separator))
+
+    columns = needed_columns(table, (node_col, group_col), node_data)
+    table = iterator_from_dataframe(table, columns)
+
+    graph = nx.Graph()
+    node_id = IncrementalIdRegister()
+    group_id = IncrementalIdRegister()
+
+    # NOTE: the groups of each node, as a {group_id: count} dict
+    nodes = []
+    node_groups = []
+
+    for _, row, label, group in iter_bipartite_pairs(
+        table, node_col, group_col, splitters
+    ):
+        i = node_id[label]
+
+        if i == len(nodes):
+            nodes.append(label)
+            node_groups.append({})
+
+            if collect_node_data is not None:
+                graph.add_node(label, **collect_node_data(row))
+            else:
+                graph.add_node(label)
+
+        g = group_id[group]
+        groups = node_groups[i]
+        groups[g] = groups.get(g, 0) + 1
+
+    # Computing norms
+    for i, groups in enumerate(node_groups):
+        online_metric.reset_norm()
+
+        for weight in groups.values():
+            online_metric.accumulate_norm(weight)
+
+        online_metric.add_norm(i)
+
+    online_metric.finalize()
+
+    # Building the compact adjacency, nodes being sorted by norm
+    kept = sorted(online_metric.nodes(), key=online_metric.__getitem__)
+    norms = array("d", (online_metric[i] for i in kept))
+
+    node_code = uint_representation_for_capacity(max(len(kept), 1)).code
+    group_code = uint_representation_for_capacity(max(len(group_id), 1)).code
+
+    node_tokens = []
+    token_nodes = [(array(node_code), array("d")) for _ in range(len(group_id))]
+
+    for r, i in enumerate(kept):
+        groups = node_groups[i]
+        node_tokens.append(
+            (array(group_code, groups.keys()), array("d", groups.values()))
+        )
+
+        for g, weight in groups.items():
+            postings, weights = token_nodes[g]
+            postings.append(r)
+            weights.append(weight)
+
+    del node_groups
+
+    state = (metric, norms, node_tokens, token_nodes, weight_threshold)
+
+    for r1, r2, similarity in iter_compact_projection(state, n_jobs):
+        graph.add_edge(
+            nodes[kept[r1]], nodes[kept[r2]], **{edge_weight_attr: similarity}
+        )
+
+    return graph
+
+
+def table_to_citation_graph(
+    table,
+    node_col,
+    references_col,
+    *,
+    edge_weight_attr: str = "weight",
+    node_data=None,
+    references_separator=None,
+    add_missing_nodes: bool = False,
+):
+    """
+    Function creating a directed graph from a table whose rows reference
+    other rows, e.g. articles citing other articles, through their value in
+    `node_col`.
+
+    Args:
+        table (Iterable[Indexable] or pd.DataFrame): input tabular data, as
+            for `table_to_bipartite_graph`.
+        node_col (Hashable): the name of the column containing the values
+            representing the rows, i.e. the nodes of the resulting graph.
+        references_col (Hashable): the name of the column containing the
+            values of `node_col` referenced by a row.
+        edge_weight_attr (str, optional): name of the edge attribute containing
+            its weight, i.e. the number of times the reference was found in the
+            table. Defaults to "weight".
+        node_data (Sequence or Callable or Mapping, optional): node attributes
+            to collect, using the same spec as the `first_part_data` argument
+            of `table_to_bipartite_graph`. The first row containing a node takes
+            precedence. Defaults to None.
+        references_separator (str or Callable, optional): can be given if cells
+            of `references_col` may contain several references, e.g. "a|b|c".
+            Defaults to None.
+        add_missing_nodes (bool, optional): whether to add nodes for references
+            that cannot be found in the table's `node_col`, instead of dropping
+            the edges pointing to them. Defaults to False.
+
+    Returns:
+        nx.DiGraph: the citation graph.
+    """
+
+    if node_col == references_col:
+        raise TypeError("node_col and references_col must be different")
+
+    collect_node_data = compile_row_data_collector(node_data)
+    split_references = compile_splitter(references_separator)
+
+    columns = needed_columns(table, (node_col, references_col), node_data)
+    table = iterator_from_dataframe(table, columns)
+
+    graph = nx.DiGraph()
+
+    # NOTE: edges are kept aside until every row was read because they may
+    # reference a row found later in the table
+    edges = {}
+
+    for i, row in enumerate(table):
+        try:
+            source = row[node_col]
+            references = row[references_col]
+        except (IndexError, KeyError):
+            raise TypeError(
+                'row %i lacks the "%s" or the "%s" value'
+                % (i, node_col, references_col)
+            )
+
+        if source not in graph:
+            if collect_node_data is not None:
+                graph.add_node(source, **collect_node_data(row))
+            else:
+                graph.add_node(source)
+
+        # NOTE: missing values, including NaNs, are ignored
+        if references is None or references != references:
+            targets = []
+        elif split_references is not None:
+            targets = split_references(references)
+        else:
+            targets = [references]
+
+        for target in targets:
+            edges[source, target] = edges.get((source, target), 0) + 1
+
+    graph.add_edges_from(
+        (source, target, {edge_weight_attr: count})
+        for (source, target), count in edges.items()
+        if add_missing_nodes or target in graph
+    )
+
     return graph
 
 
@@ -183,7 +1466,91 @@ def _edges_table_to_graph(
     count_rows_as_weight: bool,
     edge_weight_attr: str,
     add_missing_nodes: bool = True,
+    aggregations=[],
+    n_jobs: int = 1,
 ):
+    if not isinstance(n_jobs, int) or n_jobs < 1:
+        raise TypeError("n_jobs should be an int >= 1")
+
+    if n_jobs > 1:
+        if not count_rows_as_weight:
+            raise TypeError("n_jobs can only be used with count_rows_as_weight=True")
+
+        if aggregations:
+            raise TypeError("n_jobs cannot be used with edge_aggregations")
+
+    check_key_columns(edge_table, (edge_source_col, edge_target_col))
+
+    columns = (
+        [edge_source_col, edge_target_col]
+        + list(edge_data)
+        + [col for _, col, _, _, _ in aggregations]
+    )
+
+    state = (edge_table, columns, edge_source_col, edge_target_col, edge_data)
+
+    slices = table_slices(edge_table, n_jobs) if n_jobs > 1 else None
+
+    if slices is not None and not can_send_worker_state(state):
+        slices = None
+
+    if slices is not None:
+        global_id = IncrementalIdRegister()
+        graph_keys = []
+        all_pairs = array("Q")
+        all_counts = array("q")
+        all_data = []
+        nan_label = MISSING
+
+        with Pool(n_jobs, initializer=init_table_worker, initargs=state) as pool:
+            for nodes, pairs, counts, data in pool.imap(count_edges_slice, slices):
+                ids = []
+
+                for n in nodes:
+                    # NOTE: unpickled NaN labels are not the same object anymore
+                    if n != n:
+                        if nan_label is MISSING:
+                            nan_label = n
+                        n = nan_label
+
+                    g = global_id[n]
+                    ids.append(g)
+
+                    if g == len(graph_keys):
+                        check_packed_node_count(g)
+
+                        if not add_missing_nodes:
+                            check_node_exists(graph, n)
+
+                        graph_keys.append(n)
+
+                all_pairs.extend(remap_packed_pairs(pairs, ids))
+                all_counts.extend(counts)
+                all_data.extend(data)
+
+        pairs, counts, first = merge_packed_counts(
+            all_pairs, all_counts, directed=graph.is_directed()
+        )
+
+        # NOTE: the data of the first row of each edge wins
+        for count, i in zip(counts, first):
+            all_data[i][edge_weight_attr] = count
+
+        graph.add_edges_from(
+            (
+                graph_keys[pair >> 32],
+                graph_keys[pair & PACKED_NODE_MASK],
+                all_data[i],
+            )
+            for pair, i in zip(pairs, first)
+        )
+
+        return graph
+
+    edge_table = iterator_from_dataframe(edge_table, columns)
+
+    collect_edge_data = compile_attributes_collector(edge_data)
+
     for row in edge_table:
         n1, n2 = row[edge_source_col], row[edge_target_col]
 
@@ -191,15 +1558,52 @@ def _edges_table_to_graph(
             n1 = check_node_exists(graph, row[edge_source_col])
             n2 = check_node_exists(graph, row[edge_target_col])
 
-        data = {str(attr): row[attr] for attr in edge_data}
+        data = collect_edge_data(row)
+
+        # NOTE: aggregated attributes must not be overwritten
+        for attr_name, _, _, _, _ in aggregations:
+            data.pop(attr_name, None)
 
         if count_rows_as_weight:
             if graph.has_edge(n1, n2):
                 graph[n1][n2][edge_weight_attr] += 1
-                continue
             else:
                 data[edge_weight_attr] = 1
-        graph.add_edge(n1, n2, **data)
+                graph.add_edge(n1, n2, **data)
+        else:
+            graph.add_edge(n1, n2, **data)
+
+        if aggregations:
+            edge_attr = graph[n1][n2]
+
+            for attr_name, col, _, init, update in aggregations:
+                value = row[col]
+
+                # NOTE: missing values, including NaNs, are ignored
+                if value is None or value != value:
+                    continue
+
+                state = edge_attr.get(attr_name, MISSING)
+
+                if state is MISSING:
+                    edge_attr[attr_name] = init(value)
+                else:
+                    edge_attr[attr_name] = update(state, value)
+
+    # Finalizing means
+    mean_attrs = [
+        attr_name
+        for attr_name, _, aggregation, _, _ in aggregations
+        if aggregation == "mean"
+    ]
+
+    if mean_attrs:
+        for _, _, edge_attr in graph.edges(data=True):
+            for attr_name in mean_attrs:
+                state = edge_attr.get(attr_name)
+
+                if state is not None:
+                    edge_attr[attr_name] = state[0] / state[1]
 
     return graph
 
@@ -212,7 +1616,9 @@ def edges_table_to_graph(
     edge_data=[],
     count_rows_as_weight: bool = False,
     edge_weight_attr: str = "weight",
+    edge_aggregations=None,
     directed: bool = False,
+    n_jobs: int = 1,
 ):
     """
     Function creating a graph from a table of edges.
@@ -222,7 +1628,9 @@ def edges_table_to_graph(
             format. It can be a large variety of things as long as it is 1. iterable
             and 2. yields indexable values such as dicts or lists. This can for
             instance be a list of dicts, a csv.DictReader stream etc. It also supports
-            pandas DataFrame if the library is installed.
+            pandas DataFrame if the library is installed, as well as pyarrow
+            tables, record batch readers and parquet file paths if pyarrow is
+            installed, in which case only the needed columns are read.
         edge_source_col (Hashable, optional): the name of the column containing the edges' source
             nodes in the edges_table.
             Defaults to "source".
@@ -242,16 +1650,29 @@ def edges_table_to_graph(
             its weight, i.e. the number of times it was found in the table, if
             `count_rows_as_weight` is set to True.
             Defaults to "weight".
+        edge_aggregations (Mapping, optional): mapping from edge attribute names
+            to aggregations to apply over the rows of each edge, i.e. one of
+            "sum", "min", "max", "mean", "first" or "last". An aggregation can
+            also be given as a (column, aggregation) couple when the column
+            to aggregate is not named as the attribute, e.g.
+            {"last_seen": ("date", "max")}. Missing values are ignored.
+            Defaults to None.
         directed (bool, optional): whether the resulting graph must be directed.
             Defaults to False.
+        n_jobs (int, optional): number of processes to use to count edges, if
+            `count_rows_as_weight` is set to True. If greater than 1, each
+            worker of the pool reads its own slice of the table (ranges of
+            rows of lists and dataframes, row groups of parquet files) and
+            only compact edge counts are merged. Other iterables are read
+            serially. Note that unless processes are started by forking
+            (e.g. on Windows, or on macOS since python 3.8), the table must
+            be picklable. Defaults to 1.
 
     Returns:
         nx.AnyGraph: the resulting graph.
     """
 
-    edge_table = iterator_from_dataframe(
-        edge_table, [edge_source_col, edge_target_col] + list(edge_data)
-    )
+    aggregations = compile_edge_aggregations(edge_aggregations)
 
     if directed:
         graph = nx.DiGraph()
@@ -266,6 +1687,8 @@ def edges_table_to_graph(
         edge_data,
         count_rows_as_weight,
         edge_weight_attr,
+        aggregations=aggregations,
+        n_jobs=n_jobs,
     )
 
 
@@ -281,7 +1704,9 @@ def tables_to_graph(
     count_rows_as_weight: bool = False,
     edge_weight_attr: str = "weight",
     add_missing_nodes: bool = False,
+    edge_aggregations=None,
     directed: bool = False,
+    n_jobs: int = 1,
 ):
     """
     Function creating a graph from two tables: a table of nodes and a table of edges.
@@ -291,7 +1716,9 @@ def tables_to_graph(
             format. It can be a large variety of things as long as it is 1. iterable
             and 2. yields indexable values such as dicts or lists. This can for
             instance be a list of dicts, a csv.DictReader stream etc. It also supports
-            pandas DataFrame if the library is installed.
+            pandas DataFrame if the library is installed, as well as pyarrow
+            tables, record batch readers and parquet file paths if pyarrow is
+            installed, in which case only the needed columns are read.
         edges_table (Iterable[Indexable] or pd.DataFrame): input edges in tabular
             format.
         node_col (Hashable, optional): the name of the column containing the nodes in the nodes_table.
@@ -323,8 +1750,23 @@ def tables_to_graph(
         add_missing_nodes (bool, optional): set this to True to check that the edges' sources and targets
             in the edges_table are all defined in the nodes_table.
             Defaults to True.
+        edge_aggregations (Mapping, optional): mapping from edge attribute names
+            to aggregations to apply over the rows of each edge, i.e. one of
+            "sum", "min", "max", "mean", "first" or "last". An aggregation can
+            also be given as a (column, aggregation) couple when the column
+            to aggregate is not named as the attribute, e.g.
+            {"last_seen": ("date", "max")}. Missing values are ignored.
+            Defaults to None.
         directed (bool, optional): whether the resulting graph must be directed.
             Defaults to False.
+        n_jobs (int, optional): number of processes to use to count edges, if
+            `count_rows_as_weight` is set to True. If greater than 1, each
+            worker of the pool reads its own slice of the table (ranges of
+            rows of lists and dataframes, row groups of parquet files) and
+            only compact edge counts are merged. Other iterables are read
+            serially. Note that unless processes are started by forking
+            (e.g. on Windows, or on macOS since python 3.8), the table must
+            be picklable. Defaults to 1.
 
     Returns:
         nx.AnyGraph: the resulting graph.
@@ -347,19 +1789,21 @@ def tables_to_graph(
         )
     """
 
+    check_key_columns(nodes_table, (node_col,))
+
     nodes_table = iterator_from_dataframe(nodes_table, [node_col] + list(node_data))
 
-    edges_table = iterator_from_dataframe(
-        edges_table, [edge_source_col, edge_target_col] + list(edge_data)
-    )
+    aggregations = compile_edge_aggregations(edge_aggregations)
 
     if directed:
         graph = nx.DiGraph()
     else:
         graph = nx.Graph()
 
+    collect_node_data = compile_attributes_collector(node_data)
+
     for row in nodes_table:
-        graph.add_node(row[node_col], **{str(attr): row[attr] for attr in node_data})
+        graph.add_node(row[node_col], **collect_node_data(row))
 
     return _edges_table_to_graph(
         graph,
@@ -370,4 +1814,6 @@ def tables_to_graph(
         count_rows_as_weight,
         edge_weight_attr,
         add_missing_nodes=add_missing_nodes,
+        aggregations=aggregations,
+        n_jobs=n_jobs,
     )
@@ -9,7 +9,17 @@ from itertools import repeat
 from collections.abc import Iterable
 from collections import Counter, defaultdict, OrderedDict, namedtuple
 
-from pelote.shim import is_dataframe
+from pelote.shim import (
+    pa,
+    pq,
+    is_dataframe,
+    is_arrow_table,
+    is_parquet_path,
+    check_pyarrow,
+)
+
+# NOTE: number of rows read at once from arrow tables & parquet files
+ARROW_BATCH_SIZE = 2**16
 
 
 def has_mixed_types(iterable) -> bool:
@@ -43,10 +53,93 @@ def iterator_from_dataframe(table, columns=None):
             dict(zip(columns, row))
             for row in zip(*(table[col].values for col in columns))
         )
+    elif is_arrow_table(table) or is_parquet_path(table):
+        return iterator_from_arrow(table, columns)
     else:
         return table
 
 
+def tabular_columns(table):
+    """
+    Function returning the set of column names of the given dataframe, arrow
+    table or parquet file path, or None if they cannot be known beforehand.
+    """
+    if is_dataframe(table):
+        return set(table.columns)
+
+    if is_arrow_table(table):
+        return set(table.schema.names)
+
+    if is_parquet_path(table):
+        check_pyarrow()
+        return set(pq.read_schema(table).names)
+
+    return None
+
+
+def check_key_columns(table, key_columns) -> None:
+    """
+    Function raising if the given dataframe, arrow table or parquet file
+    lacks one of the given key columns, checked against its schema before
+    any row is read.
+    """
+    available = tabular_columns(table)
+
+    if available is None or all(col in available for col in key_columns):
+        return
+
+    raise TypeError(
+        "table lacks the %s column"
+        % " or the ".join('"%s"' % col for col in key_columns)
+    )
+
+
+def iterator_from_arrow(table, columns=None):
+    """
+    Function iterating over the rows of the given arrow table, record batch
+    reader or parquet file path, as dicts. Only the given columns are read,
+    batch by batch, so that the whole table never needs to be converted
+    at once.
+    """
+    check_pyarrow()
+
+    if columns is not None:
+        columns = list(dict.fromkeys(columns))
+
+    if is_parquet_path(table):
+        batches = pq.ParquetFile(table).iter_batches(
+            batch_size=ARROW_BATCH_SIZE, columns=columns
+        )
+    elif isinstance(table, pa.Table):
+        if columns is not None:
+            table = table.select(columns)
+
+        batches = table.to_batches(max_chunksize=ARROW_BATCH_SIZE)
+    elif isinstance(table, pa.RecordBatch):
+        batches = [table]
+    else:
+        batches = table
+
+    return iterator_from_arrow_batches(batches, columns)
+
+
+def iterator_from_arrow_batches(batches, columns=None):
+    for batch in batches:
+        names = columns if columns is not None else batch.schema.names
+        values = []
+
+        for name in names:
+            i = batch.schema.get_field_index(name)
+
+            if i == -1:
+                raise KeyError(name)
+
+            values.append(batch.column(i).to_pylist())
+
+        for row in zip(*values):
+            yield dict(zip(names, row))
+
+
 Representation = namedtuple("Representation", ("max", "code"))
 
 UINT_REPRESENTATIONS = [
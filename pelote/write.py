@@ -4,10 +4,19 @@
 #
 # Functions used to write to various data formats.
 #
+import io
+import gzip
+from pathlib import Path
+
+from pelote.shim import get_json_dumps
+
 VALID_KEY_TYPES = (int, str)
 
 
-def coerce_attributes(attr, allow_invalid_names=False):
+def coerce_attributes(attr, allow_invalid_names=False, copy_attributes=True):
+    if not copy_attributes and all(isinstance(k, str) for k in attr):
+        return attr
+
     copy = {}
 
     for k, v in attr.items():
@@ -24,46 +33,17 @@ def coerce_attributes(attr, allow_invalid_names=False):
     return copy
 
 
-def write_graphology_json(
-    graph, allow_mixed_keys: bool = False, allow_invalid_attr_names: bool = False
-):
-    """
-    Function serializing the given networkx graph as JSON, using the
-    [graphology](https://graphology.github.io/) format.
-
-    Note that both node keys and attribute names will be cast to string so
-    they can safely be represented in JSON. As such in some cases (where
-    your node keys and/or attribute names are not strings), this function
-    will not be bijective when used with `read_graphology_json`.
-
-    Args:
-        graph (nx.AnyGraph): graph to serialize.
-        allow_mixed_keys (bool, optional): whether to allow graph with mixed
-            node key types to be serialized nonetheless. Keys will always be
-            cast to string so keys might clash and produce an invalid
-            serialization. Only use this if you know what you are doing.
-            Defaults to False.
-        allow_invalid_attr_names (bool, optional): whether to allow non-string
-            attribute names. Note that if you chose to allow them, some might
-            clash and produce an invalid serialization. Only use this if you
-            know what you are doing.
-            Defaults to False.
-
-    Returns:
-        dict: JSON data
-
-    """
-    edges = []
-    nodes = []
-
-    attributes = graph.graph.copy()
-
-    options = {
+def graphology_options(graph):
+    return {
         "allowSelfLoops": True,
         "multi": graph.is_multigraph(),
         "type": "directed" if graph.is_directed() else "undirected",
     }
 
+
+def iter_serialized_nodes(
+    graph, allow_mixed_keys=False, allow_invalid_attr_names=False, copy_attributes=True
+):
     node_key_type = None
 
     for n, attr in graph.nodes.data():
@@ -86,24 +66,201 @@ def write_graphology_json(
 
         if attr:
             node_data["attributes"] = coerce_attributes(
-                attr, allow_invalid_names=allow_invalid_attr_names
+                attr,
+                allow_invalid_names=allow_invalid_attr_names,
+                copy_attributes=copy_attributes,
             )
 
-        nodes.append(node_data)
+        yield node_data
 
+
+def iter_serialized_edges(graph, allow_invalid_attr_names=False, copy_attributes=True):
     for source, target, attr in graph.edges.data():
         edge_data = {"source": str(source), "target": str(target)}
 
         if attr:
             edge_data["attributes"] = coerce_attributes(
-                attr, allow_invalid_names=allow_invalid_attr_names
+                attr,
+                allow_invalid_names=allow_invalid_attr_names,
+                copy_attributes=copy_attributes,
             )
 
-        edges.append(edge_data)
+        yield edge_data
+
+
+def write_graphology_json(
+    graph, allow_mixed_keys: bool = False, allow_invalid_attr_names: bool = False
+):
+    """
+    Function serializing the given networkx graph as JSON, using the
+    [graphology](https://graphology.github.io/) format.
+
+    Note that both node keys and attribute names will be cast to string so
+    they can safely be represented in JSON. As such in some cases (where
+    your node keys and/or attribute names are not strings), this function
+    will not be bijective when used with `read_graphology_json`.
+
+    Args:
+        graph (nx.AnyGraph): graph to serialize.
+        allow_mixed_keys (bool, optional): whether to allow graph with mixed
+            node key types to be serialized nonetheless. Keys will always be
+            cast to string so keys might clash and produce an invalid
+            serialization. Only use this if you know what you are doing.
+            Defaults to False.
+        allow_invalid_attr_names (bool, optional): whether to allow non-string
+            attribute names. Note that if you chose to allow them, some might
+            clash and produce an invalid serialization. Only use this if you
+            know what you are doing.
+            Defaults to False.
+
+    Returns:
+        dict: JSON data
+
+    """
+    attributes = graph.graph.copy()
+
+    nodes = list(
+        iter_serialized_nodes(
+            graph,
+            allow_mixed_keys=allow_mixed_keys,
+            allow_invalid_attr_names=allow_invalid_attr_names,
+        )
+    )
 
-    result = {"options": options, "nodes": nodes, "edges": edges}
+    edges = list(
+        iter_serialized_edges(graph, allow_invalid_attr_names=allow_invalid_attr_names)
+    )
+
+    result = {"options": graphology_options(graph), "nodes": nodes, "edges": edges}
 
     if attributes:
         result["attributes"] = attributes
 
     return result
+
+
+def dump_json_array(f, items, dumps):
+    f.write("[")
+
+    for i, item in enumerate(items):
+        if i != 0:
+            f.write(", ")
+
+        f.write(dumps(item))
+
+    f.write("]")
+
+
+def dump_graphology_json(f, graph, allow_mixed_keys, allow_invalid_attr_names, dumps):
+    f.write('{"options": ')
+    f.write(dumps(graphology_options(graph)))
+
+    f.write(', "nodes": ')
+    dump_json_array(
+        f,
+        iter_serialized_nodes(
+            graph,
+            allow_mixed_keys=allow_mixed_keys,
+            allow_invalid_attr_names=allow_invalid_attr_names,
+            copy_attributes=False,
+        ),
+        dumps,
+    )
+
+    f.write(', "edges": ')
+    dump_json_array(
+        f,
+        iter_serialized_edges(
+            graph,
+            allow_invalid_attr_names=allow_invalid_attr_names,
+            copy_attributes=False,
+        ),
+        dumps,
+    )
+
+    if graph.graph:
+        f.write(', "attributes": ')
+        f.write(dumps(graph.graph))
+
+    f.write("}")
+
+
+def write_graphology_json_to(
+    file,
+    graph,
+    allow_mixed_keys: bool = False,
+    allow_invalid_attr_names: bool = False,
+    compress: bool = False,
+    json_backend: str = "json",
+) -> None:
+    """
+    Function serializing the given networkx graph as JSON, using the
+    [graphology](https://graphology.github.io/) format, directly into the
+    given file, node by node and edge by edge, so that the whole serialized
+    graph never needs to be held in memory.
+
+    By default, output is the same as calling `json.dump` on the result of
+    `write_graphology_json`, and the same validation rules apply whatever the
+    backend. Note however that an invalid node key or attribute name will only
+    be noticed when reached, leaving the file partially written.
+
+    Args:
+        file (str or Path or file): target to write to. Can be a string path,
+            a Path instance or a file buffer. Buffers must be opened in text
+            mode, or in binary mode if `compress=True`.
+        graph (nx.AnyGraph): graph to serialize.
+        allow_mixed_keys (bool, optional): whether to allow graph with mixed
+            node key types to be serialized nonetheless. Keys will always be
+            cast to string so keys might clash and produce an invalid
+            serialization. Only use this if you know what you are doing.
+            Defaults to False.
+        allow_invalid_attr_names (bool, optional): whether to allow non-string
+            attribute names. Note that if you chose to allow them, some might
+            clash and produce an invalid serialization. Only use this if you
+            know what you are doing.
+            Defaults to False.
+        compress (bool, optional): whether to gzip the output. Always true
+            for paths ending with ".gz". Defaults to False.
+        json_backend (str, optional): library used to encode nodes and edges,
+            among "json", "orjson" and "ujson". Values a backend cannot encode
+            fall back to "json". Note that faster backends do not encode
+            every value as "json" does: orjson writes NaN as null and accepts
+            values such as datetimes that "json" rejects, for instance.
+            Defaults to "json".
+
+    Example:
+        from pelote import write_graphology_json_to
+
+        write_graphology_json_to("graph.json.gz", graph)
+    """
+    options = (
+        graph,
+        allow_mixed_keys,
+        allow_invalid_attr_names,
+        get_json_dumps(json_backend),
+    )
+
+    if isinstance(file, (str, Path)):
+        if compress or str(file).endswith(".gz"):
+            with gzip.open(file, "wt", encoding="utf-8") as f:
+                dump_graphology_json(f, *options)
+        else:
+            with open(file, "w", encoding="utf-8") as f:
+                dump_graphology_json(f, *options)
+
+        return
+
+    if not hasattr(file, "write"):
+        raise TypeError("expected a path or a file")
+
+    if not compress:
+        dump_graphology_json(file, *options)
+        return
+
+    with gzip.GzipFile(fileobj=file, mode="wb") as g:
+        f = io.TextIOWrapper(g, encoding="utf-8")
+        dump_graphology_json(f, *options)
+
+        # NOTE: detaching so that the wrapper does not close the gzip file
+        f.flush()
+        f.detach()
@@ -20,6 +20,9 @@ setup(
     install_requires=["ebbe>=1.9.0,<2", "pyllist", "networkx>=2,<3"],
     extras_require={
         "fast": ["llist"],
+        "sparse": ["numpy", "scipy"],
+        "arrow": ["pyarrow"],
+        "json": ["orjson"],
     },
     zip_safe=True,
 )
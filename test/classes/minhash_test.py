@@ -0,0 +1,41 @@
+# =============================================================================
+# Pelote MinHash Unit Tests
+# =============================================================================
+import os
+import sys
+import subprocess
+from pytest import raises
+
+import pelote.classes.minhash
+from pelote.classes.minhash import MinHash, stable_hash
+
+ITEMS = ["one", "two", 3, ("four", 4), b"five"] + list(range(10000))
+
+
+class TestMinHash(object):
+    def test_errors(self):
+        with raises(TypeError, match="empty"):
+            MinHash(seed=123).signature([])
+
+    def test_numpy_and_python_agree(self, monkeypatch):
+        signature = MinHash(16, seed=123).signature(ITEMS)
+
+        monkeypatch.setattr(pelote.classes.minhash, "np", None)
+
+        assert MinHash(16, seed=123).signature(ITEMS) == signature
+
+    def test_reproducibility(self):
+        code = "from pelote.classes.minhash import MinHash; print(list(MinHash(8, seed=1).signature(['one', 'two', ('three', 3)])))"
+
+        outputs = set()
+
+        for hash_seed in ("1", "2"):
+            env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+            outputs.add(
+                subprocess.check_output(
+                    [sys.executable, "-c", code], env=env, universal_newlines=True
+                )
+            )
+
+        assert len(outputs) == 1
+        assert stable_hash("one") == stable_hash("one")
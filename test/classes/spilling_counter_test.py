@@ -0,0 +1,29 @@
+# =============================================================================
+# Pelote Spilling Counter Unit Tests
+# =============================================================================
+from collections import Counter
+from random import Random
+from pytest import raises
+
+from pelote.classes import SpillingCounter
+
+
+class TestSpillingCounter(object):
+    def test_errors(self):
+        with raises(TypeError):
+            SpillingCounter(0)
+
+    def test_basics(self):
+        rng = Random(123)
+        keys = [rng.randint(0, 50) for _ in range(1000)]
+        expected = sorted(Counter(keys).items())
+
+        for max_keys in (None, 1, 7, 100):
+            with SpillingCounter(max_keys) as counter:
+                for key in keys:
+                    counter.add(key)
+
+                if max_keys is not None and max_keys < 50:
+                    assert len(counter.runs) > 0
+
+                assert list(counter.items()) == expected
@@ -3,7 +3,7 @@
 # =============================================================================
 import networkx as nx
 import pandas as pd
-from pytest import raises
+from pytest import raises, importorskip
 
 from pelote.exceptions import MissingPandasException
 from pelote.shim import missing_pandas
@@ -11,6 +11,9 @@ from pelote.graph_to_tabular import (
     graph_to_nodes_dataframe,
     graph_to_edges_dataframe,
     graph_to_dataframes,
+    iter_graph_to_nodes_dataframes,
+    iter_graph_to_edges_dataframes,
+    write_graph_to_tables,
 )
 
 
@@ -124,6 +127,28 @@ class TestToEdgesDataframe(object):
 
         assert df.equals(expected)
 
+    def test_heterogeneous_attributes(self):
+        g = nx.Graph()
+        g.add_node(0, age=12)
+        g.add_node(1)
+        g.add_edge(0, 1, weight=2.0)
+        g.add_edge(1, 2, kind="friend")
+        g.add_edge(2, 0, weight=1.0, source="custom")
+
+        df = graph_to_edges_dataframe(g, source_node_data=("age",))
+
+        expected = pd.DataFrame(
+            data=[
+                {"source": 0, "target": 1, "weight": 2.0, "age": 12},
+                {"source": "custom", "target": 2, "weight": 1.0, "age": 12},
+                {"source": 1, "target": 2, "kind": "friend", "age": None},
+            ]
+        )
+
+        assert df.equals(expected)
+
+        assert graph_to_edges_dataframe(nx.Graph()).equals(pd.DataFrame())
+
 
 class TestToDataframes(object):
     def test_errors(self):
@@ -160,3 +185,156 @@ class TestToDataframes(object):
 
         assert nodes.equals(expected_nodes)
         assert edges.equals(expected_edges)
+
+
+def get_heterogeneous_graph() -> nx.Graph:
+    g = nx.Graph()
+    g.add_node(0, age=12)
+    g.add_node(1)
+    g.add_node(2, age=47, name="John")
+
+    for i in range(3, 10):
+        g.add_node(i, age=i)
+
+    for i in range(10):
+        g.add_edge(i, (i + 1) % 10, weight=float(i))
+
+    g.add_edge(0, 5, kind="friend")
+
+    return g
+
+
+class TestIterDataframes(object):
+    def test_errors(self):
+        with raises(MissingPandasException), missing_pandas():
+            iter_graph_to_nodes_dataframes(nx.Graph())
+
+        with raises(TypeError):
+            iter_graph_to_edges_dataframes(None)
+
+        with raises(TypeError, match="chunksize"):
+            iter_graph_to_edges_dataframes(nx.Graph(), 0)
+
+    def test_chunks(self):
+        g = get_heterogeneous_graph()
+
+        for chunksize in (1, 3, 100):
+            chunks = list(iter_graph_to_nodes_dataframes(g, chunksize))
+
+            assert all(len(chunk) <= chunksize for chunk in chunks)
+            pd.testing.assert_frame_equal(
+                pd.concat(chunks, ignore_index=True).infer_objects(),
+                graph_to_nodes_dataframe(g),
+                check_dtype=False,
+            )
+
+            chunks = list(
+                iter_graph_to_nodes_dataframes(g, chunksize, node_key_col=None)
+            )
+
+            pd.testing.assert_frame_equal(
+                pd.concat(chunks).infer_objects(),
+                graph_to_nodes_dataframe(g, node_key_col=None),
+                check_dtype=False,
+            )
+
+            chunks = list(
+                iter_graph_to_edges_dataframes(
+                    g, chunksize, target_node_data={"age": "target_age"}
+                )
+            )
+
+            assert all(len(chunk) <= chunksize for chunk in chunks)
+            assert all(
+                list(chunk.columns)
+                == ["source", "target", "weight", "target_age", "kind"]
+                for chunk in chunks
+            )
+            pd.testing.assert_frame_equal(
+                pd.concat(chunks, ignore_index=True).infer_objects(),
+                graph_to_edges_dataframe(g, target_node_data={"age": "target_age"}),
+                check_dtype=False,
+            )
+
+        assert list(iter_graph_to_edges_dataframes(nx.Graph())) == []
+
+
+class TestWriteGraphToTables(object):
+    def test_errors(self):
+        with raises(TypeError):
+            write_graph_to_tables(None)
+
+        with raises(TypeError, match="node_key_col"):
+            write_graph_to_tables(nx.Graph(), node_key_col=None)
+
+    def test_csv(self, tmp_path):
+        g = get_heterogeneous_graph()
+
+        nodes_path = tmp_path / "nodes.csv"
+        edges_path = tmp_path / "edges.csv.gz"
+
+        write_graph_to_tables(
+            g, nodes_path, edges_path, chunksize=3, source_node_data=("age",)
+        )
+
+        pd.testing.assert_frame_equal(
+            pd.read_csv(nodes_path), graph_to_nodes_dataframe(g), check_dtype=False
+        )
+        pd.testing.assert_frame_equal(
+            pd.read_csv(edges_path),
+            graph_to_edges_dataframe(g, source_node_data=("age",)),
+            check_dtype=False,
+        )
+
+        write_graph_to_tables(nx.Graph(), edges_path=edges_path)
+
+        assert list(pd.read_csv(edges_path).columns) == ["source", "target"]
+
+    def test_parquet(self, tmp_path):
+        importorskip("pyarrow")
+
+        g = get_heterogeneous_graph()
+
+        nodes_path = tmp_path / "nodes.parquet"
+        edges_path = tmp_path / "edges.parquet"
+
+        write_graph_to_tables(g, nodes_path, edges_path, chunksize=4)
+
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(nodes_path),
+            graph_to_nodes_dataframe(g),
+            check_dtype=False,
+        )
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(edges_path),
+            graph_to_edges_dataframe(g),
+            check_dtype=False,
+        )
+
+    def test_parquet_mixed_types(self, tmp_path):
+        importorskip("pyarrow")
+
+        g = nx.Graph()
+        g.add_node(1, label="one", size=3)
+        g.add_node("two", label=2, size=1.5)
+        g.add_node(3)
+        g.add_edge(1, "two", weight=1)
+        g.add_edge("two", 3, weight=2.5)
+
+        nodes_path = tmp_path / "nodes.parquet"
+        edges_path = tmp_path / "edges.parquet"
+
+        write_graph_to_tables(g, nodes_path, edges_path, chunksize=1)
+
+        nodes = pd.read_parquet(nodes_path)
+
+        assert nodes["key"].tolist() == ["1", "two", "3"]
+        assert nodes["label"].tolist()[:2] == ["one", "2"]
+        assert nodes["label"].isna().tolist() == [False, False, True]
+        assert nodes["size"].tolist()[:2] == [3.0, 1.5]
+
+        edges = pd.read_parquet(edges_path)
+
+        assert edges["source"].tolist() == ["1", "two"]
+        assert edges["target"].tolist() == ["two", "3"]
+        assert edges["weight"].tolist() == [1.0, 2.5]
@@ -2,9 +2,19 @@
 # Pelote Projection Unit Tests
 # =============================================================================
 import networkx as nx
-from pytest import raises
-
-from pelote.projection import monopartite_projection, self_similarity_projection
+from itertools import product, combinations
+from math import log
+from pytest import raises, approx
+
+from pelote.classes.online_metrics import SUPPORTED_METRICS
+from pelote.projection import (
+    PROJECTION_ENGINES,
+    monopartite_projection,
+    iter_monopartite_projection,
+    minhash_projection,
+    IncrementalMonopartiteProjector,
+    self_similarity_projection,
+)
 from pelote.graph import are_same_graphs
 
 NODES = [
@@ -82,6 +92,28 @@ class TestMonopartiteProjection(object):
             g.add_edge(0, 1)
             monopartite_projection(g, {0}, weight_threshold="test")
 
+        # Unknown engine
+        with raises(TypeError, match="engine"):
+            monopartite_projection(BIPARTITE, "people", engine="test")
+
+        # Invalid n_jobs
+        with raises(TypeError, match="n_jobs"):
+            monopartite_projection(BIPARTITE, "people", n_jobs=0)
+
+        with raises(TypeError, match="n_jobs"):
+            monopartite_projection(BIPARTITE, "people", n_jobs=2, engine="sparse")
+
+        # Invalid top_k
+        with raises(TypeError, match="top_k"):
+            monopartite_projection(BIPARTITE, "people", top_k=0)
+
+        # Invalid token options
+        with raises(TypeError, match="max_token_degree"):
+            monopartite_projection(BIPARTITE, "people", max_token_degree="test")
+
+        with raises(TypeError, match="token_weighting"):
+            monopartite_projection(BIPARTITE, "people", token_weighting="test")
+
     def test_minimal(self):
         bipartite = nx.Graph()
         bipartite.add_nodes_from([1, 2, 3], part="account")
@@ -126,6 +158,329 @@ class TestMonopartiteProjection(object):
 
         assert are_same_graphs(monopartite, expected)
 
+    def test_engines(self):
+        for metric, engine in product(SUPPORTED_METRICS, ("compact", "sparse")):
+            for threshold in (None, 0.5):
+                expected = monopartite_projection(
+                    BIPARTITE, "people", metric=metric, weight_threshold=threshold
+                )
+                monopartite = monopartite_projection(
+                    BIPARTITE,
+                    "people",
+                    metric=metric,
+                    weight_threshold=threshold,
+                    engine=engine,
+                )
+
+                assert are_same_graphs(monopartite, expected)
+
+                for u, v, w in expected.edges.data("weight"):
+                    assert monopartite[u][v]["weight"] == approx(w)
+
+        monopartite = monopartite_projection(
+            BIPARTITE, PEOPLE_MONOPARTITE_NODES, engine="sparse"
+        )
+
+        assert are_same_graphs(monopartite, PEOPLE_MONOPARTITE, check_attributes=True)
+
+    def test_length_filtering(self):
+        bipartite = nx.bipartite.random_graph(40, 30, 0.15, seed=123)
+
+        for metric, threshold in product(SUPPORTED_METRICS, (0.2, 0.5, 1)):
+            # NOTE: thresholding afterwards, without any pruning
+            expected = monopartite_projection(
+                bipartite, 0, node_part_attr="bipartite", metric=metric
+            )
+            expected.remove_edges_from(
+                [(u, v) for u, v, w in expected.edges.data("weight") if w < threshold]
+            )
+
+            for engine in ("python", "compact"):
+                monopartite = monopartite_projection(
+                    bipartite,
+                    0,
+                    node_part_attr="bipartite",
+                    metric=metric,
+                    weight_threshold=threshold,
+                    engine=engine,
+                )
+
+                assert are_same_graphs(monopartite, expected)
+
+    def test_n_jobs(self):
+        for metric in SUPPORTED_METRICS:
+            expected = monopartite_projection(
+                BIPARTITE, "people", metric=metric, weight_threshold=0.5
+            )
+            monopartite = monopartite_projection(
+                BIPARTITE, "people", metric=metric, weight_threshold=0.5, n_jobs=2
+            )
+
+            assert are_same_graphs(monopartite, expected)
+
+            for u, v, w in expected.edges.data("weight"):
+                assert monopartite[u][v]["weight"] == approx(w)
+
+    def test_top_k(self):
+        monopartite = monopartite_projection(BIPARTITE, "people", top_k=10)
+
+        assert are_same_graphs(monopartite, PEOPLE_MONOPARTITE, check_attributes=True)
+
+        for engine in PROJECTION_ENGINES:
+            monopartite = monopartite_projection(
+                BIPARTITE, "people", metric="jaccard", top_k=1, engine=engine
+            )
+
+            # NOTE: Mary's top neighbor is a tie, broken by insertion order
+            assert set(monopartite.edges) == {
+                ("John", "Lucy"),
+                ("John", "Mary"),
+                ("Mary", "Gabriel"),
+            }
+            assert monopartite["John"]["Lucy"]["weight"] == 1
+            assert monopartite["Mary"]["Gabriel"]["weight"] == approx(1 / 3)
+
+        # NOTE: binary metrics produce a lot of ties on random graphs
+        bipartite = nx.bipartite.random_graph(40, 10, 0.3, seed=7)
+
+        for metric in (None, "jaccard", "dice"):
+            expected = monopartite_projection(
+                bipartite, 0, node_part_attr="bipartite", metric=metric, top_k=3
+            )
+
+            for engine in PROJECTION_ENGINES:
+                monopartite = monopartite_projection(
+                    bipartite,
+                    0,
+                    node_part_attr="bipartite",
+                    metric=metric,
+                    top_k=3,
+                    engine=engine,
+                )
+
+                assert are_same_graphs(monopartite, expected)
+
+    def test_token_pruning(self):
+        pruned_bipartite = BIPARTITE.copy()
+        pruned_bipartite.remove_nodes_from(["red", "orange"])
+
+        for engine in PROJECTION_ENGINES:
+            for metric in SUPPORTED_METRICS:
+                expected = monopartite_projection(
+                    pruned_bipartite, "people", metric=metric
+                )
+                monopartite = monopartite_projection(
+                    BIPARTITE,
+                    "people",
+                    metric=metric,
+                    engine=engine,
+                    min_token_degree=2,
+                    max_token_degree=2,
+                )
+
+                assert are_same_graphs(monopartite, expected, check_attributes=True)
+                assert monopartite.graph == {
+                    "pruned_tokens": 2,
+                    "skipped_cooccurrences": 3,
+                }
+
+        monopartite = monopartite_projection(
+            BIPARTITE, "people", max_token_degree=2, n_jobs=2
+        )
+
+        expected = nx.Graph()
+        expected.add_nodes_from(PEOPLE_MONOPARTITE_NODES)
+        expected.add_edge("John", "Lucy", weight=1)
+        expected.add_edge("Mary", "Gabriel", weight=1)
+
+        assert are_same_graphs(monopartite, expected, check_attributes=True)
+
+    def test_idf_token_weighting(self):
+        for engine in ("python", "sparse"):
+            monopartite = monopartite_projection(
+                BIPARTITE,
+                "people",
+                metric="dot_product",
+                token_weighting="idf",
+                engine=engine,
+            )
+
+            # NOTE: red is shared by 3 people out of 5, yellow by 2
+            red = log(5 / 3)
+            yellow = log(5 / 2)
+
+            assert monopartite["John"]["Mary"]["weight"] == approx(2 * red * red)
+            assert monopartite["Mary"]["Gabriel"]["weight"] == approx(
+                2 * yellow * yellow
+            )
+
+    def test_idf_cosine_null_norms(self):
+        g = nx.Graph()
+        g.add_nodes_from([1, 2, 3], part="kept")
+        g.add_nodes_from(["x", "y"], part="token")
+        g.add_edges_from([(1, "x"), (2, "x"), (3, "x"), (1, "y")])
+
+        # NOTE: x is shared by every kept node, so 2 and 3 have a null norm
+        for engine in PROJECTION_ENGINES:
+            monopartite = monopartite_projection(
+                g, "kept", metric="cosine", token_weighting="idf", engine=engine
+            )
+
+            assert set(monopartite.nodes) == {1, 2, 3}
+            assert monopartite.size() == 0
+
+        g.add_node(4, part="kept")
+        g.add_edges_from([(4, "x"), (4, "y"), (2, "z"), (3, "z")])
+
+        expected = monopartite_projection(
+            g, "kept", metric="cosine", token_weighting="idf"
+        )
+
+        # NOTE: y and z are shared by 2 nodes out of 4, x is ignored
+        assert set(expected.edges) == {(1, 4), (2, 3)}
+        assert expected[1][4]["weight"] == approx(1)
+
+        for engine in PROJECTION_ENGINES:
+            monopartite = monopartite_projection(
+                g, "kept", metric="cosine", token_weighting="idf", engine=engine
+            )
+
+            assert are_same_graphs(monopartite, expected, check_attributes=True)
+
+
+class TestIterMonopartiteProjection(object):
+    def test_errors(self):
+        # Errors are raised eagerly
+        with raises(TypeError, match="exist"):
+            g = nx.Graph()
+            g.add_edge(0, 1)
+            iter_monopartite_projection(g, "person")
+
+    def test_basic(self):
+        edges = iter_monopartite_projection(BIPARTITE, "people")
+
+        def normalize(edges):
+            return set((frozenset((u, v)), w) for u, v, w in edges)
+
+        assert normalize(edges) == normalize(PEOPLE_MONOPARTITE_EDGES)
+
+        edges = iter_monopartite_projection(BIPARTITE, "people", weight_threshold=2)
+
+        assert list(edges) == [("John", "Lucy", 2)]
+
+        assert list(iter_monopartite_projection(nx.Graph(), "people")) == []
+
+
+class TestMinhashProjection(object):
+    def test_errors(self):
+        with raises(TypeError, match="graph"):
+            minhash_projection(None, "people")
+
+        with raises(TypeError, match="bands"):
+            minhash_projection(BIPARTITE, "people", signature_size=10, bands=3)
+
+        with raises(TypeError, match="exist"):
+            g = nx.Graph()
+            g.add_edge(0, 1)
+            minhash_projection(g, "people")
+
+        with raises(TypeError, match="bipartite"):
+            g = nx.Graph()
+            g.add_edges_from([(1, 2), (1, 3), (2, 3)])
+            minhash_projection(g, {1, 3})
+
+    def test_basic(self):
+        monopartite = minhash_projection(BIPARTITE, "people", seed=123)
+
+        assert set(monopartite.nodes) == PEOPLE_MONOPARTITE_NODES
+
+        # NOTE: identical neighborhoods always collide
+        assert monopartite["John"]["Lucy"]["weight"] == 1
+
+        for u, v, w in monopartite.edges.data("weight"):
+            assert PEOPLE_MONOPARTITE.has_edge(u, v)
+            assert 0 < w <= 1
+
+        monopartite = minhash_projection(
+            BIPARTITE, PEOPLE_PART, weight_threshold=0.9, seed=123
+        )
+
+        expected = nx.Graph()
+        expected.add_nodes_from(PEOPLE_MONOPARTITE_NODES)
+        expected.add_edge("John", "Lucy", weight=1.0)
+
+        assert are_same_graphs(monopartite, expected, check_attributes=True)
+
+    def test_estimation(self):
+        bipartite = nx.Graph()
+        bipartite.add_nodes_from(["A", "B"], part="people")
+        bipartite.add_edges_from(("A", i) for i in range(100))
+        bipartite.add_edges_from(("B", i) for i in range(50, 150))
+
+        monopartite = minhash_projection(
+            bipartite, "people", signature_size=512, bands=256, seed=123
+        )
+
+        assert monopartite["A"]["B"]["weight"] == approx(1 / 3, abs=0.1)
+
+
+class TestIncrementalMonopartiteProjector(object):
+    def test_errors(self):
+        with raises(TypeError, match="exist"):
+            g = nx.Graph()
+            g.add_edge(0, 1)
+            IncrementalMonopartiteProjector(g, "people")
+
+        projector = IncrementalMonopartiteProjector(BIPARTITE, "people")
+
+        with raises(KeyError):
+            projector.remove_edges([("John", "orange")])
+
+        with raises(TypeError, match="part"):
+            projector.add_edges([("John", "Mary")])
+
+    def test_consistency(self):
+        def assert_consistent(projector, bipartite, **kwargs):
+            expected = monopartite_projection(bipartite, "people", **kwargs)
+
+            assert are_same_graphs(projector.graph, expected)
+
+            for u, v, w in expected.edges.data("weight"):
+                assert projector.graph[u][v]["weight"] == approx(w)
+
+        for metric in SUPPORTED_METRICS:
+            for threshold in (None, 0.5):
+                kwargs = {"metric": metric, "weight_threshold": threshold}
+                bipartite = BIPARTITE.copy()
+
+                projector = IncrementalMonopartiteProjector(
+                    bipartite, "people", **kwargs
+                )
+
+                assert_consistent(projector, bipartite, **kwargs)
+
+                bipartite.remove_edges_from([("John", "red"), ("Lucy", "purple")])
+                bipartite.add_edge("Mary", "purple", weight=2.0)
+                bipartite.add_node("Bob", part="people")
+                bipartite.add_edge("Bob", "orange", weight=1.0)
+                bipartite.add_edge("Gabriel", "orange", weight=5.0)
+
+                projector.update(
+                    added=[
+                        ("Mary", "purple", 2.0),
+                        ("Bob", "orange", 1.0),
+                        ("Gabriel", "orange", 5.0),
+                    ],
+                    removed=[("John", "red"), ("Lucy", "purple")],
+                )
+
+                assert_consistent(projector, bipartite, **kwargs)
+
+                bipartite.remove_edge("Mary", "yellow")
+                projector.remove_edges([("Mary", "yellow")])
+
+                assert_consistent(projector, bipartite, **kwargs)
+
 
 class TestSelfSimilarityProjection(object):
     def test_consistency(self):
@@ -186,3 +541,111 @@ class TestSelfSimilarityProjection(object):
         expected.add_edge(0, 2, weight=1)
 
         assert are_same_graphs(projected, expected)
+
+    def test_errors(self):
+        with raises(TypeError, match="graph"):
+            self_similarity_projection(None)
+
+        with raises(TypeError, match="metric"):
+            self_similarity_projection(nx.Graph(), metric="test")
+
+        with raises(TypeError, match="depth"):
+            self_similarity_projection(nx.Graph(), depth=0)
+
+    def test_undirected(self):
+        graph = nx.Graph()
+        graph.add_edge(0, 1)
+        graph.add_edge(2, 1)
+
+        projected = self_similarity_projection(graph)
+
+        expected = nx.Graph()
+        expected.add_node(1)
+        expected.add_edge(0, 2, weight=1)
+
+        assert are_same_graphs(projected, expected, check_attributes=True)
+
+        graph = nx.complete_graph(3)
+
+        projected = self_similarity_projection(graph)
+
+        expected = nx.Graph()
+        expected.add_edge(0, 1, weight=1)
+        expected.add_edge(0, 2, weight=1)
+        expected.add_edge(1, 2, weight=1)
+
+        assert are_same_graphs(projected, expected, check_attributes=True)
+
+        graph.add_edge(2, 3)
+
+        projected = self_similarity_projection(graph)
+
+        expected = nx.Graph()
+        expected.add_edge(0, 1, weight=1)
+        expected.add_edge(0, 2, weight=1 / 2)
+        expected.add_edge(1, 2, weight=1 / 2)
+        expected.add_edge(0, 3, weight=1 / 2)
+        expected.add_edge(1, 3, weight=1 / 2)
+
+        assert are_same_graphs(projected, expected, check_attributes=True)
+
+    def test_metrics(self):
+        graph = nx.DiGraph()
+        graph.add_edges_from([(0, 1), (0, 2), (3, 1), (3, 4), (5, 0)])
+
+        projected = self_similarity_projection(graph, metric=None)
+
+        expected = nx.Graph()
+        expected.add_nodes_from(graph.nodes)
+        expected.add_edge(0, 3, weight=1)
+        expected.add_edge(1, 2, weight=1)
+        expected.add_edge(1, 4, weight=1)
+
+        assert are_same_graphs(projected, expected, check_attributes=True)
+
+        projected = self_similarity_projection(graph, metric="overlap")
+
+        assert projected[0][3]["weight"] == 1 / 2
+
+        projected = self_similarity_projection(graph, metric="dice")
+
+        assert projected[0][3]["weight"] == 2 / 5
+
+    def test_n_jobs(self):
+        graph = nx.gnp_random_graph(50, 0.1, seed=123, directed=True)
+
+        for metric in SUPPORTED_METRICS:
+            expected = self_similarity_projection(graph, depth=2, metric=metric)
+            projected = self_similarity_projection(
+                graph, depth=2, metric=metric, n_jobs=2
+            )
+
+            assert are_same_graphs(projected, expected, check_attributes=True)
+
+    def test_directed_depth(self):
+        graph = nx.gnp_random_graph(30, 0.1, seed=3, directed=True)
+
+        def features(node):
+            for out, g in ((True, graph), (False, graph.reverse())):
+                for neighbor, d in nx.single_source_shortest_path_length(
+                    g, node, cutoff=2
+                ).items():
+                    if neighbor != node:
+                        yield neighbor, out, d
+
+        node_features = {node: set(features(node)) for node in graph}
+
+        expected = nx.Graph()
+        expected.add_nodes_from(graph)
+
+        for n1, n2 in combinations(graph, 2):
+            intersection = len(node_features[n1] & node_features[n2])
+
+            if intersection:
+                expected.add_edge(n1, n2, weight=intersection)
+
+        projected = self_similarity_projection(graph, depth=2, metric=None)
+
+        # NOTE: every node must use the same depth limit
+        assert projected.size() == 407
+        assert are_same_graphs(projected, expected, check_attributes=True)
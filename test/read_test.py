@@ -2,13 +2,18 @@
 # Pelote Read Unit Tests
 # =============================================================================
 import json
+import gzip
 import networkx as nx
-from pytest import raises
+from io import StringIO, BytesIO
+from pytest import raises, mark, importorskip
 from pathlib import Path
 
 from test.utils import get_resource_path
 
+import pelote.read
 from pelote.read import parse_graphology_json, read_graphology_json
+from pelote.write import write_graphology_json
+from pelote.graph import are_same_graphs
 
 
 class TestReadGraphologyJson(object):
@@ -141,3 +146,126 @@ class TestReadGraphologyJson(object):
         g = parse_graphology_json(data)
 
         assert isinstance(g, nx.DiGraph)
+
+
+class TestIncrementalReadGraphologyJson(object):
+    def test_chunk_boundaries(self, monkeypatch):
+        les_miserables_path = get_resource_path("les_miserables.json")
+
+        with open(les_miserables_path, encoding="utf-8") as f:
+            expected = parse_graphology_json(json.load(f))
+
+        for chunk_size in (1, 7, 64):
+            monkeypatch.setattr(pelote.read, "READ_CHUNK_SIZE", chunk_size)
+
+            g = read_graphology_json(les_miserables_path)
+
+            assert are_same_graphs(g, expected, check_attributes=True)
+            assert g.graph == expected.graph
+            assert list(g.nodes) == list(expected.nodes)
+
+            with open(les_miserables_path, "rb") as f:
+                g = read_graphology_json(f)
+
+            assert are_same_graphs(g, expected, check_attributes=True)
+
+    def test_key_order(self):
+        data = {
+            "options": {"type": "mixed", "multi": True, "allowSelfLoops": True},
+            "attributes": {"name": "Test Graph"},
+            "nodes": [
+                {"key": "one", "attributes": {"hello": "world"}},
+                {"key": "two", "attributes": {"age": 34, "tags": [1, 2.5, None]}},
+            ],
+            "edges": [
+                {"source": "one", "target": "two", "undirected": True},
+                {"key": "e", "source": "two", "target": "one", "undirected": True},
+            ],
+            "unknown": 45,
+        }
+
+        expected = parse_graphology_json(data)
+
+        assert isinstance(expected, nx.MultiGraph)
+
+        for keys in (
+            ["options", "attributes", "nodes", "edges", "unknown"],
+            ["edges", "nodes", "unknown", "attributes", "options"],
+            ["nodes", "attributes", "edges", "options"],
+        ):
+            text = json.dumps({k: data[k] for k in keys}, indent=2)
+            g = read_graphology_json(StringIO(text))
+
+            assert type(g) is type(expected)
+            assert g.graph == expected.graph
+            assert list(g.nodes(data=True)) == list(expected.nodes(data=True))
+            assert list(g.edges(keys=True, data=True)) == list(
+                expected.edges(keys=True, data=True)
+            )
+
+    def test_gzip(self, tmp_path):
+        g = nx.DiGraph()
+        g.add_edge("one", "two", weight=3)
+
+        path = tmp_path / "graph.json.gz"
+
+        with gzip.open(path, "wt") as f:
+            json.dump(write_graphology_json(g), f)
+
+        assert are_same_graphs(read_graphology_json(path), g, check_attributes=True)
+
+        with gzip.open(path, "rb") as f:
+            assert are_same_graphs(read_graphology_json(f), g, check_attributes=True)
+
+    def test_errors(self):
+        with raises(TypeError, match="options"):
+            read_graphology_json(StringIO('{"nodes": [{"key": "one"}]}'))
+
+        with raises(TypeError, match="mixed"):
+            data = {
+                "options": {"type": "mixed", "multi": False, "allowSelfLoops": True},
+                "edges": [
+                    {"source": "one", "target": "two", "undirected": True},
+                    {"source": "two", "target": "three", "undirected": False},
+                ],
+            }
+
+            read_graphology_json(StringIO(json.dumps(data)))
+
+        for text in (
+            "",
+            "[]",
+            '{"nodes": [{"key": "one"} {"key": "two"}]}',
+            '{"nodes": [{"key": "one"}',
+            '{"options": {"type": "directed", "multi": false}} 45',
+            "{45: 3}",
+        ):
+            with raises(json.JSONDecodeError):
+                read_graphology_json(StringIO(text))
+
+        g = read_graphology_json(
+            BytesIO(b'{"options": {"type": "mixed", "multi": false}}')
+        )
+
+        assert isinstance(g, nx.DiGraph)
+
+    @mark.parametrize("json_backend", ["json", "orjson", "ujson"])
+    def test_json_backends(self, json_backend):
+        if json_backend != "json":
+            importorskip(json_backend)
+
+        les_miserables_path = get_resource_path("les_miserables.json")
+
+        expected = read_graphology_json(les_miserables_path)
+
+        g = read_graphology_json(les_miserables_path, json_backend=json_backend)
+        assert are_same_graphs(g, expected, check_attributes=True)
+        assert g.graph == expected.graph
+
+        with open(les_miserables_path) as f:
+            g = read_graphology_json(f, json_backend=json_backend)
+
+        assert are_same_graphs(g, expected, check_attributes=True)
+
+        with raises(TypeError, match="backend"):
+            read_graphology_json(les_miserables_path, json_backend="unknown")
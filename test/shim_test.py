@@ -0,0 +1,26 @@
+# =============================================================================
+# Pelote Shim Unit Tests
+# =============================================================================
+import sys
+import subprocess
+
+from pelote.shim import lazy_module
+
+
+class TestShim(object):
+    def test_lazy_module(self):
+        assert lazy_module("not_a_real_module.sub") is None
+
+        json_module = lazy_module("json")
+
+        assert json_module.dumps([1]) == "[1]"
+
+    def test_lazy_optional_dependencies(self):
+        # NOTE: some networkx versions import scipy themselves
+        code = "import sys, networkx; before = set(sys.modules); import pelote; print([m for m in ('scipy', 'pyarrow.parquet', 'orjson', 'ujson') if m in sys.modules and m not in before])"
+
+        output = subprocess.check_output(
+            [sys.executable, "-c", code], universal_newlines=True
+        )
+
+        assert output.strip() == "[]"
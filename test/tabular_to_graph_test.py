@@ -1,11 +1,24 @@
 # =============================================================================
 # Pelote Tabular to Network Unit Tests
 # =============================================================================
+import csv
+from array import array
 import networkx as nx
-from pytest import raises
+from io import StringIO
+import pandas as pd
+from pytest import raises, importorskip, warns
 
+import pelote.tabular_to_graph
 from pelote.graph import are_same_graphs
-from pelote import table_to_bipartite_graph, tables_to_graph
+from pelote import (
+    table_to_bipartite_graph,
+    csv_to_bipartite_graph,
+    table_to_cooccurrence_graph,
+    table_to_citation_graph,
+    tables_to_graph,
+    edges_table_to_graph,
+    monopartite_projection,
+)
 
 
 class TestToBipartiteGraph(object):
@@ -13,6 +26,9 @@ class TestToBipartiteGraph(object):
         with raises(TypeError):
             table_to_bipartite_graph([], "one", "one")
 
+        with raises(TypeError):
+            table_to_bipartite_graph([], "one", "two", first_part_data=45)
+
     def test_basic(self):
         table = [
             ("john", "apple"),
@@ -169,6 +185,505 @@ class TestToBipartiteGraph(object):
 
         assert are_same_graphs(g, expected, check_attributes=True)
 
+    def test_dataframe(self):
+        rows = [
+            {"person": "john", "color": "red", "age": 45},
+            {"person": "jack", "color": "red", "age": 23},
+            {"person": "john", "color": "blue", "age": 46},
+            {"person": "john", "color": "red", "age": 47},
+            {"person": "red", "color": "green", "age": 12},
+        ]
+
+        df = pd.DataFrame(rows)
+
+        for disjoint_keys in (False, True):
+            kwargs = {
+                "first_part_data": ("age",),
+                "second_part_data": lambda row: {"initial": row["color"][0]},
+                "disjoint_keys": disjoint_keys,
+            }
+
+            g = table_to_bipartite_graph(df, "person", "color", **kwargs)
+            expected = table_to_bipartite_graph(rows, "person", "color", **kwargs)
+
+            assert are_same_graphs(g, expected, check_attributes=True)
+            assert list(g.nodes(data=True)) == list(expected.nodes(data=True))
+            assert list(g.edges(data=True)) == list(expected.edges(data=True))
+
+        # Missing values
+        df = pd.DataFrame([("john", "red"), ("jack", None)], columns=["a", "b"])
+
+        g = table_to_bipartite_graph(df, "a", "b", disjoint_keys=True)
+
+        assert g.has_node("jack")
+        assert g.number_of_edges() == 2
+
+    def test_sorted_by_first_part(self):
+        table = [
+            ("john", "apple"),
+            ("john", "pear"),
+            ("john", "apple"),
+            ("lisa", "pear"),
+            ("mary", "apple"),
+        ]
+
+        for disjoint_keys in (False, True):
+            g = table_to_bipartite_graph(
+                table, 0, 1, disjoint_keys=disjoint_keys, sorted_by_first_part=True
+            )
+            expected = table_to_bipartite_graph(
+                table, 0, 1, disjoint_keys=disjoint_keys
+            )
+
+            assert list(g.nodes(data=True)) == list(expected.nodes(data=True))
+            assert list(g.edges(data=True)) == list(expected.edges(data=True))
+
+        with raises(TypeError, match="not sorted"):
+            table_to_bipartite_graph(
+                table + [("john", "orange")], 0, 1, sorted_by_first_part=True
+            )
+
+    def test_separators(self):
+        table = [
+            {"user": "john", "hashtags": "a|b|c"},
+            {"user": "lisa|mary", "hashtags": "b||d"},
+            {"user": "john", "hashtags": "a"},
+        ]
+
+        exploded = [
+            {"user": user, "hashtags": hashtag}
+            for row in table
+            for user in row["user"].split("|")
+            for hashtag in row["hashtags"].split("|")
+            if hashtag
+        ]
+
+        expected = table_to_bipartite_graph(exploded, "user", "hashtags")
+
+        g = table_to_bipartite_graph(
+            table,
+            "user",
+            "hashtags",
+            first_part_separator="|",
+            second_part_separator=lambda cell: (v for v in cell.split("|") if v),
+        )
+
+        assert are_same_graphs(g, expected, check_attributes=True)
+        assert g.edges[0, 1]["weight"] == 2
+
+        for n_jobs in (1, 2):
+            g = table_to_bipartite_graph(
+                pd.DataFrame(table),
+                "user",
+                "hashtags",
+                first_part_separator="|",
+                second_part_separator="|",
+                n_jobs=n_jobs,
+            )
+
+            assert are_same_graphs(g, expected, check_attributes=True)
+
+        with raises(TypeError):
+            table_to_bipartite_graph(table, "user", "hashtags", first_part_separator=3)
+
+        with raises(TypeError):
+            table_to_bipartite_graph(
+                table,
+                "user",
+                "hashtags",
+                first_part_separator="|",
+                sorted_by_first_part=True,
+            )
+
+    def test_node_labels(self):
+        table = [
+            ("john", "apple"),
+            ("jack", "apple"),
+            ("lisa", "pear"),
+        ]
+
+        with raises(TypeError):
+            table_to_bipartite_graph(table, 0, 1, node_labels="unknown")
+
+        with raises(TypeError):
+            table_to_bipartite_graph(
+                table, 0, 1, node_labels="table", disjoint_keys=True
+            )
+
+        expected = table_to_bipartite_graph(table, 0, 1)
+
+        for t in (table, pd.DataFrame(table)):
+            g, labels = table_to_bipartite_graph(t, 0, 1, node_labels="table")
+
+            assert labels == ["john", "apple", "jack", "lisa", "pear"]
+            assert list(g.edges(data=True)) == list(expected.edges(data=True))
+
+            for node, attr in g.nodes(data=True):
+                assert attr == {"part": expected.nodes[node]["part"]}
+                assert labels[node] == expected.nodes[node]["label"]
+
+        _, labels = table_to_bipartite_graph(
+            [(1, 2), (3, 2)], 0, 1, node_labels="table"
+        )
+
+        assert labels == array("q", [1, 2, 3])
+
+    def test_arrow(self, tmp_path):
+        pa = importorskip("pyarrow")
+        pq = importorskip("pyarrow.parquet")
+
+        rows = [
+            {"person": "person%i" % (i % 7), "color": "color%i" % (i % 5), "i": i}
+            for i in range(100)
+        ]
+
+        expected = table_to_bipartite_graph(
+            rows, "person", "color", first_part_data=["i", "missing"]
+        )
+
+        table = pa.Table.from_pandas(pd.DataFrame(rows), preserve_index=False)
+        path = str(tmp_path / "table.parquet")
+        pq.write_table(table, path, row_group_size=17)
+
+        reader = pa.ipc.RecordBatchReader.from_batches(table.schema, table.to_batches())
+
+        for t in (table, reader, path):
+            g = table_to_bipartite_graph(
+                t, "person", "color", first_part_data=["i", "missing"]
+            )
+
+            assert are_same_graphs(g, expected, check_attributes=True)
+
+        for t in (table, reader, path, pd.DataFrame(rows)):
+            with raises(TypeError, match='lacks the "person" or the "missing"'):
+                table_to_bipartite_graph(
+                    t, "person", "missing", second_part_separator="|"
+                )
+
+            with raises(TypeError, match='lacks the "missing" or the "color"'):
+                edges_table_to_graph(t, "missing", "color")
+
+            with raises(TypeError, match='lacks the "missing"'):
+                tables_to_graph(t, [], node_col="missing")
+
+        for t in (table, path):
+            g = table_to_bipartite_graph(
+                t, "person", "color", first_part_data=["i", "missing"], n_jobs=2
+            )
+
+            assert list(g.nodes(data=True)) == list(expected.nodes(data=True))
+            assert list(g.edges(data=True)) == list(expected.edges(data=True))
+
+        expected = edges_table_to_graph(
+            rows, "person", "color", count_rows_as_weight=True
+        )
+
+        for n_jobs in (1, 2):
+            g = edges_table_to_graph(
+                path, "person", "color", count_rows_as_weight=True, n_jobs=n_jobs
+            )
+
+            assert are_same_graphs(g, expected, check_attributes=True)
+
+    def test_n_jobs(self, monkeypatch):
+        rows = [
+            {"person": "person%i" % (i % 97), "color": "color%i" % (i % 13), "i": i}
+            for i in range(20000)
+        ]
+
+        with raises(TypeError):
+            table_to_bipartite_graph(rows, "person", "color", n_jobs=0)
+
+        for disjoint_keys in (False, True):
+            kwargs = {
+                "first_part_data": ("i",),
+                "second_part_data": {"i": "first_row"},
+                "disjoint_keys": disjoint_keys,
+            }
+
+            g = table_to_bipartite_graph(rows, "person", "color", n_jobs=2, **kwargs)
+            expected = table_to_bipartite_graph(rows, "person", "color", **kwargs)
+
+            assert list(g.nodes(data=True)) == list(expected.nodes(data=True))
+            assert list(g.edges(data=True)) == list(expected.edges(data=True))
+
+        g, labels = table_to_bipartite_graph(
+            iter(rows), "person", "color", node_labels="table", n_jobs=2
+        )
+        expected, expected_labels = table_to_bipartite_graph(
+            rows, "person", "color", node_labels="table"
+        )
+
+        assert labels == expected_labels
+        assert list(g.nodes(data=True)) == list(expected.nodes(data=True))
+        assert list(g.edges(data=True)) == list(expected.edges(data=True))
+
+        pairs = array("Q", [(0 << 32) | 1, (1 << 32) | 0, (2 << 32) | 1, 1])
+        counts = array("q", [2, 3, 4, 5])
+
+        merged = pelote.tabular_to_graph.merge_packed_counts(pairs, counts)
+
+        assert merged == ([1, (2 << 32) | 1], [10, 4], [0, 2])
+        assert pelote.tabular_to_graph.merge_packed_counts(
+            pairs, counts, directed=True
+        ) == ([1, (1 << 32) | 0, (2 << 32) | 1], [7, 3, 4], [0, 1, 2])
+
+        remapped = pelote.tabular_to_graph.remap_packed_pairs(pairs, [5, 6, 7])
+
+        assert remapped == array(
+            "q", [(5 << 32) | 6, (6 << 32) | 5, (7 << 32) | 6, (5 << 32) | 6]
+        )
+
+        monkeypatch.setattr(pelote.tabular_to_graph, "np", None)
+
+        assert pelote.tabular_to_graph.merge_packed_counts(pairs, counts) == merged
+        assert pelote.tabular_to_graph.remap_packed_pairs(pairs, [5, 6, 7]) == remapped
+
+        g = table_to_bipartite_graph(rows, "person", "color", n_jobs=2)
+        expected = table_to_bipartite_graph(rows, "person", "color")
+
+        assert list(g.edges(data=True)) == list(expected.edges(data=True))
+
+        monkeypatch.undo()
+
+        # NOTE: lambdas cannot be sent to spawned workers
+        monkeypatch.setattr(
+            pelote.tabular_to_graph, "get_start_method", lambda: "spawn"
+        )
+
+        table = [{"user": "john", "hashtags": "a|b"}, {"user": "jack", "hashtags": "b"}]
+        expected = table_to_bipartite_graph(
+            table, "user", "hashtags", second_part_separator=lambda c: c.split("|")
+        )
+
+        with warns(RuntimeWarning, match="pickled"):
+            g = table_to_bipartite_graph(
+                table,
+                "user",
+                "hashtags",
+                second_part_separator=lambda c: c.split("|"),
+                n_jobs=2,
+            )
+
+        assert are_same_graphs(g, expected, check_attributes=True)
+
+        g = table_to_bipartite_graph(
+            table, "user", "hashtags", second_part_separator="|", n_jobs=2
+        )
+
+        assert are_same_graphs(g, expected, check_attributes=True)
+
+        monkeypatch.undo()
+
+        # NOTE: NaN labels are not equal to themselves once unpickled
+        df = pd.DataFrame([{"a": "x", "b": "y"}, {"a": None, "b": "y"}])
+
+        g = table_to_bipartite_graph(df, "a", "b", n_jobs=2)
+        expected = table_to_bipartite_graph(df, "a", "b")
+
+        assert g.order() == expected.order() == 3
+        assert g.size() == expected.size() == 2
+
+        df = pd.DataFrame(
+            [
+                {"a": None if i % 3 == 0 else "x%i" % (i % 5), "b": "y%i" % (i % 4)}
+                for i in range(200)
+            ]
+        )
+
+        for kwargs in ({}, {"first_part_separator": "|"}):
+            g = table_to_bipartite_graph(df, "a", "b", n_jobs=2, **kwargs)
+            expected = table_to_bipartite_graph(df, "a", "b", **kwargs)
+
+            assert g.order() == expected.order()
+            assert list(g.edges(data=True)) == list(expected.edges(data=True))
+
+
+class TestCsvToBipartiteGraph(object):
+    def test_errors(self):
+        with raises(TypeError):
+            csv_to_bipartite_graph(StringIO("a,b\n"), "a", "a")
+
+        with raises(TypeError):
+            csv_to_bipartite_graph(StringIO("a,b\n"), "a", "c")
+
+    def test_basic(self):
+        rows = [
+            {"person": "john", "color": "red", "age": "45"},
+            {"person": "jack", "color": "red", "age": "23"},
+            {"person": "john", "color": "blue", "age": "46"},
+            {"person": "john", "color": "red", "age": "47"},
+            {"person": "red", "color": "green", "age": "12"},
+        ]
+
+        f = StringIO()
+        writer = csv.DictWriter(f, fieldnames=["person", "color", "age"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+        for disjoint_keys in (False, True):
+            expected = table_to_bipartite_graph(
+                rows,
+                "person",
+                "color",
+                first_part_data=("age",),
+                disjoint_keys=disjoint_keys,
+            )
+
+            for max_edges_in_memory in (None, 1, 2):
+                f.seek(0)
+
+                g = csv_to_bipartite_graph(
+                    f,
+                    "person",
+                    "color",
+                    first_part_data=("age",),
+                    disjoint_keys=disjoint_keys,
+                    max_edges_in_memory=max_edges_in_memory,
+                )
+
+                assert are_same_graphs(g, expected, check_attributes=True)
+
+    def test_path(self, tmp_path):
+        path = tmp_path / "table.csv"
+        path.write_text("person,color\njohn,red\njack,red\n")
+
+        expected = table_to_bipartite_graph(
+            [{"person": "john", "color": "red"}, {"person": "jack", "color": "red"}],
+            "person",
+            "color",
+        )
+
+        for target in (path, str(path)):
+            g = csv_to_bipartite_graph(target, "person", "color")
+
+            assert are_same_graphs(g, expected, check_attributes=True)
+
+    def test_node_capacity(self, monkeypatch):
+        monkeypatch.setattr(pelote.tabular_to_graph, "MAX_PACKED_NODES", 3)
+
+        csv_to_bipartite_graph(StringIO("a,b\nx,y\nz,y\n"), "a", "b")
+
+        with raises(OverflowError):
+            csv_to_bipartite_graph(StringIO("a,b\nx,y\nz,w\n"), "a", "b")
+
+
+class TestTableToCooccurrenceGraph(object):
+    def test_errors(self):
+        with raises(TypeError):
+            table_to_cooccurrence_graph([], "one", "one")
+
+        with raises(TypeError):
+            table_to_cooccurrence_graph([], "one", "two", metric="unknown")
+
+    def test_basic(self):
+        table = [
+            {"user": "john", "hashtags": "python|rust", "age": 45},
+            {"user": "lisa", "hashtags": "python", "age": 23},
+            {"user": "mary", "hashtags": "rust|go", "age": 67},
+            {"user": "john", "hashtags": "go", "age": 46},
+        ]
+
+        g = table_to_cooccurrence_graph(
+            table, "user", "hashtags", node_data=["age"], group_separator="|"
+        )
+
+        expected = nx.Graph()
+        expected.add_node("john", age=45)
+        expected.add_node("lisa", age=23)
+        expected.add_node("mary", age=67)
+        expected.add_edge("john", "lisa", weight=1)
+        expected.add_edge("john", "mary", weight=2)
+
+        assert are_same_graphs(g, expected, check_attributes=True)
+
+        g = table_to_cooccurrence_graph(
+            table, "user", "hashtags", group_separator="|", edge_weight_attr="count"
+        )
+
+        assert dict(g.edges.items()) == {
+            ("john", "lisa"): {"count": 1},
+            ("john", "mary"): {"count": 2},
+        }
+
+    def test_projection_equivalence(self):
+        table = [
+            {"person": "person%i" % (i % 13), "color": "color%i" % (i % 7)}
+            for i in range(0, 200, 3)
+        ]
+
+        bipartite = table_to_bipartite_graph(
+            table, "person", "color", disjoint_keys=True
+        )
+
+        for metric in ("jaccard", "cosine", "dice"):
+            for n_jobs in (1, 2):
+                g = table_to_cooccurrence_graph(
+                    table, "person", "color", metric=metric, n_jobs=n_jobs
+                )
+                expected = monopartite_projection(bipartite, "person", metric=metric)
+
+                assert set(g.edges) == set(expected.edges)
+
+                for u, v, w in expected.edges.data("weight"):
+                    assert abs(g.edges[u, v]["weight"] - w) < 1e-9
+
+
+class TestTableToCitationGraph(object):
+    def test_basic(self):
+        table = [
+            {"id": "a", "refs": "b|c", "year": 2001},
+            {"id": "b", "refs": "a|a|d", "year": 2002},
+            {"id": "c", "refs": "", "year": 2003},
+        ]
+
+        g = table_to_citation_graph(
+            table, "id", "refs", node_data=["year"], references_separator="|"
+        )
+
+        expected = nx.DiGraph()
+        expected.add_node("a", year=2001)
+        expected.add_node("b", year=2002)
+        expected.add_node("c", year=2003)
+        expected.add_edge("a", "b", weight=1)
+        expected.add_edge("a", "c", weight=1)
+        expected.add_edge("b", "a", weight=2)
+
+        assert are_same_graphs(g, expected, check_attributes=True)
+
+        g = table_to_citation_graph(
+            table, "id", "refs", references_separator="|", add_missing_nodes=True
+        )
+
+        assert g.has_edge("b", "d")
+
+    def test_missing_references(self):
+        df = pd.DataFrame(
+            [
+                {"id": "a", "refs": "b|c"},
+                {"id": "b", "refs": None},
+                {"id": "c", "refs": float("nan")},
+            ]
+        )
+
+        expected = nx.DiGraph()
+        expected.add_nodes_from(["a", "b", "c"])
+        expected.add_edge("a", "b", weight=1)
+        expected.add_edge("a", "c", weight=1)
+
+        g = table_to_citation_graph(
+            df, "id", "refs", references_separator="|", add_missing_nodes=True
+        )
+
+        assert are_same_graphs(g, expected, check_attributes=True)
+
+        df["refs"] = ["b", None, float("nan")]
+        expected.remove_edge("a", "c")
+
+        g = table_to_citation_graph(df, "id", "refs", add_missing_nodes=True)
+
+        assert are_same_graphs(g, expected, check_attributes=True)
+
 
 class TestTablesToGraph(object):
     def test_errors(self):
@@ -304,6 +819,96 @@ class TestTablesToGraph(object):
 
         assert are_same_graphs(g, expected, check_attributes=True)
 
+        g = tables_to_graph(
+            table_nodes,
+            table_edges,
+            node_data=["color"],
+            count_rows_as_weight=True,
+            n_jobs=2,
+        )
+
+        assert are_same_graphs(g, expected, check_attributes=True)
+
+        with raises(TypeError):
+            tables_to_graph(table_nodes, table_edges, n_jobs=2)
+
+        with raises(KeyError):
+            tables_to_graph(
+                table_nodes[:1], table_edges, count_rows_as_weight=True, n_jobs=2
+            )
+
+    def test_edge_aggregations(self):
+        table_edges = [
+            {"source": "john", "target": "jack", "retweets": 3, "date": "2021"},
+            {"source": "jack", "target": "john", "retweets": 5, "date": "2019"},
+            {"source": "jack", "target": "lisa", "retweets": None, "date": "2020"},
+            {"source": "john", "target": "jack", "retweets": 1, "date": "2022"},
+        ]
+
+        aggregations = {
+            "retweets": "sum",
+            "max_retweets": ("retweets", "max"),
+            "mean_retweets": ("retweets", "mean"),
+            "first_seen": ("date", "min"),
+            "last_date": ("date", "last"),
+        }
+
+        expected = nx.Graph()
+        expected.add_edge(
+            "john",
+            "jack",
+            weight=3,
+            retweets=9,
+            max_retweets=5,
+            mean_retweets=3.0,
+            first_seen="2019",
+            last_date="2022",
+        )
+        expected.add_edge("jack", "lisa", weight=1, first_seen="2020", last_date="2020")
+
+        for edges in (table_edges, pd.DataFrame(table_edges)):
+            g = edges_table_to_graph(
+                edges, count_rows_as_weight=True, edge_aggregations=aggregations
+            )
+
+            assert are_same_graphs(g, expected, check_attributes=True)
+
+        g = tables_to_graph(
+            [{"key": "john"}, {"key": "jack"}, {"key": "lisa"}],
+            table_edges,
+            edge_data=["retweets"],
+            edge_aggregations={"retweets": "min"},
+            directed=True,
+        )
+
+        assert g.edges["john", "jack"]["retweets"] == 1
+        assert g.edges["jack", "john"]["retweets"] == 5
+        assert "retweets" not in g.edges["jack", "lisa"]
+
+        with raises(TypeError):
+            edges_table_to_graph(table_edges, edge_aggregations={"date": "median"})
+
+    def test_list_rows(self):
+        table_nodes = [("john", "blue", 45), ("jack", "green", 23)]
+        table_edges = [("john", "jack", 0.5, "friend")]
+
+        g = tables_to_graph(
+            table_nodes,
+            table_edges,
+            node_col=0,
+            edge_source_col=0,
+            edge_target_col=1,
+            node_data=[1, 2],
+            edge_data=[3],
+        )
+
+        expected = nx.Graph()
+        expected.add_node("john", **{"1": "blue", "2": 45})
+        expected.add_node("jack", **{"1": "green", "2": 23})
+        expected.add_edge("john", "jack", **{"3": "friend"})
+
+        assert are_same_graphs(g, expected, check_attributes=True)
+
     # TODO: test callable spec also
     # def test_renamed_part_data(self):
     #     table = [{"person": "john", "color": "red", "light": "high", "age": 45}]
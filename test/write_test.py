@@ -1,11 +1,17 @@
 # =============================================================================
 # Pelote Write Unit Tests
 # =============================================================================
+import gzip
+import json
+from io import StringIO, BytesIO
+from datetime import date
+
 import networkx as nx
-from pytest import raises
+import numpy as np
+from pytest import raises, mark, importorskip
 
 from pelote.read import read_graphology_json
-from pelote.write import write_graphology_json
+from pelote.write import write_graphology_json, write_graphology_json_to
 from pelote.graph import are_same_graphs
 
 
@@ -162,3 +168,111 @@ class TestWriteGraphologyJson(object):
         data = write_graphology_json(g, allow_invalid_attr_names=True)
 
         assert data["nodes"] == [{"key": "test", "attributes": {"45": "ok"}}]
+
+
+class TestWriteGraphologyJsonTo(object):
+    def test_same_as_dump(self, tmp_path):
+        g = nx.MultiDiGraph(name="test")
+        g.add_nodes_from(
+            [
+                ("one", {"hello": "world", "hey": "how are you?"}),
+                ("two", {"age": 34}),
+                ("three", {}),
+            ]
+        )
+        g.add_edges_from(
+            [
+                ("one", "two", {"weight": 35}),
+                ("one", "two", {"weight": 12}),
+                ("two", "three", {}),
+            ]
+        )
+
+        expected = json.dumps(write_graphology_json(g))
+
+        buffer = StringIO()
+        write_graphology_json_to(buffer, g)
+
+        assert buffer.getvalue() == expected
+
+        path = tmp_path / "graph.json"
+        write_graphology_json_to(path, g)
+
+        with open(path) as f:
+            assert f.read() == expected
+
+        path = tmp_path / "graph.json.gz"
+        write_graphology_json_to(path, g)
+
+        with gzip.open(path, "rt") as f:
+            assert f.read() == expected
+
+        buffer = BytesIO()
+        write_graphology_json_to(buffer, g, compress=True)
+
+        assert gzip.decompress(buffer.getvalue()).decode() == expected
+
+        assert are_same_graphs(read_graphology_json(json.loads(expected)), g)
+
+        # NOTE: values faster backends would encode differently
+        g = nx.Graph()
+        g.add_node("one", size=float("nan"), big=2**70)
+        g.add_node("two", size=1.5)
+
+        buffer = StringIO()
+        write_graphology_json_to(buffer, g)
+
+        assert buffer.getvalue() == json.dumps(write_graphology_json(g))
+
+        g.add_node("three", date=date(2020, 1, 1))
+
+        with raises(TypeError):
+            write_graphology_json_to(StringIO(), g)
+
+        buffer = StringIO()
+        write_graphology_json_to(buffer, nx.Graph())
+
+        assert json.loads(buffer.getvalue()) == write_graphology_json(nx.Graph())
+
+    def test_errors(self):
+        with raises(TypeError, match="path"):
+            write_graphology_json_to(None, nx.Graph())
+
+        g = nx.Graph()
+        g.add_edge(1, "2")
+
+        with raises(TypeError, match="mixed"):
+            write_graphology_json_to(StringIO(), g)
+
+        g = nx.Graph()
+        g.add_node("test")
+        g.nodes["test"][45] = "ok"
+
+        with raises(TypeError, match="attr"):
+            write_graphology_json_to(StringIO(), g)
+
+        buffer = StringIO()
+        write_graphology_json_to(buffer, g, allow_invalid_attr_names=True)
+
+        assert json.loads(buffer.getvalue())["nodes"] == [
+            {"key": "test", "attributes": {"45": "ok"}}
+        ]
+
+    @mark.parametrize("json_backend", ["json", "orjson", "ujson"])
+    def test_json_backends(self, json_backend):
+        if json_backend != "json":
+            importorskip(json_backend)
+
+        g = nx.Graph(name="Test Graph")
+        g.add_node("one", label="Élodie", size=np.float64(3.5))
+        g.add_edge("one", "two", weight=2, tags=["a", "b"])
+
+        buffer = StringIO()
+        write_graphology_json_to(buffer, g, json_backend=json_backend)
+
+        assert json.loads(buffer.getvalue()) == json.loads(
+            json.dumps(write_graphology_json(g))
+        )
+
+        with raises(TypeError, match="backend"):
+            write_graphology_json_to(StringIO(), g, json_backend="unknown")